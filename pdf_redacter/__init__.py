@@ -1 +1,2 @@
-from .core import PDFRedactor
\ No newline at end of file
+from ._version import __version__
+from .core import PDFRedactor
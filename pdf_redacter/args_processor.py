@@ -12,6 +12,18 @@ DEFAULT_VERBOSE: Final = False
 DEFAULT_OVERWRITE: Final = False
 DEFAULT_DRY_RUN: Final = False
 DEFAULT_SKIP_FAILED_PAGES: Final = True
+DEFAULT_PAGES_PER_SHARD: Final = 50
+DEFAULT_STALE_AFTER: Final = 3600.0
+DEFAULT_METRICS_INTERVAL: Final = 15.0
+DEFAULT_ENGINE: Final = "fitz"
+DEFAULT_COALESCE_GAP: Final = 1.0
+DEFAULT_TIMEOUT_FALLBACK: Final = "skip"
+DEFAULT_WORKERS: Final = 1
+DEFAULT_POLL_INTERVAL: Final = 2.0
+DEFAULT_STATS_INTERVAL: Final = 60.0
+DEFAULT_STORE_SHRINK: Final = 100
+DEFAULT_MAX_RETRIES: Final = 2
+DEFAULT_RASTER_DPI: Final = 150
 
 class TrackingAction(argparse.Action):
     """Custom action that tracks which arguments were explicitly provided."""
@@ -142,6 +154,161 @@ class ArgsProcessor:
             help="Show stats about matched patterns before exit"
         )
 
+        parser.add_argument(
+            "--profile-patterns",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Record scan time and matches per pattern, reported by --print-stats sorted by cost"
+        )
+
+        parser.add_argument(
+            "--pattern-cache-dir",
+            type=str,
+            action=TrackingAction,
+            help="Cache built pattern sets in this directory to speed up later runs with the same patterns"
+        )
+
+        parser.add_argument(
+            "--engine",
+            type=str,
+            action=TrackingAction,
+            choices=["fitz", "stream"],
+            default=DEFAULT_ENGINE,
+            help=f"Redaction engine: 'stream' rewrites simple content streams with pikepdf and falls back to 'fitz' per page, default=[{DEFAULT_ENGINE}]"
+        )
+
+        parser.add_argument(
+            "--coalesce-rects",
+            action=TrackingBooleanAction,  # Use custom action
+            default=True,
+            help="Merge redaction rectangles on the same line before applying them (default: True)"
+        )
+
+        parser.add_argument(
+            "--coalesce-gap",
+            type=float,
+            action=TrackingAction,
+            default=DEFAULT_COALESCE_GAP,
+            help=f"Largest gap in points bridged when merging redaction rectangles, default=[{DEFAULT_COALESCE_GAP}]"
+        )
+
+        # Time budgets, enforced by redacting pages in a supervised subprocess
+        parser.add_argument(
+            "--page-timeout",
+            type=float,
+            action=TrackingAction,
+            help="Seconds allowed per page; pages are searched in a subprocess that is killed on timeout "
+                 "(applying the redactions runs in the main process and is not interrupted)"
+        )
+
+        parser.add_argument(
+            "--document-deadline",
+            type=float,
+            action=TrackingAction,
+            help="Seconds allowed per document; pages not redacted by then are treated as timed out"
+        )
+
+        parser.add_argument(
+            "--timeout-fallback",
+            type=str,
+            action=TrackingAction,
+            choices=["skip", "blank"],
+            default=DEFAULT_TIMEOUT_FALLBACK,
+            help=f"Timed-out pages: 'skip' treats them as failed pages (see --skip_failed_pages), 'blank' replaces them with empty pages, default=[{DEFAULT_TIMEOUT_FALLBACK}]"
+        )
+
+        parser.add_argument(
+            "--optimize-output",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Subset fonts, deduplicate objects and drop unreferenced resources in the output (default: False)"
+        )
+
+        parser.add_argument(
+            "--verify",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Re-extract the output and fail if any pattern still matches (default: False)"
+        )
+
+        parser.add_argument(
+            "--verify-sample-rate",
+            type=float,
+            action=TrackingAction,
+            help="Share (0-1) of the pages without matches to verify as well; pages with matches are always verified"
+        )
+
+        parser.add_argument(
+            "--verify-workers",
+            type=int,
+            action=TrackingAction,
+            help="Number of processes used by --verify"
+        )
+
+        parser.add_argument(
+            "--template",
+            type=str,
+            action=TrackingAction,
+            help="YAML/JSON file of fixed rects per page or page size, redacted without text extraction"
+        )
+
+        parser.add_argument(
+            "--template-match-uncovered",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Also match the search patterns on pages the --template does not cover (default: False)"
+        )
+
+        parser.add_argument(
+            "--shared-forms",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Redact Form XObjects drawn by several pages (letterheads, footers) once instead of on every page; pages are still extracted and matched (default: False)"
+        )
+
+        parser.add_argument(
+            "--raster-fallback",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Replace pages where applying the redactions fails with an image of the page with the matches blacked out (default: False)"
+        )
+
+        parser.add_argument(
+            "--raster-dpi",
+            type=int,
+            default=DEFAULT_RASTER_DPI,
+            action=TrackingAction,
+            help=f"Resolution of pages replaced by --raster-fallback, default=[{DEFAULT_RASTER_DPI}]"
+        )
+
+        parser.add_argument(
+            "--raster-workers",
+            type=int,
+            action=TrackingAction,
+            help="Number of processes rendering pages for --raster-fallback"
+        )
+
+        parser.add_argument(
+            "--text-index",
+            type=str,
+            action=TrackingAction,
+            help="SQLite file caching extracted page text and matches; unchanged pages are not extracted again"
+        )
+
+        parser.add_argument(
+            "--scan-only",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Only count matches per pattern, without writing an output PDF (default: False)"
+        )
+
+        parser.add_argument(
+            "--explain-patterns",
+            action=TrackingBooleanAction,
+            default=False,
+            help="Show how the search patterns are grouped and evaluated, then exit (default: False)"
+        )
+
         parser.add_argument(
             "--dry-run",
             action=TrackingBooleanAction,  # Use custom action
@@ -156,6 +323,207 @@ class ArgsProcessor:
             help=f"Remove Failed Redaction Pages from the output PDF, default=[{DEFAULT_SKIP_FAILED_PAGES}]"
         )
 
+        # Metrics export for monitoring
+        parser.add_argument(
+            "--metrics-file",
+            type=str,
+            action=TrackingAction,
+            help="Write metrics in Prometheus text format to this file (node-exporter textfile collector)"
+        )
+
+        parser.add_argument(
+            "--metrics-json",
+            type=str,
+            action=TrackingAction,
+            help="Write a JSON snapshot of the metrics to this file"
+        )
+
+        parser.add_argument(
+            "--metrics-interval",
+            type=float,
+            action=TrackingAction,
+            default=DEFAULT_METRICS_INTERVAL,
+            help=f"Seconds between metrics writes; metrics are also written at exit, default=[{DEFAULT_METRICS_INTERVAL}]"
+        )
+
+        # Sharded (multi-node) processing through a shared queue directory
+        parser.add_argument(
+            "--shard-role",
+            type=str,
+            choices=["coordinator", "worker", "requeue", "merge"],
+            action=TrackingAction,
+            help="Run as coordinator (enqueue page ranges), worker (redact queued ranges), requeue (return tasks of dead workers to the queue) or merge (assemble output)"
+        )
+
+        parser.add_argument(
+            "--queue-dir",
+            type=str,
+            action=TrackingAction,
+            help="Shared queue directory used by --shard-role"
+        )
+
+        parser.add_argument(
+            "--pages-per-shard",
+            type=int,
+            default=DEFAULT_PAGES_PER_SHARD,
+            action=TrackingAction,
+            help=f"Number of pages per queued task, default=[{DEFAULT_PAGES_PER_SHARD}]"
+        )
+
+        parser.add_argument(
+            "--worker-id",
+            type=str,
+            action=TrackingAction,
+            help="Worker identifier for --shard-role worker, default=[<hostname>-<pid>]"
+        )
+
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=DEFAULT_STALE_AFTER,
+            action=TrackingAction,
+            help=f"Seconds after which --shard-role requeue returns a claimed task to the queue; must exceed the longest a task takes, default=[{DEFAULT_STALE_AFTER}]"
+        )
+
+        # Hot-folder watch mode
+        parser.add_argument(
+            "--watch",
+            type=str,
+            action=TrackingAction,
+            help="Watch this directory and redact PDFs copied into it, instead of -i/-o"
+        )
+
+        parser.add_argument(
+            "--watch-output-dir",
+            type=str,
+            action=TrackingAction,
+            help="Directory receiving redacted PDFs in --watch mode"
+        )
+
+        parser.add_argument(
+            "--watch-failed-dir",
+            type=str,
+            action=TrackingAction,
+            help="Directory receiving PDFs that could not be redacted, default=[<watch dir>/failed]"
+        )
+
+        parser.add_argument(
+            "--watch-processed-dir",
+            type=str,
+            action=TrackingAction,
+            help="Directory receiving redacted input PDFs; they are deleted if not set"
+        )
+
+        parser.add_argument(
+            "--recover-claims",
+            action=TrackingBooleanAction,  # Use custom action
+            default=True,
+            help="Re-queue files left in progress by an interrupted watcher; disable when several watchers share a directory (default: True)"
+        )
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            action=TrackingAction,
+            help=f"Number of worker processes in --watch and --manifest mode, default=[{DEFAULT_WORKERS}]"
+        )
+
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=DEFAULT_POLL_INTERVAL,
+            action=TrackingAction,
+            help=f"Seconds between scans of the watched directory, default=[{DEFAULT_POLL_INTERVAL}]"
+        )
+
+        parser.add_argument(
+            "--stats-interval",
+            type=float,
+            default=DEFAULT_STATS_INTERVAL,
+            action=TrackingAction,
+            help=f"Seconds between throughput and queue-depth log lines in --watch mode, default=[{DEFAULT_STATS_INTERVAL}]"
+        )
+
+        parser.add_argument(
+            "--max-tasks-per-worker",
+            type=int,
+            action=TrackingAction,
+            help="Replace a --watch worker process after this many files"
+        )
+
+        parser.add_argument(
+            "--max-worker-rss-mb",
+            type=float,
+            action=TrackingAction,
+            help="Replace a --watch worker (or stop a shard worker) once its RSS exceeds this many MB"
+        )
+
+        parser.add_argument(
+            "--store-shrink",
+            dest="store_shrink_percent",
+            type=int,
+            choices=range(0, 101),
+            metavar="PERCENT",
+            default=DEFAULT_STORE_SHRINK,
+            action=TrackingAction,
+            help=f"Percentage of the MuPDF resource store freed after every file in --watch and shard workers, default=[{DEFAULT_STORE_SHRINK}]"
+        )
+
+        # Manifest mode
+        parser.add_argument(
+            "--manifest",
+            type=str,
+            action=TrackingAction,
+            help="Redact the rows of a CSV or JSONL manifest with src, dest and optional profile columns, instead of -i/-o"
+        )
+
+        parser.add_argument(
+            "--manifest-state",
+            type=str,
+            action=TrackingAction,
+            help="Append-only file recording finished manifest rows, default=[<manifest>.state.jsonl]"
+        )
+
+        parser.add_argument(
+            "--max-retries",
+            type=int,
+            default=DEFAULT_MAX_RETRIES,
+            action=TrackingAction,
+            help=f"Retries of a failing manifest row before it is recorded as failed, default=[{DEFAULT_MAX_RETRIES}]"
+        )
+
+        parser.add_argument(
+            "--prefetch",
+            type=int,
+            action=TrackingAction,
+            help="Manifest rows read ahead of the workers, default=[<workers>]"
+        )
+
+        parser.add_argument(
+            "--retry-failed",
+            action=TrackingBooleanAction,  # Use custom action
+            default=False,
+            help="Run manifest rows again that an earlier run recorded as failed (default: False)"
+        )
+
+        # Plan and apply phases
+        parser.add_argument(
+            "--plan-output",
+            type=str,
+            metavar="FILE",
+            action=TrackingAction,
+            help="Write the redaction plan of -i (rects and match counts, no text) to a JSON file instead of redacting"
+        )
+
+        parser.add_argument(
+            "--apply-plan",
+            type=str,
+            metavar="FILE",
+            action=TrackingAction,
+            help="Write -o from a plan made with --plan-output, without extracting or matching text"
+        )
+
         return parser
 
     @staticmethod
@@ -216,11 +584,57 @@ class ArgsProcessor:
             return
 
         import sys
+        if final_config.get('shard_role'):
+            if not final_config.get('queue_dir'):
+                logger.error("--queue-dir is required with --shard-role")
+                sys.exit(1)
+            # The other roles read everything else from the queued job
+            if final_config['shard_role'] in ('worker', 'requeue', 'merge'):
+                return
+
         # Validate required fields
-        if not final_config.get('src_file') or not final_config.get('output_file'):
+        if final_config.get('watch'):
+            # Input and output files come from the watched directory
+            if not final_config.get('watch_output_dir'):
+                logger.error("--watch-output-dir is required with --watch")
+                sys.exit(1)
+        elif final_config.get('manifest'):
+            # Sources and destinations come from the manifest rows
+            if final_config.get('profiles'):
+                return
+        elif final_config.get('apply_plan'):
+            # The plan holds the rects and names its source
+            if not final_config.get('output_file'):
+                logger.error("Output file (-o) is required with --apply-plan")
+                sys.exit(1)
+            return
+        elif final_config.get('plan_output'):
+            # Only the plan is written
+            if not final_config.get('src_file'):
+                logger.error("Source file (-i) is required")
+                sys.exit(1)
+        elif final_config.get('explain_patterns'):
+            # Only the patterns are analyzed
+            pass
+        elif final_config.get('scan_only'):
+            # Nothing is written
+            if not final_config.get('src_file'):
+                logger.error("Source file (-i) is required")
+                sys.exit(1)
+        elif final_config.get('profiles'):
+            # Every profile names its own output file and patterns
+            if not final_config.get('src_file'):
+                logger.error("Source file (-i) is required")
+                sys.exit(1)
+            return
+        elif not final_config.get('src_file') or not final_config.get('output_file'):
             logger.error("Source file (-i) and output file (-o) are required")
             sys.exit(1)
 
+        if final_config.get('template') and not final_config.get('template_match_uncovered'):
+            # The template rects are redacted without patterns
+            return
+
         if not final_config.get('searches') and not final_config.get('predefined_patterns'):
             logger.error(
                 "Search patterns (-s) or Predefined patterns (-P) are required")
@@ -1,11 +1,22 @@
 import logging
 import sys
 import argparse
+from pathlib import Path
 from typing import Final, Optional, Dict, Any
 from pdf_redacter.core import PDFRedactor
 from pdf_redacter.pattern_matcher import PatternType
-from pdf_redacter.config import ConfigLoader
+from pdf_redacter.config import ConfigLoader, RedactionProfile
 from pdf_redacter.args_processor import ArgsProcessor
+from pdf_redacter.sharding import ShardCoordinator, ShardWorker, ShardMerger
+from pdf_redacter.metrics import MetricsExporter, get_registry
+from pdf_redacter.watch import HotFolderWatcher
+from pdf_redacter.manifest import ManifestRunner
+from pdf_redacter.geometry import DEFAULT_MERGE_GAP
+from pdf_redacter.profiles import MultiProfileRedactor
+from pdf_redacter.text_index import TextIndex, scan_pdf
+from pdf_redacter.templates import RedactionTemplate
+from pdf_redacter.engine import RedactionEngine
+from pdf_redacter.plan import APPLY_OPTIONS, RedactionPlan
 
 
 class PdfRedacterCLI:
@@ -59,8 +70,34 @@ class PdfRedacterCLI:
                 logger.info(f"Saved config to {final_config.get('generate_sample_config')}")
                 sys.exit(0)
 
+            # Export metrics periodically and at exit
+            exporter = None
+            if final_config.get('metrics_file') or final_config.get('metrics_json'):
+                exporter = MetricsExporter(
+                    get_registry(),
+                    prometheus_file=final_config.get('metrics_file'),
+                    json_file=final_config.get('metrics_json'),
+                    interval=final_config.get('metrics_interval', 15.0)
+                ).start()
+
             # Run redaction with merged config
-            if not final_config.get('dry_run', False):
+            if final_config.get('explain_patterns'):
+                PdfRedacterCLI.run_explain_patterns(final_config)
+            elif final_config.get('shard_role') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_sharded(final_config)
+            elif final_config.get('watch') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_watch(final_config)
+            elif final_config.get('manifest') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_manifest(final_config)
+            elif final_config.get('apply_plan') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_apply_plan(final_config)
+            elif final_config.get('plan_output') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_plan(final_config)
+            elif final_config.get('scan_only') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_scan(final_config)
+            elif final_config.get('profiles') and not final_config.get('dry_run', False):
+                PdfRedacterCLI.run_profiles(final_config)
+            elif not final_config.get('dry_run', False):
                 # Perfomr redaction if not dry_run mode
                 PdfRedacterCLI.run_redaction(final_config)
             else:
@@ -73,6 +110,9 @@ class PdfRedacterCLI:
                     final_config,
                     str(final_config.get('save_config'))
                 )
+
+            if exporter:
+                exporter.stop()
         else:
             logger.error("Invalid configuartion. Exiting...")
 
@@ -98,19 +138,7 @@ class PdfRedacterCLI:
             )
 
             # Prepare arguments for redact_pdf method
-            redaction_args = {
-                'needles': final_config.get('searches', None),
-                'replacement': final_config.get('replacement', '***REDACTED***'),
-                'ignore_case': final_config.get('ignore_case', False)
-            }
-
-            # Add enhanced pattern matching arguments if available
-            if 'predefined_patterns' in final_config \
-                    and final_config['predefined_patterns']:
-                # Convert string patterns to PatternType enum values
-                predefined_types = [PatternType(
-                    pattern_name) for pattern_name in final_config['predefined_patterns']]
-                redaction_args['predefined_patterns'] = predefined_types
+            redaction_args = PdfRedacterCLI.build_redaction_args(final_config)
 
             # Execute redaction
             result = pdf_redactor_engine.redact_pdf(**redaction_args)
@@ -119,37 +147,552 @@ class PdfRedacterCLI:
                 logger.error(f"Redaction Failed")
                 sys.exit(1)
 
+            if isinstance(result, dict) and result.get('verification') \
+                    and result['verification']['leaks']:
+                PdfRedacterCLI.print_leaks(result['verification'])
+                sys.exit(1)
+
             # Handle result based on enhanced vs original implementation
             if final_config.get('print_stats', False) and isinstance(result, dict):
-                # Enhanced implementation returns statistics
-                logger.info(f"Redaction completed successfully:")
-                logger.info(f"  - Total matches: {result['total_matches']}")
-                logger.info(f"  - Pages processed: {result['pages_processed']}")
-                logger.info(f"  - Pages modified: {result['pages_modified']}")
-                logger.info(f"  - Redact failed Pages: {result['pages_failed_redaction']}")
-
-                logger.info(f"  - Patterns used: {result['patterns_used']}")
-                if result['matches_by_pattern']:
-                    logger.info("  - Matches by pattern:")
-                    for pattern, count in result['matches_by_pattern'].items():
-                        logger.info(f"    * {pattern}: {count} matches")
+                PdfRedacterCLI.print_stats(result)
             else:
                 # Original implementation returns None on success
                 logger.info("PDF redaction completed successfully")
 
         except FileNotFoundError as e:
             logger.error(f"File not found: {e}")
+            PdfRedacterCLI._record_rejected()
             sys.exit(1)
         except FileExistsError as e:
             logger.error(f"File already exists: {e}")
+            PdfRedacterCLI._record_rejected()
             sys.exit(1)
         except ValueError as e:
             logger.error(f"Invalid configuration: {e}")
+            PdfRedacterCLI._record_rejected()
             sys.exit(1)
         except Exception as e:
             logger.exception(f"An error occurred during redaction: {str(e)}")
             sys.exit(1)
 
+    @staticmethod
+    def _record_rejected() -> None:
+        get_registry().inc(
+            "documents_rejected_total",
+            help_text="Documents rejected before redaction started."
+        )
+
+    @staticmethod
+    def build_redaction_args(final_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the keyword arguments for PDFRedactor.redact_pdf.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        redaction_args = {
+            'needles': final_config.get('searches', None),
+            'replacement': final_config.get('replacement', '***REDACTED***'),
+            'ignore_case': final_config.get('ignore_case', False)
+        }
+
+        # Add enhanced pattern matching arguments if available
+        if 'predefined_patterns' in final_config \
+                and final_config['predefined_patterns']:
+            # Convert string patterns to PatternType enum values
+            predefined_types = [PatternType(
+                pattern_name) for pattern_name in final_config['predefined_patterns']]
+            redaction_args['predefined_patterns'] = predefined_types
+
+        if final_config.get('profile_patterns', False):
+            redaction_args['profile_patterns'] = True
+
+        if final_config.get('engine', 'fitz') != 'fitz':
+            redaction_args['engine'] = final_config['engine']
+
+        if not final_config.get('coalesce_rects', True):
+            redaction_args['coalesce_rects'] = False
+
+        if final_config.get('coalesce_gap') is not None \
+                and final_config['coalesce_gap'] != DEFAULT_MERGE_GAP:
+            redaction_args['coalesce_gap'] = float(final_config['coalesce_gap'])
+
+        for key in ('page_timeout', 'document_deadline'):
+            if final_config.get(key) is not None:
+                redaction_args[key] = float(final_config[key])
+
+        if final_config.get('timeout_fallback', 'skip') != 'skip':
+            redaction_args['timeout_fallback'] = final_config['timeout_fallback']
+
+        if final_config.get('optimize_output', False):
+            redaction_args['optimize_output'] = True
+
+        if final_config.get('pattern_cache_dir'):
+            redaction_args['pattern_cache_dir'] = str(
+                final_config['pattern_cache_dir'])
+
+        if final_config.get('text_index'):
+            redaction_args['text_index'] = str(final_config['text_index'])
+
+        if final_config.get('verify', False):
+            redaction_args['verify'] = True
+            if final_config.get('verify_sample_rate'):
+                redaction_args['verify_sample_rate'] = float(final_config['verify_sample_rate'])
+            if final_config.get('verify_workers'):
+                redaction_args['verify_workers'] = int(final_config['verify_workers'])
+
+        if final_config.get('shared_forms', False):
+            redaction_args['shared_forms'] = True
+
+        if final_config.get('template'):
+            redaction_args['template'] = RedactionTemplate.load(final_config['template'])
+            if final_config.get('template_match_uncovered', False):
+                redaction_args['template_match_uncovered'] = True
+
+        if final_config.get('raster_fallback', False):
+            redaction_args['raster_fallback'] = True
+            if final_config.get('raster_dpi'):
+                redaction_args['raster_dpi'] = int(final_config['raster_dpi'])
+            if final_config.get('raster_workers'):
+                redaction_args['raster_workers'] = int(final_config['raster_workers'])
+
+        return redaction_args
+
+    @staticmethod
+    def print_leaks(verification: Dict[str, Any]) -> None:
+        """Log the pattern matches verification found in the output, per page."""
+        logger = logging.getLogger(__name__)
+        by_page: Dict[int, list] = {}
+        for leak in verification['leaks']:
+            by_page.setdefault(leak['page'], []).append(leak)
+        logger.error(
+            f"Verification failed: {len(verification['leaks'])} match(es) remain "
+            f"on {len(by_page)} page(s)")
+        for page, leaks in sorted(by_page.items()):
+            patterns = sorted(set(leak['pattern'] for leak in leaks))
+            logger.error(
+                f"  - Page {page + 1} (source page {leaks[0]['source_page'] + 1}): "
+                f"{len(leaks)} match(es) of {', '.join(patterns)}")
+
+    @staticmethod
+    def print_stats(result: Dict[str, Any]) -> None:
+        """Log the statistics returned by a redaction run."""
+        logger = logging.getLogger(__name__)
+
+        logger.info(f"Redaction completed successfully:")
+        logger.info(f"  - Total matches: {result['total_matches']}")
+        logger.info(f"  - Pages processed: {result['pages_processed']}")
+        logger.info(f"  - Pages modified: {result['pages_modified']}")
+        logger.info(f"  - Redact failed Pages: {result['pages_failed_redaction']}")
+
+        logger.info(f"  - Patterns used: {result['patterns_used']}")
+        if result['matches_by_pattern']:
+            logger.info("  - Matches by pattern:")
+            for pattern, count in result['matches_by_pattern'].items():
+                logger.info(f"    * {pattern}: {count} matches")
+        if result.get('spans_searched'):
+            logger.info(
+                f"  - Page searches: {result['spans_searched']} for {result['total_matches']} matches")
+        if result.get('annotations_requested'):
+            logger.info(
+                f"  - Redaction annotations: {result['annotations_applied']} "
+                f"(merged from {result['annotations_requested']} rects)")
+        if result.get('pages_timed_out'):
+            logger.info(
+                f"  - Timed out Pages: {result['pages_timed_out']} {result['timed_out_pages']}")
+        if result.get('template_pages'):
+            logger.info(
+                f"  - Template: {result['template_rects']} rects on {result['template_pages']} pages")
+        if result.get('form_xobjects'):
+            forms = result['form_xobjects']
+            logger.info(
+                f"  - Form XObjects: {forms.get('redacted', 0)} redacted once, "
+                f"{forms.get('reused', 0)} of {forms.get('references', 0)} references reused")
+        if result.get('rasterized_pages'):
+            logger.info(f"  - Rasterized Pages: {result['rasterized_pages']}")
+        if result.get('optimization'):
+            optimization = result['optimization']
+            steps = []
+            if 'font_bytes_saved' in optimization:
+                steps.append(
+                    f"embedded fonts {optimization['font_bytes_before']} -> "
+                    f"{optimization['font_bytes_after']} bytes")
+            if 'objects_deduplicated' in optimization:
+                steps.append(f"{optimization['objects_deduplicated']} objects deduplicated or dropped")
+            if 'resources_removed' in optimization:
+                steps.append(f"{optimization['resources_removed']} unreferenced resources removed")
+            if 'prune_bytes_saved' in optimization:
+                steps.append(f"{optimization['prune_bytes_saved']} bytes saved by pruning and object streams")
+            if 'output_bytes' in optimization:
+                steps.append(f"{optimization['output_bytes']} bytes written")
+            logger.info(
+                f"  - Output optimization: {', '.join(steps)} in {optimization['seconds']:.2f}s")
+        if result.get('verification'):
+            verification = result['verification']
+            logger.info(
+                f"  - Verification: {verification['pages_checked']} pages checked "
+                f"({verification['pages_modified']} modified, {verification['pages_sampled']} sampled), "
+                f"{len(verification['leaks'])} leaks in {verification['seconds']:.2f}s")
+        if result.get('text_index'):
+            text_index = result['text_index']
+            logger.info(
+                f"  - Text index: {text_index['pages_cached']} pages cached, "
+                f"{text_index['pages_extracted']} extracted, "
+                f"{text_index['patterns_cached']} page patterns cached, "
+                f"{text_index['patterns_evaluated']} evaluated")
+        if result.get('worker_peak_rss_mb'):
+            peaks = result['worker_peak_rss_mb']
+            if isinstance(peaks, dict):
+                peaks = ', '.join(f'{worker}={peak:.0f}' for worker, peak in peaks.items())
+            logger.info(f"  - Worker peak RSS (MB): {peaks}")
+        if result.get('engine_pages'):
+            logger.info(
+                f"  - Pages by engine: {', '.join(f'{engine}={count}' for engine, count in result['engine_pages'].items())}")
+        if result.get('prefilter'):
+            logger.info("  - Prefilter skips (pages where a pattern could not match):")
+            for entry in result['prefilter']:
+                logger.info(
+                    f"    * {entry['pattern']}: {entry['skipped']}/{entry['checked']} "
+                    f"({entry['skip_rate']:.1%}), requires {', '.join(entry['requires'])}")
+        if result.get('pattern_timings'):
+            logger.info("  - Pattern cost (most expensive first):")
+            for timing in result['pattern_timings']:
+                logger.info(
+                    f"    * {timing['pattern']}: {timing['time'] * 1000:.2f} ms "
+                    f"({timing['share']:.1%}), {timing['matches']} matches "
+                    f"over {timing['scans']} pages")
+
+    @staticmethod
+    def run_scan(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Count matches in the source without redacting it.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+        redaction_args = PdfRedacterCLI.build_redaction_args(final_config)
+
+        pattern_matcher = PDFRedactor.build_pattern_matcher(
+            redaction_args['needles'],
+            redaction_args['ignore_case'],
+            predefined_patterns=redaction_args.get('predefined_patterns'),
+            pattern_cache_dir=redaction_args.get('pattern_cache_dir')
+        )
+        if pattern_matcher is None or not pattern_matcher.patterns:
+            logger.error("No valid Search patterns specified")
+            sys.exit(1)
+
+        try:
+            if redaction_args.get('text_index'):
+                with TextIndex(redaction_args['text_index']) as text_index:
+                    result = scan_pdf(
+                        str(final_config['src_file']), pattern_matcher, text_index)
+            else:
+                result = scan_pdf(str(final_config['src_file']), pattern_matcher)
+        except Exception as e:
+            logger.error(f"Scan failed: {e}")
+            sys.exit(1)
+
+        logger.info(
+            f"Scan found {result['total_matches']} matches on "
+            f"{len(result['pages_with_matches'])} of {result['pages_processed']} pages")
+        if final_config.get('print_stats', False):
+            PdfRedacterCLI.print_stats(result)
+
+    @staticmethod
+    def run_explain_patterns(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Log how the search patterns are grouped and evaluated.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+        redaction_args = PdfRedacterCLI.build_redaction_args(final_config)
+
+        pattern_matcher = PDFRedactor.build_pattern_matcher(
+            redaction_args['needles'],
+            redaction_args['ignore_case'],
+            predefined_patterns=redaction_args.get('predefined_patterns'),
+            pattern_cache_dir=redaction_args.get('pattern_cache_dir')
+        )
+        if pattern_matcher is None or not pattern_matcher.patterns:
+            logger.error("No valid Search patterns specified")
+            sys.exit(1)
+
+        groups = pattern_matcher.explain_patterns()
+        logger.info(f"Evaluation plan of {len(pattern_matcher.patterns)} patterns in {len(groups)} groups:")
+        for group in groups:
+            logger.info(
+                f"  - {group['strategy']} ({group['kind']}, {len(group['patterns'])} patterns): "
+                f"{group['reason']}")
+            for pattern in group['patterns']:
+                logger.info(f"    * {pattern}")
+
+    @staticmethod
+    def run_plan(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Write the redaction plan of the source file, without redacting it.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+        plan_file = str(final_config['plan_output'])
+
+        try:
+            if not final_config.get('overwrite', False) and Path(plan_file).exists():
+                raise FileExistsError(f"Plan file '{plan_file}' already exists")
+            engine = RedactionEngine(**PdfRedacterCLI.build_redaction_args(final_config))
+            plan = engine.plan(str(final_config['src_file']))
+            plan.save(plan_file)
+            logger.info(
+                f"Planned {plan.total_matches} matches on {len(plan.pages)} of "
+                f"{plan.page_count} pages, saved to '{plan_file}'")
+
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            sys.exit(1)
+        except FileExistsError as e:
+            logger.error(f"File already exists: {e}")
+            sys.exit(1)
+        except ValueError as e:
+            logger.error(f"Invalid configuration: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def run_apply_plan(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Write the output file from a saved redaction plan.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+
+        try:
+            plan = RedactionPlan.load(str(final_config['apply_plan']))
+            redaction_args = PdfRedacterCLI.build_redaction_args(final_config)
+            result = PDFRedactor(
+                src_file=str(final_config.get('src_file') or plan.src_file),
+                dest_file=str(final_config['output_file']),
+                overwrite=final_config.get('overwrite', False),
+                skip_redact_failed_pages=final_config.get('skip_failed_pages', False)
+            ).apply_plan(
+                plan,
+                **{key: value for key, value in redaction_args.items() if key in APPLY_OPTIONS})
+
+            if not result:
+                logger.error(f"Redaction Failed")
+                sys.exit(1)
+
+            if final_config.get('print_stats', False) and isinstance(result, dict):
+                PdfRedacterCLI.print_stats(result)
+            else:
+                logger.info("PDF redaction completed successfully")
+
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            PdfRedacterCLI._record_rejected()
+            sys.exit(1)
+        except FileExistsError as e:
+            logger.error(f"File already exists: {e}")
+            PdfRedacterCLI._record_rejected()
+            sys.exit(1)
+        except ValueError as e:
+            logger.error(f"Invalid configuration: {e}")
+            PdfRedacterCLI._record_rejected()
+            sys.exit(1)
+
+    @staticmethod
+    def run_profiles(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Redact the source once for every configured profile.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+
+        try:
+            profiles = [RedactionProfile.from_dict(profile)
+                        for profile in final_config['profiles']]
+            redaction_args = PdfRedacterCLI.build_redaction_args(final_config)
+            for key in ('profile_patterns', 'engine', 'page_timeout',
+                        'document_deadline', 'timeout_fallback', 'text_index',
+                        'verify', 'verify_sample_rate', 'verify_workers',
+                        'raster_fallback', 'raster_dpi', 'raster_workers', 'shared_forms',
+                        'template', 'template_match_uncovered'):
+                if redaction_args.pop(key, None) is not None:
+                    logger.warning(f"'{key}' is not supported with profiles, ignoring it")
+
+            result = MultiProfileRedactor(
+                src_file=str(final_config.get('src_file')),
+                overwrite=final_config.get('overwrite', False),
+                skip_redact_failed_pages=final_config.get('skip_failed_pages', False)
+            ).redact_profiles(profiles, **redaction_args)
+
+            if not result:
+                logger.error(f"Redaction Failed")
+                sys.exit(1)
+
+            if final_config.get('print_stats', False):
+                for name, profile_result in result['profiles'].items():
+                    logger.info(f"Profile '{name}' -> {profile_result['output_file']}")
+                    PdfRedacterCLI.print_stats(profile_result)
+            else:
+                logger.info("PDF redaction completed successfully")
+
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            PdfRedacterCLI._record_rejected()
+            sys.exit(1)
+        except FileExistsError as e:
+            logger.error(f"File already exists: {e}")
+            PdfRedacterCLI._record_rejected()
+            sys.exit(1)
+        except ValueError as e:
+            logger.error(f"Invalid configuration: {e}")
+            PdfRedacterCLI._record_rejected()
+            sys.exit(1)
+
+    @staticmethod
+    def run_watch(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Redact PDFs dropped into the watched directory until interrupted.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+        watch_dir = str(final_config['watch'])
+
+        try:
+            HotFolderWatcher(
+                input_dir=watch_dir,
+                output_dir=str(final_config['watch_output_dir']),
+                failed_dir=str(final_config.get('watch_failed_dir')
+                               or Path(watch_dir) / 'failed'),
+                redaction_args=PdfRedacterCLI.build_redaction_args(final_config),
+                processed_dir=final_config.get('watch_processed_dir'),
+                workers=final_config.get('workers', 1),
+                poll_interval=final_config.get('poll_interval', 2.0),
+                stats_interval=final_config.get('stats_interval', 60.0),
+                skip_redact_failed_pages=final_config.get('skip_failed_pages', False),
+                recover_claims=final_config.get('recover_claims', True),
+                max_tasks_per_worker=final_config.get('max_tasks_per_worker'),
+                max_worker_rss_mb=final_config.get('max_worker_rss_mb'),
+                store_shrink_percent=final_config.get('store_shrink_percent', 100)
+            ).run()
+        except ValueError as e:
+            logger.error(f"Invalid configuration: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def run_manifest(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Redact the unfinished rows of a manifest; exits 1 if any row failed.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+
+        try:
+            result = ManifestRunner(
+                manifest_file=str(final_config['manifest']),
+                redaction_args=PdfRedacterCLI.build_redaction_args(final_config),
+                state_file=final_config.get('manifest_state'),
+                profiles=final_config.get('profiles'),
+                workers=final_config.get('workers', 1),
+                prefetch=final_config.get('prefetch'),
+                max_retries=final_config.get('max_retries', 2),
+                retry_failed=final_config.get('retry_failed', False),
+                overwrite=final_config.get('overwrite', False),
+                skip_redact_failed_pages=final_config.get('skip_failed_pages', False),
+                max_tasks_per_worker=final_config.get('max_tasks_per_worker'),
+                max_worker_rss_mb=final_config.get('max_worker_rss_mb'),
+                store_shrink_percent=final_config.get('store_shrink_percent', 100)
+            ).run()
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            sys.exit(1)
+        except ValueError as e:
+            logger.error(f"Invalid configuration: {e}")
+            sys.exit(1)
+
+        if isinstance(result, dict) and result.get('rows_failed'):
+            sys.exit(1)
+
+    @staticmethod
+    def run_sharded(
+        final_config: Dict[str, Any]
+    ) -> None:
+        """
+        Execute one role of a sharded redaction job.
+
+        Args:
+            final_config: Dictionary containing all configuration parameters
+        """
+        logger = logging.getLogger(__name__)
+        role = final_config['shard_role']
+        queue_dir = str(final_config['queue_dir'])
+
+        try:
+            if role == 'coordinator':
+                ShardCoordinator(queue_dir).create_job(
+                    src_file=str(final_config.get('src_file')),
+                    dest_file=str(final_config.get('output_file')),
+                    redaction_args=PdfRedacterCLI.build_redaction_args(
+                        final_config),
+                    pages_per_shard=final_config.get('pages_per_shard', 50),
+                    skip_redact_failed_pages=final_config.get(
+                        'skip_failed_pages', False)
+                )
+            elif role == 'worker':
+                ShardWorker(
+                    queue_dir,
+                    worker_id=final_config.get('worker_id'),
+                    max_rss_mb=final_config.get('max_worker_rss_mb'),
+                    store_shrink_percent=final_config.get('store_shrink_percent', 100)
+                ).run()
+            elif role == 'requeue':
+                ShardCoordinator(queue_dir).requeue_stale_tasks(
+                    final_config.get('stale_after', 3600.0))
+            elif role == 'merge':
+                output_file = final_config.get('output_file')
+                result = ShardMerger(queue_dir).merge(
+                    dest_file=str(output_file) if output_file else None,
+                    overwrite=final_config.get('overwrite', False)
+                )
+                if final_config.get('print_stats', False):
+                    PdfRedacterCLI.print_stats(result)
+
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            sys.exit(1)
+        except FileExistsError as e:
+            logger.error(f"File already exists: {e}")
+            sys.exit(1)
+        except (ValueError, RuntimeError, TypeError, OSError) as e:
+            logger.error(f"Sharded {role} failed: {e}")
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     PdfRedacterCLI.main()
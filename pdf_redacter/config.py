@@ -16,6 +16,40 @@ class RedactionConfig:
     validate_patterns: bool = True
     print_stats: bool = True
     dry_run: bool = False
+    profile_patterns: bool = False
+    pattern_cache_dir: Optional[str] = None
+    engine: str = "fitz"
+    coalesce_rects: bool = True
+    coalesce_gap: float = 1.0
+    page_timeout: Optional[float] = None
+    document_deadline: Optional[float] = None
+    timeout_fallback: str = "skip"
+    optimize_output: bool = False
+    profiles: Optional[List[Dict[str, Any]]] = None
+    verify: bool = False
+    verify_sample_rate: float = 0.0
+    verify_workers: int = 1
+    raster_fallback: bool = False
+    raster_dpi: int = 150
+    raster_workers: int = 1
+    shared_forms: bool = False
+    template: Optional[Union[str, Dict[str, Any]]] = None
+    template_match_uncovered: bool = False
+    text_index: Optional[str] = None
+    scan_only: bool = False
+    explain_patterns: bool = False
+    max_tasks_per_worker: Optional[int] = None
+    max_worker_rss_mb: Optional[float] = None
+    store_shrink_percent: int = 100
+    manifest: Optional[str] = None
+    manifest_state: Optional[str] = None
+    max_retries: int = 2
+    prefetch: Optional[int] = None
+    plan_output: Optional[str] = None
+    apply_plan: Optional[str] = None
+    metrics_file: Optional[str] = None
+    metrics_json: Optional[str] = None
+    metrics_interval: float = 15.0
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'RedactionConfig':
@@ -27,6 +61,30 @@ class RedactionConfig:
         return asdict(self)
 
 
+@dataclass
+class RedactionProfile:
+    """
+    A named set of patterns written to its own output file.
+
+    Several profiles are redacted from one source in a single pass; the
+    searches and predefined patterns of the top-level config apply to every
+    profile in addition to the profile's own.
+    """
+    name: str
+    output_file: str
+    searches: Optional[List[str]] = None
+    predefined_patterns: Optional[List[str]] = None
+    replacement: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, profile_dict: Dict[str, Any]) -> 'RedactionProfile':
+        """Create a profile from a dictionary, as found in RedactionConfig.profiles."""
+        missing = [key for key in ('name', 'output_file') if not profile_dict.get(key)]
+        if missing:
+            raise ValueError(f"Profile {profile_dict} is missing {', '.join(missing)}")
+        return cls(**{k: v for k, v in profile_dict.items() if k in cls.__annotations__})
+
+
 class ConfigLoader:
     """Load and validate configuration files."""
 
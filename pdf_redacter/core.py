@@ -1,19 +1,34 @@
 import os
 # import re
-from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType, coalesce_spans
+from pdf_redacter.stats import RedactionStats
+from pdf_redacter.metrics import get_registry
+from pdf_redacter.pattern_cache import PatternSetCache
+from pdf_redacter.stream_engine import ContentStreamRedactor
+from pdf_redacter.geometry import DEFAULT_MERGE_GAP, merge_rects
+from pdf_redacter.optimize import FITZ_SAVE_OPTIONS, combine_results, optimize_document, prune_and_save
+from pdf_redacter.watchdog import PageTimeout, PageWatchdog, TIMEOUT_FALLBACKS
+from pdf_redacter.text_index import TextIndex
+from pdf_redacter.verify import verify_pdf
+from pdf_redacter.raster import DEFAULT_RASTER_DPI, rasterize_pages
+from pdf_redacter.templates import RedactionTemplate
+from pdf_redacter.plan import RECT_PRECISION, PagePlan, RedactionPlan, file_sha256
 import fitz  # PyMuPDF
 import pikepdf
 import tempfile
+import time
 from pathlib import Path
 
 from tqdm import tqdm
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import logging
 
 # Create a logger
 logger = logging.getLogger(__name__)
 
+REDACTION_ENGINES = ("fitz", "stream")
+
 
 class PDFRedactor:
     def __init__(
@@ -61,7 +76,28 @@ class PDFRedactor:
         replacement: str,
         ignore_case: bool,
         predefined_patterns: Optional[List[PatternType]] = None,
-        validate_patterns: bool = True
+        validate_patterns: bool = True,
+        profile_patterns: bool = False,
+        pattern_cache_dir: Optional[str] = None,
+        engine: str = "fitz",
+        coalesce_rects: bool = True,
+        coalesce_gap: float = DEFAULT_MERGE_GAP,
+        page_timeout: Optional[float] = None,
+        document_deadline: Optional[float] = None,
+        timeout_fallback: str = "skip",
+        optimize_output: bool = False,
+        text_index: Optional[str] = None,
+        verify: bool = False,
+        verify_sample_rate: float = 0.0,
+        verify_workers: int = 1,
+        raster_fallback: bool = False,
+        raster_dpi: int = DEFAULT_RASTER_DPI,
+        raster_workers: int = 1,
+        shared_forms: bool = False,
+        template: Optional[RedactionTemplate] = None,
+        template_match_uncovered: bool = False,
+        pattern_matcher: Optional[EnhancedPatternMatcher] = None,
+        compress_output: bool = True
     ) -> dict | None:
         """
         Redact text in the PDF file and save the compressed output.
@@ -75,7 +111,806 @@ class PDFRedactor:
                 ignore_case (bool): Whether the search for patterns should be case-insensitive.
                 predefined_patterns Optional[List[PatternType]]: Support for Pattern Templates for commonly used patterns
                 validate_patterns (bool): Enforce pattern validation.
+                profile_patterns (bool): Record per-pattern scan time and hits in stats["pattern_timings"].
+                pattern_cache_dir (Optional[str]): Directory of the persistent compiled pattern-set cache.
+                engine (str): "fitz" (default), or "stream" to rewrite content streams with pikepdf
+                    and fall back to fitz only for pages with unsupported constructs.
+                coalesce_rects (bool): Merge redaction rects on the same line before annotating.
+                coalesce_gap (float): Largest gap in points bridged when merging rects.
+                page_timeout (Optional[float]): Seconds allowed per page. Pages are then searched
+                    in a supervised subprocess that is killed when a page runs out of time; the
+                    redactions are applied in this process and are not interrupted.
+                document_deadline (Optional[float]): Seconds allowed for the whole document; pages
+                    not redacted by then are treated as timed out.
+                timeout_fallback (str): "skip" handles timed-out pages like pages that failed
+                    redaction, "blank" replaces them with an empty page of the same size.
+                optimize_output (bool): Subset fonts in memory, then deduplicate objects and drop
+                    unreferenced resources in the final save; what each step saved is reported
+                    in stats["optimization"].
+                text_index (Optional[str]): SQLite file caching page text and per-pattern spans;
+                    unchanged pages are not extracted again and only new patterns are matched.
+                verify (bool): Re-extract the written output and report pattern matches still found,
+                    per page, in stats["verification"]. Pages with matches are checked, plus a
+                    sample of the others.
+                verify_sample_rate (float): Share of the pages without matches to verify as well.
+                verify_workers (int): Number of processes used for verification.
+                raster_fallback (bool): Replace pages where applying the redactions fails with an
+                    image of the page with the matches blacked out, instead of leaving them
+                    unredacted or removing them; the page count stays the same.
+                raster_dpi (int): Resolution of the images of rasterized pages.
+                raster_workers (int): Number of processes rendering rasterized pages.
+                shared_forms (bool): With the fitz engine, first redact Form XObjects drawn by
+                    several pages (letterheads, footers) once with the stream engine, so their
+                    matches are not annotated and applied on every page. Every page is still
+                    extracted and matched, form text included; only the stream engine, which
+                    always handles forms this way, also skips that work.
+                template (Optional[RedactionTemplate]): Fixed rects redacted on the pages the template
+                    covers, without text extraction or pattern matching.
+                template_match_uncovered (bool): Match the patterns on the pages the template does
+                    not cover; without it, only template rects are redacted.
+                pattern_matcher (Optional[EnhancedPatternMatcher]): A matcher built beforehand, e.g. once
+                    for many files; needles, ignore_case and the pattern options are then not used.
+                compress_output (bool): Re-save the output through PikePDF with compressed streams.
+                    Without it the fitz output is written as it is, to be compressed later with
+                    compress_pdf(), e.g. by another stage of a RedactionPipeline.
+        """
+        if engine not in REDACTION_ENGINES:
+            raise ValueError(
+                f"Unknown redaction engine '{engine}', expected one of {REDACTION_ENGINES}")
+
+        if timeout_fallback not in TIMEOUT_FALLBACKS:
+            raise ValueError(
+                f"Unknown timeout fallback '{timeout_fallback}', expected one of {TIMEOUT_FALLBACKS}")
+
+        if not 0.0 <= verify_sample_rate <= 1.0:
+            raise ValueError("verify_sample_rate must be between 0 and 1")
+
+        if template is not None:
+            if engine != "fitz":
+                raise ValueError("A template can only be used with the fitz engine")
+            if page_timeout is not None or document_deadline is not None:
+                raise ValueError("A template cannot be used with page timeouts")
+
+        if template is not None and not template_match_uncovered:
+            # Only the template rects are redacted
+            pattern_matcher = None
+        else:
+            if pattern_matcher is None:
+                pattern_matcher = self.build_pattern_matcher(
+                    needles,
+                    ignore_case,
+                    predefined_patterns=predefined_patterns,
+                    validate_patterns=validate_patterns,
+                    pattern_cache_dir=pattern_cache_dir
+                )
+                if pattern_matcher is None:
+                    return None
+
+            # Check if custom patterns list and predefined patterns list both are empty
+            if len(pattern_matcher.patterns) <= 0:
+                logger.error("No valid Search patterns specified")
+                # raise ValueError("Search pattern cannot be empty")
+                return
+
+            pattern_matcher.collect_timings = profile_patterns
+            pattern_matcher.reset_pattern_timings()
+            pattern_matcher.reset_prefilter_stats()
+
+        # Statistics tracking
+        stats = RedactionStats(pattern_matcher.patterns if pattern_matcher is not None else [])
+        if verify and pattern_matcher is None:
+            logger.warning("Verification needs search patterns, skipping it")
+            verify = False
+        if verify:
+            # Tells verification which pages had matches
+            stats.match_fingerprints = {}
+        verify_args = {
+            "sample_rate": verify_sample_rate,
+            "workers": verify_workers
+        } if verify else None
+
+        start_time = time.perf_counter()
+        temp_source = None
+        try:
+            source_file = self.src_file
+            page_numbers = None
+
+            if engine == "fitz" and shared_forms and pattern_matcher is not None:
+                forms_start = time.perf_counter()
+                with pikepdf.open(self.src_file) as pdf:
+                    forms_redacted = ContentStreamRedactor(
+                        pattern_matcher, replacement).redact_shared_forms(pdf, stats)
+                    if forms_redacted:
+                        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                            temp_source = tmp.name
+                        pdf.save(temp_source)
+                        source_file = temp_source
+                        if text_index:
+                            # Cached page text would still contain the forms' matches
+                            logger.debug("The text index is not used after redacting shared forms")
+                            text_index = None
+                stats.add_stage_time("forms", time.perf_counter() - forms_start)
+                logger.debug(f"Redacted {forms_redacted} shared form(s) once")
+
+            if engine == "stream":
+                # Rewrite content streams directly; unsupported pages fall back to fitz
+                stream_start = time.perf_counter()
+                stream_redactor = ContentStreamRedactor(pattern_matcher, replacement)
+                with pikepdf.open(self.src_file) as pdf:
+                    page_numbers = stream_redactor.redact_document(pdf, stats)
+                    stats.add_stage_time("stream", time.perf_counter() - stream_start)
+
+                    if not page_numbers:
+                        # Every page was handled in place: a single save. Pages the
+                        # stream engine handles only use non-embedded fonts, so
+                        # there is nothing to subset, only resources to prune
+                        save_start = time.perf_counter()
+                        if optimize_output:
+                            stats.optimization = prune_and_save(pdf, self.dest_file)
+                        else:
+                            pdf.save(self.dest_file, compress_streams=True)
+                        save_seconds = time.perf_counter() - save_start
+                        if optimize_output:
+                            stats.add_stage_time("optimize", stats.optimization["seconds"])
+                            save_seconds -= stats.optimization["seconds"]
+                        stats.add_stage_time("save", save_seconds)
+                        logger.info(
+                            f"PDF redaction complete. Final file saved as '{self.dest_file}'.")
+                        return self._finish(
+                            stats, pattern_matcher, start_time, verify_args=verify_args)
+
+                    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                        temp_source = tmp.name
+                    pdf.save(temp_source)
+                    source_file = temp_source
+
+                logger.debug(
+                    f"Falling back to fitz for {len(page_numbers)} page(s): {page_numbers}")
+
+            # Open the PDF
+            open_start = time.perf_counter()
+            doc: fitz.Document = fitz.open(source_file)
+            stats.add_stage_time("open", time.perf_counter() - open_start)
+
+            if page_timeout is None and document_deadline is None:
+                index = TextIndex(text_index) if text_index else None
+                try:
+                    failed_redaction_pages = self._redact_fitz_pages(
+                        doc,
+                        page_numbers if page_numbers is not None else range(len(doc)),
+                        pattern_matcher,
+                        replacement,
+                        stats,
+                        coalesce_gap=coalesce_gap if coalesce_rects else None,
+                        text_index=index,
+                        template=template
+                    )
+                finally:
+                    if index is not None:
+                        stats.text_index = index.get_stats()
+                        index.close()
+            else:
+                if text_index:
+                    logger.debug("The text index is not used for supervised pages")
+                # Pages redacted in the subprocess are not fingerprinted: verify them all
+                stats.match_fingerprints = None
+                failed_redaction_pages = self._redact_supervised_pages(
+                    doc,
+                    source_file,
+                    page_numbers if page_numbers is not None else range(len(doc)),
+                    pattern_matcher,
+                    replacement,
+                    stats,
+                    coalesce_gap=coalesce_gap if coalesce_rects else None,
+                    page_timeout=page_timeout,
+                    deadline=start_time + document_deadline if document_deadline is not None else None,
+                    timeout_fallback=timeout_fallback
+                )
+
+            # Save the modified PDF to a temporary file
+            # with tempfile.TemporaryDirectory() as tmpdir:
+            #     temp_file = Path(tmpdir) / f"{Path(self.dest_file).stem}_temp.pdf"
+
+            page_map = self._write_output(
+                doc, stats, failed_redaction_pages, raster_fallback=raster_fallback,
+                raster_dpi=raster_dpi, raster_workers=raster_workers,
+                compress_output=compress_output, optimize_output=optimize_output)
+
+            return self._finish(
+                stats, pattern_matcher, start_time, verify_args=verify_args, page_map=page_map)
+
+        except Exception as e:
+            logger.exception(f"An error occurred: {str(e)}")
+            get_registry().record_failure(time.perf_counter() - start_time)
+            return None
+
+        finally:
+            if temp_source is not None and os.path.exists(temp_source):
+                os.unlink(temp_source)
+
+    def _write_output(
+        self,
+        doc: fitz.Document,
+        stats: RedactionStats,
+        failed_redaction_pages: List[int],
+        raster_fallback: bool = False,
+        raster_dpi: int = DEFAULT_RASTER_DPI,
+        raster_workers: int = 1,
+        compress_output: bool = True,
+        optimize_output: bool = False
+    ) -> Optional[dict]:
+        """
+        Rasterize or remove the pages that failed redaction, save the document
+        to dest_file (compressed through PikePDF unless compress_output is
+        False) and close it.
+
+        With optimize_output, fonts are subset in memory and the save
+        deduplicates objects and drops unreferenced resources; without
+        compress_output, pruning is left to compress_pdf().
+
+        Returns:
+            Optional[dict]: The output page of every source page if pages were removed.
+        """
+        if raster_fallback:
+            # Timed-out pages were never searched and have no rects
+            page_rects = {page_num: stats.failed_page_rects[page_num]
+                          for page_num in failed_redaction_pages
+                          if page_num in stats.failed_page_rects}
+            if page_rects:
+                raster_start = time.perf_counter()
+                stats.rasterized_pages = rasterize_pages(
+                    doc, page_rects, dpi=raster_dpi, workers=raster_workers)
+                stats.add_stage_time("raster", time.perf_counter() - raster_start)
+                failed_redaction_pages = [page_num for page_num in failed_redaction_pages
+                                          if page_num not in page_rects]
+
+        page_map = None
+        if self.skip_redact_failed_pages:
+            page_map = self.output_page_map(len(doc), failed_redaction_pages)
+            stats.removed_pages = list(failed_redaction_pages)
+            # Delete the failed pages from the document (in reverse order to preserve indices)
+            for page_index in sorted(failed_redaction_pages, reverse=True):
+                doc.delete_page(page_index)
+            if failed_redaction_pages:
+                logger.debug(f"Removed Redact Failed Page(s) {failed_redaction_pages}")
+
+        logger.debug(
+            f"PDF Redaction Completed. Total matches: {stats.total_matches}")
+        subset_result = optimize_document(doc) if optimize_output else None
+
+        save_start = time.perf_counter()
+        save_result = None
+        if compress_output:
+            save_result = self.save_compressed(doc, self.dest_file, optimize=optimize_output)
+        else:
+            doc.save(self.dest_file, **(FITZ_SAVE_OPTIONS if optimize_output else {}))
+        save_seconds = time.perf_counter() - save_start
+        if optimize_output:
+            stats.optimization = combine_results(subset_result, save_result)
+            stats.add_stage_time("optimize", stats.optimization["seconds"])
+            save_seconds -= save_result["seconds"] if save_result else 0.0
+        stats.add_stage_time("save", save_seconds)
+        doc.close()
+        return page_map
+
+    @staticmethod
+    def plan_pdf(
+        src_file: str,
+        pattern_matcher: Optional[EnhancedPatternMatcher],
+        replacement: str,
+        coalesce_gap: Optional[float] = DEFAULT_MERGE_GAP,
+        text_index: Optional[str] = None,
+        template: Optional[RedactionTemplate] = None
+    ) -> RedactionPlan:
+        """
+        Extract and match the text of a PDF and resolve the rects to redact,
+        without changing anything.
+
+        Args:
+                src_file (str): The input PDF file.
+                pattern_matcher (Optional[EnhancedPatternMatcher]): The patterns to redact; None
+                    plans only the pages covered by template.
+                replacement (str): The string drawn over redacted areas when the plan is applied.
+                coalesce_gap (Optional[float]): Largest gap in points bridged when merging rects,
+                    None to keep them as found.
+                text_index (Optional[str]): SQLite file caching page text and per-pattern spans.
+                template (Optional[RedactionTemplate]): Fixed rects used on the pages it covers.
+
+        Returns:
+            RedactionPlan: Rects and match counts of every page with redactions.
+        """
+        if pattern_matcher is None and template is None:
+            raise ValueError("Planning needs search patterns or a template")
+
+        plan = RedactionPlan(
+            src_file=str(src_file),
+            source_sha256=file_sha256(src_file),
+            page_count=0,
+            patterns=list(pattern_matcher.patterns) if pattern_matcher is not None else [],
+            replacement=replacement
+        )
+        stats = RedactionStats(plan.patterns)
+        doc_key = TextIndex.document_key(src_file)
+        index = TextIndex(text_index) if text_index else None
+        try:
+            with fitz.open(src_file) as doc:
+                plan.page_count = len(doc)
+                for page in doc:
+                    page_plan = PagePlan(page=page.number)
+                    rects = template.rects_for(page) if template is not None else None
+                    if rects is not None:
+                        page_plan.template = True
+                    elif pattern_matcher is not None:
+                        before = list(stats.pattern_matches)
+                        rects, _ = PDFRedactor.find_page_rects(
+                            page, pattern_matcher, stats, text_index=index, doc_key=doc_key)
+                        page_plan.matches = {
+                            pattern_id: count - before[pattern_id]
+                            for pattern_id, count in enumerate(stats.pattern_matches)
+                            if count != before[pattern_id]}
+                    if not rects and not page_plan.matches:
+                        continue
+                    if coalesce_gap is not None:
+                        rects = merge_rects(rects, gap=coalesce_gap)
+                    page_plan.rects = [tuple(round(value, RECT_PRECISION) for value in rect)
+                                       for rect in rects]
+                    plan.pages.append(page_plan)
+        finally:
+            if index is not None:
+                index.close()
+
+        logger.debug(
+            f"Planned {plan.total_matches} match(es) on {len(plan.pages)} page(s) of '{src_file}'")
+        return plan
+
+    def apply_plan(
+        self,
+        plan: RedactionPlan,
+        raster_fallback: bool = False,
+        raster_dpi: int = DEFAULT_RASTER_DPI,
+        raster_workers: int = 1,
+        optimize_output: bool = False,
+        check_source: bool = True
+    ) -> dict | None:
+        """
+        Write the output of a redaction plan made by plan_pdf().
+
+        The rects of the plan are annotated and applied as they are: no text
+        is extracted or matched, so applying is fast and can be repeated.
+
+        Args:
+                plan (RedactionPlan): The plan of the source file.
+                raster_fallback (bool): Replace pages where applying the redactions fails with images.
+                raster_dpi (int): Resolution of the images of rasterized pages.
+                raster_workers (int): Number of processes rendering rasterized pages.
+                optimize_output (bool): Subset fonts, deduplicate objects and drop unreferenced resources.
+                check_source (bool): Refuse to apply the plan if the source file is not the planned one.
+
+        Returns:
+            dict | None: The redaction stats, None if writing the output failed.
+
+        Raises:
+            ValueError: If check_source is set and the source file differs from the planned one.
+        """
+        if check_source and file_sha256(self.src_file) != plan.source_sha256:
+            raise ValueError(
+                f"'{self.src_file}' is not the file the redaction plan was made for")
+
+        stats = plan.to_stats()
+        start_time = time.perf_counter()
+        try:
+            open_start = time.perf_counter()
+            doc: fitz.Document = fitz.open(self.src_file)
+            stats.add_stage_time("open", time.perf_counter() - open_start)
+
+            failed_redaction_pages = []
+            apply_start = time.perf_counter()
+            for page_plan in plan.pages:
+                page = doc[page_plan.page]
+                rects = [fitz.Rect(rect) for rect in page_plan.rects]
+                # Rects were merged when the plan was made
+                if not self.apply_rects(
+                        page, rects, len(rects), plan.replacement, stats, coalesce_gap=None):
+                    failed_redaction_pages.append(page_plan.page)
+            stats.pages_processed = len(doc)
+            stats.add_stage_time("apply", time.perf_counter() - apply_start)
+
+            page_map = self._write_output(
+                doc, stats, failed_redaction_pages, raster_fallback=raster_fallback,
+                raster_dpi=raster_dpi, raster_workers=raster_workers,
+                optimize_output=optimize_output)
+
+            return self._finish(stats, None, start_time, page_map=page_map)
+
+        except Exception as e:
+            logger.exception(f"An error occurred: {str(e)}")
+            get_registry().record_failure(time.perf_counter() - start_time)
+            return None
+
+    def _finish(
+        self,
+        stats: RedactionStats,
+        pattern_matcher: Optional[EnhancedPatternMatcher],
+        start_time: float,
+        verify_args: Optional[dict] = None,
+        page_map: Optional[dict] = None
+    ) -> dict:
+        """
+        Optionally verify the output, then convert stats to the result
+        dictionary and record metrics.
+        """
+        if pattern_matcher is not None:
+            if pattern_matcher.collect_timings:
+                stats.pattern_timings = pattern_matcher.get_pattern_timings()
+            stats.prefilter = pattern_matcher.get_prefilter_stats()
+
+        if verify_args is not None:
+            stats.verification = verify_pdf(
+                self.dest_file,
+                pattern_matcher,
+                match_fingerprints=stats.match_fingerprints,
+                page_map=page_map,
+                **verify_args
+            )
+            stats.add_stage_time("verify", stats.verification["seconds"])
+
+        result = stats.to_dict()
+        get_registry().record_document(
+            result, time.perf_counter() - start_time)
+        return result
+
+    def _redact_fitz_pages(
+        self,
+        doc: fitz.Document,
+        page_numbers: Iterable[int],
+        pattern_matcher: EnhancedPatternMatcher,
+        replacement: str,
+        stats: RedactionStats,
+        coalesce_gap: Optional[float] = DEFAULT_MERGE_GAP,
+        text_index: Optional[TextIndex] = None,
+        template: Optional[RedactionTemplate] = None
+    ) -> List[int]:
+        """
+        Search and redact the given pages of an open document with fitz.
+
+        The rects found on a page are merged with merge_rects() before they
+        are turned into redaction annotations, unless coalesce_gap is None.
+        With a text_index, page text and spans come from the index. Pages
+        covered by a template get its rects; the others are searched if
+        pattern_matcher is set and left as they are otherwise.
+
+        Returns:
+            List[int]: Page numbers where applying the redactions failed.
+        """
+        page_numbers = list(page_numbers)
+        failed_redaction_pages = []
+        doc_key = TextIndex.document_key(self.src_file)
+
+        # Iterate through pages and search for the text
+        for page_num in tqdm(
+                page_numbers,
+                total=len(page_numbers),
+                desc="Redacting",
+                unit="page"
+        ):
+            page = doc[page_num]
+            template_rects = template.rects_for(page) if template is not None else None
+            if template_rects is not None:
+                redacted = self.redact_template_page(
+                    page, template_rects, replacement, stats, coalesce_gap)
+            elif pattern_matcher is not None:
+                redacted = self.redact_page(
+                    page, pattern_matcher, replacement, stats, coalesce_gap,
+                    text_index=text_index, doc_key=doc_key)
+            else:
+                stats.pages_processed += 1
+                redacted = True
+            if not redacted:
+                failed_redaction_pages.append(page_num)
+
+        return failed_redaction_pages
+
+    def _redact_supervised_pages(
+        self,
+        doc: fitz.Document,
+        source_file: str,
+        page_numbers: Iterable[int],
+        pattern_matcher: EnhancedPatternMatcher,
+        replacement: str,
+        stats: RedactionStats,
+        coalesce_gap: Optional[float] = DEFAULT_MERGE_GAP,
+        page_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        timeout_fallback: str = "skip"
+    ) -> List[int]:
+        """
+        Redact pages searched in a PageWatchdog subprocess under a time budget.
+
+        The subprocess extracts and matches the text of each page; the rects
+        it finds are applied to the page of doc in this process, which the
+        page timeout cannot interrupt. A page whose rects arrive after the
+        deadline is not applied, and an apply that outlasts the page timeout
+        is logged. Pages that run out of time are recorded in stats and
+        handled by timeout_fallback.
+
+        Returns:
+            List[int]: Page numbers where redaction failed or timed out (with "skip").
+        """
+        page_numbers = list(page_numbers)
+        failed_redaction_pages = []
+        timed_out_pages = []
+
+        with PageWatchdog(source_file, pattern_matcher) as watchdog:
+            for page_num in tqdm(
+                    page_numbers,
+                    total=len(page_numbers),
+                    desc="Redacting",
+                    unit="page"
+            ):
+                timeout = page_timeout
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                if timeout <= 0:
+                    timed_out_pages.append(page_num)
+                    continue
+
+                try:
+                    rects, page_matches, page_stats, timings, prefilter_stats = \
+                        watchdog.find_page_rects(page_num, timeout)
+                except PageTimeout as e:
+                    logger.warning(f" {e}")
+                    timed_out_pages.append(page_num)
+                    continue
+
+                if deadline is not None and rects and time.perf_counter() >= deadline:
+                    # Applying is not bounded by the subprocess: don't start past the deadline
+                    logger.warning(f" Page {page_num} was searched past the document deadline")
+                    timed_out_pages.append(page_num)
+                    continue
+
+                stats.merge(page_stats)
+                pattern_matcher.merge_pattern_timings(timings)
+                pattern_matcher.merge_prefilter_stats(prefilter_stats)
+
+                stats.pages_processed += 1
+                if rects is None:
+                    # The subprocess died on the page
+                    stats.pages_failed_redaction += 1
+                    failed_redaction_pages.append(page_num)
+                    continue
+
+                apply_start = time.perf_counter()
+                redacted = self.apply_rects(
+                    doc[page_num], [fitz.Rect(rect) for rect in rects], page_matches,
+                    replacement, stats, coalesce_gap)
+                apply_seconds = time.perf_counter() - apply_start
+                stats.add_stage_time("apply", apply_seconds)
+                if page_timeout is not None and apply_seconds > page_timeout:
+                    logger.warning(
+                        f" Applying the redactions of page {page_num} took {apply_seconds:.1f}s, "
+                        f"past the page timeout; it runs in this process and is not interrupted")
+                if not redacted:
+                    failed_redaction_pages.append(page_num)
+
+            if watchdog.restarts:
+                logger.debug(f"Page subprocess restarted {watchdog.restarts} time(s)")
+
+        if deadline is not None and time.perf_counter() > deadline:
+            logger.warning("Document deadline exceeded")
+
+        for page_num in timed_out_pages:
+            stats.timed_out_pages.append(page_num)
+            stats.pages_processed += 1
+            if timeout_fallback == "blank":
+                page_rect = doc[page_num].rect
+                doc.delete_page(page_num)
+                doc.new_page(page_num, width=page_rect.width, height=page_rect.height)
+            else:
+                failed_redaction_pages.append(page_num)
+                stats.pages_failed_redaction += 1
+
+        return sorted(failed_redaction_pages)
+
+    @staticmethod
+    def redact_page(
+        page: fitz.Page,
+        pattern_matcher: EnhancedPatternMatcher,
+        replacement: str,
+        stats: RedactionStats,
+        coalesce_gap: Optional[float] = DEFAULT_MERGE_GAP,
+        text_index: Optional[TextIndex] = None,
+        doc_key: Optional[str] = None
+    ) -> bool:
+        """
+        Search and redact a single page, updating stats.
+
+        With a text_index, the page text and match spans are looked up under
+        doc_key; they are only extracted and matched on a cache miss.
+
+        Returns:
+            bool: False if applying the redactions failed, True otherwise.
+        """
+        page_rects, page_matches = PDFRedactor.find_page_rects(
+            page, pattern_matcher, stats, text_index=text_index, doc_key=doc_key)
+
+        apply_start = time.perf_counter()
+        redacted = PDFRedactor.apply_rects(
+            page, page_rects, page_matches, replacement, stats, coalesce_gap)
+
+        stats.pages_processed += 1
+        stats.add_stage_time("apply", time.perf_counter() - apply_start)
+
+        return redacted
+
+    @staticmethod
+    def find_page_rects(
+        page: fitz.Page,
+        pattern_matcher: EnhancedPatternMatcher,
+        stats: RedactionStats,
+        text_index: Optional[TextIndex] = None,
+        doc_key: Optional[str] = None
+    ) -> Tuple[List[fitz.Rect], int]:
+        """
+        Extract and match the text of a page and find the rects of the matches,
+        recording matches and fingerprints in stats.
+
+        Returns:
+            tuple: The rects (not merged) and the number of matches.
+        """
+        stage_start = time.perf_counter()
+        if text_index is not None:
+            page_text, page_spans = text_index.page_spans(doc_key, page, pattern_matcher)
+            disjoint_spans = coalesce_spans(page_spans)
+        else:
+            # Convert the page text to a string using page.get_text()
+            page_text = page.get_text()
+            disjoint_spans = pattern_matcher.iter_disjoint_spans(page_text)
+        extract_end = time.perf_counter()
+
+        page_matches = 0
+        page_rects = []
+        searched = set()
+
+        # Consume overlapping matches merged into disjoint spans, in position order
+        for start_idx, end_idx, pattern_ids in disjoint_spans:
+            # Track statistics, per original match
+            for pattern_id in pattern_ids:
+                stats.record_match(pattern_id)
+            page_matches += len(pattern_ids)
+
+            # search_for finds every occurrence on the page, search each text once
+            needle = page_text[start_idx:end_idx]
+            stats.record_fingerprint(page.number, needle)
+            if needle in searched:
+                continue
+            searched.add(needle)
+            page_rects.extend(page.search_for(needle))
+
+        stats.spans_searched += len(searched)
+
+        stats.add_stage_time("extract", extract_end - stage_start)
+        stats.add_stage_time("match", time.perf_counter() - extract_end)
+        return page_rects, page_matches
+
+    @staticmethod
+    def redact_template_page(
+        page: fitz.Page,
+        rects: List[fitz.Rect],
+        replacement: str,
+        stats: RedactionStats,
+        coalesce_gap: Optional[float] = DEFAULT_MERGE_GAP
+    ) -> bool:
+        """
+        Redact the fixed rects of a template on a page, without extracting its text.
+
+        Returns:
+            bool: False if applying the redactions failed, True otherwise.
+        """
+        stage_start = time.perf_counter()
+        redacted = PDFRedactor.apply_rects(
+            page, rects, len(rects), replacement, stats, coalesce_gap)
+        stats.pages_processed += 1
+        stats.template_pages += 1
+        stats.template_rects += len(rects)
+        stats.add_stage_time("apply", time.perf_counter() - stage_start)
+        return redacted
+
+    @staticmethod
+    def output_page_map(page_count: int, removed_pages: Iterable[int]) -> dict:
+        """Map every source page to its page number in the output, None if it was removed."""
+        removed = set(removed_pages)
+        page_map = {}
+        output_page = 0
+        for page_num in range(page_count):
+            if page_num in removed:
+                page_map[page_num] = None
+            else:
+                page_map[page_num] = output_page
+                output_page += 1
+        return page_map
+
+    @staticmethod
+    def apply_rects(
+        page: fitz.Page,
+        page_rects: List[fitz.Rect],
+        page_matches: int,
+        replacement: str,
+        stats: RedactionStats,
+        coalesce_gap: Optional[float] = DEFAULT_MERGE_GAP
+    ) -> bool:
+        """
+        Turn the rects found on a page into redaction annotations and apply them.
+
+        Returns:
+            bool: False if applying the redactions failed, True otherwise.
+        """
+        redacted = True
+
+        # Merge neighbouring rects so apply_redactions has fewer annotations to process
+        if coalesce_gap is not None:
+            redact_rects = merge_rects(page_rects, gap=coalesce_gap)
+        else:
+            redact_rects = page_rects
+        for rect in redact_rects:
+            page.add_redact_annot(
+                rect, replacement, fill=(1, 1, 1))
+        stats.annotations_requested += len(page_rects)
+        stats.annotations_applied += len(redact_rects)
+
+        # Only apply redactions if there were matches on this page
+        if page_matches > 0:
+            try:
+                page.apply_redactions()
+                stats.pages_modified += 1
+            except Exception as e:
+                logger.warning(
+                    f" Error in redacting page {page.number}: {e}")
+                stats.pages_failed_redaction += 1
+                stats.failed_page_rects[page.number] = [tuple(rect) for rect in redact_rects]
+                redacted = False
+            # logger.debug(f"Page {page.number + 1}: Applied {page_matches} redactions")
+
+        return redacted
+
+    @staticmethod
+    def build_pattern_matcher(
+        needles: Optional[List[str]],
+        ignore_case: bool,
+        predefined_patterns: Optional[List[PatternType]] = None,
+        validate_patterns: bool = True,
+        pattern_cache_dir: Optional[str] = None
+    ) -> Optional[EnhancedPatternMatcher]:
+        """
+        Validate and compile the configured patterns into a matcher.
+
+        With pattern_cache_dir set, a previously built pattern set for the same
+        configuration and package version is loaded instead of being rebuilt.
+
+        Args:
+                needles (list): List of strings or regex patterns to match text for redaction.
+                ignore_case (bool): Whether the search for patterns should be case-insensitive.
+                predefined_patterns Optional[List[PatternType]]: Support for Pattern Templates for commonly used patterns
+                validate_patterns (bool): Enforce pattern validation.
+                pattern_cache_dir (Optional[str]): Directory of the persistent compiled pattern-set cache.
+
+        Returns:
+            Optional[EnhancedPatternMatcher]: The matcher, or None if a pattern is invalid.
         """
+        cache = None
+        if pattern_cache_dir:
+            cache = PatternSetCache(pattern_cache_dir)
+            cache_key = PatternSetCache.fingerprint(
+                needles, ignore_case, predefined_patterns)
+            # Predefined patterns come first, as they are added below
+            expected_patterns = [
+                EnhancedPatternMatcher.PATTERN_TEMPLATES[pattern_type].pattern
+                for pattern_type in predefined_patterns or []
+                if pattern_type in EnhancedPatternMatcher.PATTERN_TEMPLATES
+            ] + list(needles or [])
+            cached_matcher = cache.load(cache_key, expected_patterns, ignore_case)
+            if cached_matcher is not None:
+                return cached_matcher
 
         # Initialize enhanced pattern matcher
         pattern_matcher = EnhancedPatternMatcher()
@@ -117,104 +952,75 @@ class PDFRedactor:
         for info in pattern_info:
             logger.debug(f"  - {info['name']}: {info['pattern']}")
 
-        # Check if custom patterns list and predefined patterns list both are empty
-        if len(pattern_info) <= 0:
-            logger.error("No valid Search patterns specified")
-            # raise ValueError("Search pattern cannot be empty")
-            return
-
-        # Statistics tracking
-        stats = {
-            "total_matches": 0,
-            "pages_processed": 0,
-            "pages_modified": 0,
-            "pages_failed_redaction": 0,
-            "patterns_used": len(pattern_info),
-            "matches_by_pattern": {}
-        }
-
-        try:
-            # Open the PDF
-            doc: fitz.Document = fitz.open(self.src_file)
-            total_pages = len(doc)  # Get the total number of pages in the PDF
-            failed_redaction_pages = []
-
-            # Iterate through pages and search for the text
-            for page_num, page in tqdm(
-                    enumerate(doc.pages()),
-                    total=total_pages,
-                    desc="Redacting",
-                    unit="page"
-            ):
-                # Convert the page text to a string using page.get_text()
-                page_text = page.get_text()
-                page_matches = 0
-
-                # Find all matches using enhanced matcher
-                matches = pattern_matcher.find_matches(page_text)
-
-                for start_idx, end_idx, matched_text, pattern in matches:
-                    # Track statistics
-                    stats["total_matches"] += 1
-                    page_matches += 1
-
-                    if pattern not in stats["matches_by_pattern"]:
-                        stats["matches_by_pattern"][pattern] = 0
-                    stats["matches_by_pattern"][pattern] += 1
-
-                    # Apply redaction (existing logic)
-                    text_instances = page.search_for(matched_text)
-                    for inst in text_instances:
-                        page.add_redact_annot(
-                            inst, replacement, fill=(1, 1, 1))
-
-                # Only apply redactions if there were matches on this page
-                if page_matches > 0:
-                    try:
-                        page.apply_redactions()
-                        stats["pages_modified"] += 1
-                    except Exception as e:
-                        logger.warning(
-                            f" Error in redacting page {page_num}: {e}")
-                        failed_redaction_pages.append(page_num)
-                        stats["pages_failed_redaction"] += 1
-                    # logger.debug(f"Page {page_num + 1}: Applied {page_matches} redactions")
-
-                stats["pages_processed"] += 1
-
-                # if page_matches > 0:
-                #     logger.debug(
-                #         f"Page {page_num + 1}: {page_matches} matches found")
+        if cache is not None and pattern_info:
+            # Stored with the patterns, so warm starts skip planning as well
+            pattern_matcher.plan_patterns()
+            cache.store(cache_key, pattern_matcher)
 
-            # Save the modified PDF to a temporary file
-            # with tempfile.TemporaryDirectory() as tmpdir:
-            #     temp_file = Path(tmpdir) / f"{Path(self.dest_file).stem}_temp.pdf"
+        return pattern_matcher
 
-            if self.skip_redact_failed_pages:
-                # Delete the failed pages from the document (in reverse order to preserve indices)
-                for page_index in sorted(failed_redaction_pages, reverse=True):
-                    doc.delete_page(page_index)
-                if failed_redaction_pages:
-                    logger.debug(f"Removed Redact Failed Page(s) {failed_redaction_pages}")
+    @staticmethod
+    def save_compressed(
+        doc: fitz.Document,
+        dest_file: str,
+        optimize: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Save a fitz document to dest_file with compressed streams.
 
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                temp_file = tmp.name
+        The document is written to a temporary file first and then re-saved
+        through PikePDF for size optimization.
 
-            # temp_file = f"{self.dest_file}_temp.pdf"
-            doc.save(temp_file)
-            logger.debug(
-                f"PDF Redaction Completed. Total matches: {stats['total_matches']}")
+        Args:
+            doc (fitz.Document): The document to save.
+            dest_file (str): The output PDF file path.
+            optimize (bool): Deduplicate objects and drop unreferenced resources.
 
-            # Open the temporary file with PikePDF and compress it
-            with pikepdf.open(temp_file) as pdf:
-                pdf.save(self.dest_file, compress_streams=True)
-                logger.info(
-                    f"PDF compression complete. Final file saved as '{self.dest_file}'.")
+        Returns:
+            Optional[dict]: With optimize, what each step saved: see compress_pdf(),
+                plus objects_deduplicated by the fitz save.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            temp_file = tmp.name
 
+        try:
+            objects_before = doc.xref_length() - 1
+            doc.save(temp_file, **(FITZ_SAVE_OPTIONS if optimize else {}))
+            result = PDFRedactor.compress_pdf(temp_file, dest_file, optimize=optimize)
+            if result is not None:
+                result["objects_deduplicated"] = objects_before - result.pop("objects_written")
+            return result
+        finally:
             # Remove the temporary file
             os.unlink(temp_file)
-            return stats
 
-        except Exception as e:
-            logger.exception(f"An error occurred: {str(e)}")
-            return None
+    @staticmethod
+    def compress_pdf(
+        src_file: str,
+        dest_file: str,
+        optimize: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Re-save a PDF written by fitz through PikePDF with compressed streams.
+
+        Args:
+            src_file (str): The uncompressed PDF file.
+            dest_file (str): The output PDF file path.
+            optimize (bool): Drop unreferenced resources and write object streams.
+
+        Returns:
+            Optional[dict]: With optimize, the result of prune_and_save(), whose
+                prune_bytes_saved compares the output with src_file, plus the
+                objects_written to src_file.
+        """
+        result = None
+        with pikepdf.open(src_file) as pdf:
+            if optimize:
+                objects_written = len(pdf.objects)
+                result = prune_and_save(pdf, dest_file, size_before=os.path.getsize(src_file))
+                result["objects_written"] = objects_written
+            else:
+                pdf.save(dest_file, compress_streams=True)
+            logger.info(
+                f"PDF compression complete. Final file saved as '{dest_file}'.")
+        return result
@@ -0,0 +1,204 @@
+import inspect
+import threading
+from typing import Any, Dict, List, Optional
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.geometry import DEFAULT_MERGE_GAP
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+from pdf_redacter.plan import APPLY_OPTIONS, RedactionPlan
+from pdf_redacter.templates import RedactionTemplate
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# redact_pdf arguments the engine fixes when it is created
+_PATTERN_ARGS = (
+    "needles", "replacement", "ignore_case", "predefined_patterns", "validate_patterns",
+    "pattern_cache_dir", "template", "template_match_uncovered", "pattern_matcher"
+)
+
+
+class RedactionEngine:
+    """
+    Redact many documents with one pattern configuration.
+
+    PDFRedactor is bound to one source and destination and builds its
+    matcher in every redact_pdf() call. The engine validates and compiles
+    the patterns once, keeps the matcher and its pattern info, and redacts
+    any number of documents with ``redact(src_file, dest_file)``, or in two
+    phases with ``plan(src_file)`` and ``apply(plan, dest_file)``.
+
+    Calls are serialized by a lock, since redact_pdf() resets the matcher's
+    per-document timing and prefilter counters. The engine can be pickled
+    (e.g. as an initializer argument of a worker pool) and reused for the
+    lifetime of a worker process.
+    """
+
+    def __init__(
+        self,
+        needles: Optional[List[str]] = None,
+        replacement: str = "***REDACTED***",
+        ignore_case: bool = False,
+        predefined_patterns: Optional[List[PatternType]] = None,
+        validate_patterns: bool = True,
+        pattern_cache_dir: Optional[str] = None,
+        template: Optional[RedactionTemplate] = None,
+        template_match_uncovered: bool = False,
+        overwrite: bool = False,
+        skip_redact_failed_pages: bool = False,
+        **redaction_options: Any
+    ):
+        """
+        Args:
+            needles (Optional[List[str]]): Strings or regex patterns to redact.
+            replacement (str): Text drawn over redacted areas.
+            ignore_case (bool): Whether patterns are matched case-insensitively.
+            predefined_patterns (Optional[List[PatternType]]): Pattern templates to redact.
+            validate_patterns (bool): Enforce pattern validation.
+            pattern_cache_dir (Optional[str]): Directory of the persistent compiled pattern-set cache.
+            template (Optional[RedactionTemplate]): Fixed rects redacted without text extraction.
+            template_match_uncovered (bool): Match the patterns on pages the template does not cover.
+            overwrite (bool): Default for whether existing destination files are overwritten.
+            skip_redact_failed_pages (bool): Whether to remove pages that fail redaction.
+            **redaction_options: Further keyword arguments of PDFRedactor.redact_pdf,
+                e.g. engine, coalesce_gap, verify or optimize_output.
+
+        Raises:
+            TypeError: If an option is not a redact_pdf argument.
+            ValueError: If the patterns are invalid or there are none (and no template).
+        """
+        parameters = set(inspect.signature(PDFRedactor.redact_pdf).parameters)
+        unknown = set(redaction_options) - (parameters - {"self", *_PATTERN_ARGS})
+        if unknown:
+            raise TypeError(f"Unknown redaction option(s): {', '.join(sorted(unknown))}")
+
+        self.replacement = replacement
+        self.ignore_case = ignore_case
+        self.template = template
+        self.template_match_uncovered = template_match_uncovered
+        self.overwrite = overwrite
+        self.skip_redact_failed_pages = skip_redact_failed_pages
+        self.redaction_options = dict(redaction_options)
+        self.documents = 0
+
+        self.pattern_matcher: Optional[EnhancedPatternMatcher] = None
+        self.pattern_info: List[Dict[str, str]] = []
+        if template is None or template_match_uncovered:
+            self.pattern_matcher = PDFRedactor.build_pattern_matcher(
+                needles,
+                ignore_case,
+                predefined_patterns=predefined_patterns,
+                validate_patterns=validate_patterns,
+                pattern_cache_dir=pattern_cache_dir
+            )
+            if self.pattern_matcher is None:
+                raise ValueError("Invalid search patterns")
+            if not self.pattern_matcher.patterns:
+                raise ValueError("No valid search patterns specified")
+            self.pattern_info = self.pattern_matcher.get_pattern_info()
+
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def redact(
+        self,
+        src_file: str,
+        dest_file: str,
+        overwrite: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Redact one document with the engine's patterns and options.
+
+        Args:
+            src_file (str): The input PDF file.
+            dest_file (str): The output PDF file.
+            overwrite (Optional[bool]): Overrides the engine's overwrite setting.
+
+        Returns:
+            Optional[dict]: The stats of PDFRedactor.redact_pdf, or None if redaction failed.
+
+        Raises:
+            FileNotFoundError: If src_file does not exist.
+            FileExistsError: If dest_file exists and may not be overwritten.
+        """
+        redactor = PDFRedactor(
+            src_file=src_file,
+            dest_file=dest_file,
+            overwrite=self.overwrite if overwrite is None else overwrite,
+            skip_redact_failed_pages=self.skip_redact_failed_pages
+        )
+        with self._lock:
+            self.documents += 1
+            return redactor.redact_pdf(
+                needles=None,
+                replacement=self.replacement,
+                ignore_case=self.ignore_case,
+                template=self.template,
+                template_match_uncovered=self.template_match_uncovered,
+                pattern_matcher=self.pattern_matcher,
+                **self.redaction_options
+            )
+
+    def plan(self, src_file: str) -> RedactionPlan:
+        """
+        Plan the redaction of one document without writing anything.
+
+        Args:
+            src_file (str): The input PDF file.
+
+        Returns:
+            RedactionPlan: The plan, to be applied with apply().
+        """
+        coalesce_gap = self.redaction_options.get("coalesce_gap", DEFAULT_MERGE_GAP)
+        with self._lock:
+            return PDFRedactor.plan_pdf(
+                src_file,
+                self.pattern_matcher,
+                self.replacement,
+                coalesce_gap=coalesce_gap if self.redaction_options.get("coalesce_rects", True) else None,
+                text_index=self.redaction_options.get("text_index"),
+                template=self.template
+            )
+
+    def apply(
+        self,
+        plan: RedactionPlan,
+        dest_file: str,
+        overwrite: Optional[bool] = None,
+        src_file: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Write the output of a plan made by plan(), without any text work.
+
+        Args:
+            plan (RedactionPlan): The plan to apply.
+            dest_file (str): The output PDF file.
+            overwrite (Optional[bool]): Overrides the engine's overwrite setting.
+            src_file (Optional[str]): The source, if it moved since planning; defaults to the
+                plan's source file. Its content must be the planned one.
+
+        Returns:
+            Optional[dict]: The redaction stats, or None if writing the output failed.
+        """
+        redactor = PDFRedactor(
+            src_file=src_file or plan.src_file,
+            dest_file=dest_file,
+            overwrite=self.overwrite if overwrite is None else overwrite,
+            skip_redact_failed_pages=self.skip_redact_failed_pages
+        )
+        apply_options = {key: value for key, value in self.redaction_options.items()
+                         if key in APPLY_OPTIONS}
+        # apply_plan() does not use the matcher, so only the counter is locked
+        with self._lock:
+            self.documents += 1
+        return redactor.apply_plan(plan, **apply_options)
@@ -0,0 +1,123 @@
+from typing import List, Sequence
+
+import fitz  # PyMuPDF
+
+try:
+    import numpy as np
+except ImportError:  # optional, installed with the "fast" extra
+    np = None
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Horizontal gap (in points) up to which rects on the same line are merged
+DEFAULT_MERGE_GAP = 1.0
+
+# Rects whose top and bottom edges agree within this many points share a line
+DEFAULT_LINE_TOLERANCE = 1.0
+
+# Below this many rects the pure Python path is faster than NumPy
+VECTORIZE_THRESHOLD = 64
+
+
+def _line_key(rect: fitz.Rect, line_tolerance: float) -> tuple:
+    return (round(rect.y0 / line_tolerance), round(rect.y1 / line_tolerance))
+
+
+def _merge_rects_python(
+    rects: Sequence[fitz.Rect],
+    gap: float,
+    line_tolerance: float
+) -> List[fitz.Rect]:
+    merged: List[fitz.Rect] = []
+    current = None
+    current_key = None
+
+    for rect in sorted(rects, key=lambda r: _line_key(r, line_tolerance) + (r.x0,)):
+        key = _line_key(rect, line_tolerance)
+        if current is not None and key == current_key and rect.x0 <= current.x1 + gap:
+            current.include_rect(rect)
+            continue
+        current = fitz.Rect(rect)
+        current_key = key
+        merged.append(current)
+
+    return merged
+
+
+def _merge_rects_numpy(
+    rects: Sequence[fitz.Rect],
+    gap: float,
+    line_tolerance: float
+) -> List[fitz.Rect]:
+    coords = np.array([tuple(rect) for rect in rects], dtype=np.float64)
+    x0, y0, x1, y1 = coords.T
+    top = np.round(y0 / line_tolerance)
+    bottom = np.round(y1 / line_tolerance)
+
+    # Sort by line, then left edge
+    order = np.lexsort((x0, bottom, top))
+    coords = coords[order]
+    x0, y0, x1, y1 = coords.T
+    top, bottom = top[order], bottom[order]
+
+    # Shift each line to its own stretch of the x axis, so a single running
+    # maximum of the right edges never carries over from one line to the next
+    new_line = np.empty(len(coords), dtype=bool)
+    new_line[0] = True
+    new_line[1:] = (top[1:] != top[:-1]) | (bottom[1:] != bottom[:-1])
+    span = x1.max() - x0.min() + gap + 1.0
+    offset = np.cumsum(new_line) * span
+    reach = np.maximum.accumulate(x1 + offset)
+
+    # A rect starts a new group when it begins past the reach of the group so far
+    starts = np.empty(len(coords), dtype=bool)
+    starts[0] = True
+    starts[1:] = (x0[1:] + offset[1:]) > reach[:-1] + gap
+    bounds = np.flatnonzero(starts)
+
+    merged_x0 = np.minimum.reduceat(x0, bounds)
+    merged_y0 = np.minimum.reduceat(y0, bounds)
+    merged_x1 = np.maximum.reduceat(x1, bounds)
+    merged_y1 = np.maximum.reduceat(y1, bounds)
+
+    return [
+        fitz.Rect(*rect)
+        for rect in zip(merged_x0.tolist(), merged_y0.tolist(),
+                       merged_x1.tolist(), merged_y1.tolist())
+    ]
+
+
+def merge_rects(
+    rects: Sequence[fitz.Rect],
+    gap: float = DEFAULT_MERGE_GAP,
+    line_tolerance: float = DEFAULT_LINE_TOLERANCE
+) -> List[fitz.Rect]:
+    """
+    Merge rects on the same line that overlap or are at most gap points apart.
+
+    Rects share a line when their top and bottom edges agree within
+    line_tolerance. Large inputs are merged with vectorized NumPy interval
+    operations when NumPy is installed.
+
+    Args:
+        rects (Sequence[fitz.Rect]): Rects to merge, in any order.
+        gap (float): Largest horizontal gap bridged between two rects.
+        line_tolerance (float): Tolerance used to group rects into lines.
+
+    Returns:
+        List[fitz.Rect]: Merged rects, ordered by line and left edge.
+    """
+    if gap < 0:
+        raise ValueError("gap must not be negative")
+    if line_tolerance <= 0:
+        raise ValueError("line_tolerance must be positive")
+
+    if len(rects) < 2:
+        return [fitz.Rect(rect) for rect in rects]
+
+    if np is not None and len(rects) >= VECTORIZE_THRESHOLD:
+        return _merge_rects_numpy(rects, gap, line_tolerance)
+    return _merge_rects_python(rects, gap, line_tolerance)
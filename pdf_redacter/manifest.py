@@ -0,0 +1,358 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pdf_redacter.engine import RedactionEngine
+from pdf_redacter.metrics import get_registry
+from pdf_redacter.pattern_matcher import PatternType
+from pdf_redacter.workers import WorkerPool
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Profile used for rows that do not name one
+DEFAULT_PROFILE = ""
+
+# Redaction engines by profile name of a pool worker process
+_worker_engines: Dict[str, RedactionEngine] = {}
+
+
+def _init_worker(engines: Dict[str, RedactionEngine]) -> None:
+    """Keep the engines built by the runner for every row of this worker."""
+    global _worker_engines
+    _worker_engines = engines
+
+
+def _redact_row(
+    src_file: str,
+    dest_file: str,
+    profile: str,
+    overwrite: bool
+) -> Tuple[Dict[str, Any], float]:
+    """Redact one manifest row in a pool worker. Returns (stats, seconds)."""
+    start_time = time.perf_counter()
+    if not overwrite and os.path.exists(dest_file):
+        raise FileExistsError(f"Destination file '{dest_file}' already exists")
+
+    # Written next to the destination and renamed when complete
+    Path(dest_file).parent.mkdir(parents=True, exist_ok=True)
+    partial_file = f"{dest_file}.partial"
+    try:
+        stats = _worker_engines[profile].redact(src_file, partial_file, overwrite=True)
+        if not stats:
+            raise RuntimeError("redaction failed")
+        if stats.get("verification", {}).get("leaks"):
+            raise RuntimeError(
+                f"verification found matches on page(s) "
+                f"{stats['verification']['pages_with_leaks']}")
+        os.replace(partial_file, dest_file)
+    finally:
+        if os.path.exists(partial_file):
+            os.unlink(partial_file)
+    return stats, time.perf_counter() - start_time
+
+
+def iter_manifest(manifest_file: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Stream the rows of a CSV or JSONL manifest.
+
+    CSV manifests need a header with src and dest columns and may have a
+    profile column; JSONL manifests hold one object with the same keys per
+    line. Blank lines are skipped but keep their row number.
+
+    Yields:
+        tuple: The zero-based row number and the row.
+    """
+    path = Path(manifest_file)
+    with open(path, newline="") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for row_number, line in enumerate(f):
+                if line.strip():
+                    yield row_number, json.loads(line)
+        elif path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            for row_number, row in enumerate(reader):
+                yield row_number, row
+        else:
+            raise ValueError(f"Unsupported manifest format: {path.suffix}")
+
+
+class RowBitmap:
+    """Set of non-negative row numbers, one bit per row."""
+
+    def __init__(self):
+        self._bits = bytearray()
+
+    def add(self, row: int) -> None:
+        index = row >> 3
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index - len(self._bits) + 1))
+        self._bits[index] |= 1 << (row & 7)
+
+    def __contains__(self, row: int) -> bool:
+        index = row >> 3
+        return index < len(self._bits) and bool(self._bits[index] & (1 << (row & 7)))
+
+
+class ManifestRunner:
+    """
+    Redact the rows of a CSV/JSONL manifest of (src, dest, profile) entries.
+
+    The manifest is streamed, and at most ``workers + prefetch`` rows are in
+    flight at any time, so memory does not grow with the manifest. Every
+    finished row is appended to a JSONL state file with its outcome, attempt
+    count and stats; a restarted run reads the state file into a bitmap and
+    skips finished rows. Failed attempts are retried up to max_retries times.
+    Rows are redacted on a WorkerPool with one RedactionEngine per profile,
+    built up front.
+    """
+
+    def __init__(
+        self,
+        manifest_file: str,
+        redaction_args: Dict[str, Any],
+        state_file: Optional[str] = None,
+        profiles: Optional[List[Dict[str, Any]]] = None,
+        workers: int = 1,
+        prefetch: Optional[int] = None,
+        max_retries: int = 2,
+        retry_failed: bool = False,
+        overwrite: bool = False,
+        skip_redact_failed_pages: bool = False,
+        max_tasks_per_worker: Optional[int] = None,
+        max_worker_rss_mb: Optional[float] = None,
+        store_shrink_percent: int = 100
+    ):
+        """
+        Args:
+            manifest_file (str): CSV or JSONL manifest with src, dest and optional profile.
+            redaction_args (dict): Keyword arguments for PDFRedactor.redact_pdf.
+            state_file (Optional[str]): Append-only JSONL file of row outcomes;
+                defaults to the manifest path with a .state.jsonl suffix.
+            profiles (Optional[List[dict]]): Named profiles (name, searches,
+                predefined_patterns, replacement) rows can refer to; their patterns
+                are added to those of redaction_args.
+            workers (int): Number of worker processes.
+            prefetch (Optional[int]): Rows read ahead of the workers; defaults to workers.
+            max_retries (int): Retries of a failing row before it is recorded as failed.
+            retry_failed (bool): Run rows again that a previous run recorded as failed.
+            overwrite (bool): Whether to overwrite existing destination files.
+            skip_redact_failed_pages (bool): Whether to skip pages that fail redaction.
+            max_tasks_per_worker (Optional[int]): Replace a worker process after this many rows.
+            max_worker_rss_mb (Optional[float]): Replace a worker whose RSS exceeds this after a row.
+            store_shrink_percent (int): Share of the MuPDF store freed after every row.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer")
+        if max_retries < 0:
+            raise ValueError("max_retries cannot be negative")
+        if prefetch is not None and prefetch < 0:
+            raise ValueError("prefetch cannot be negative")
+
+        self.manifest_file = manifest_file
+        self.state_file = state_file or str(Path(manifest_file).with_suffix(".state.jsonl"))
+        self.redaction_args = dict(redaction_args)
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        for profile in profiles or []:
+            if not profile.get('name'):
+                raise ValueError("Every profile needs a name")
+            self.profiles[profile['name']] = profile
+        self.workers = workers
+        self.prefetch = workers if prefetch is None else prefetch
+        self.max_retries = max_retries
+        self.retry_failed = retry_failed
+        self.overwrite = overwrite
+        self.skip_redact_failed_pages = skip_redact_failed_pages
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self.store_shrink_percent = store_shrink_percent
+
+        self.rows_done = 0
+        self.rows_failed = 0
+        self.rows_skipped = 0
+        self.retries = 0
+
+    def _build_engines(self) -> Dict[str, RedactionEngine]:
+        """One engine for rows without a profile (if it has patterns) and one per profile."""
+        needles = list(self.redaction_args.get('needles') or [])
+        predefined = list(self.redaction_args.get('predefined_patterns') or [])
+
+        engines = {}
+        if needles or predefined or self.redaction_args.get('template'):
+            engines[DEFAULT_PROFILE] = RedactionEngine(
+                skip_redact_failed_pages=self.skip_redact_failed_pages, **self.redaction_args)
+
+        for name, profile in self.profiles.items():
+            profile_args = dict(self.redaction_args)
+            profile_args['needles'] = needles + list(profile.get('searches') or [])
+            profile_args['predefined_patterns'] = predefined + [
+                PatternType(pattern) for pattern in profile.get('predefined_patterns') or []]
+            if profile.get('replacement') is not None:
+                profile_args['replacement'] = profile['replacement']
+            try:
+                engines[name] = RedactionEngine(
+                    skip_redact_failed_pages=self.skip_redact_failed_pages, **profile_args)
+            except ValueError as e:
+                raise ValueError(f"Profile '{name}': {e}")
+
+        if not engines:
+            raise ValueError("No valid search patterns specified")
+        return engines
+
+    def load_state(self) -> RowBitmap:
+        """Read the rows finished by earlier runs from the state file."""
+        finished = RowBitmap()
+        if not os.path.exists(self.state_file):
+            return finished
+        with open(self.state_file) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line of an interrupted run
+                    continue
+                if record["status"] == "done" or not self.retry_failed:
+                    finished.add(record["row"])
+        return finished
+
+    def _record(self, state, record: Dict[str, Any]) -> None:
+        state.write(json.dumps(record) + "\n")
+        state.flush()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Process every unfinished row of the manifest.
+
+        Returns:
+            dict: Rows done, failed and skipped, retries and the seconds taken.
+        """
+        start_time = time.perf_counter()
+        engines = self._build_engines()
+        finished = self.load_state()
+        registry = get_registry()
+
+        max_in_flight = self.workers + self.prefetch
+        # future -> (row number, row, attempt)
+        in_flight: Dict[Future, Tuple[int, Dict[str, str], int]] = {}
+        retry_queue: List[Tuple[int, Dict[str, str], int]] = []
+        rows = iter_manifest(self.manifest_file)
+        exhausted = False
+
+        with WorkerPool(
+                workers=self.workers,
+                initializer=_init_worker,
+                initargs=(engines,),
+                max_tasks_per_worker=self.max_tasks_per_worker,
+                max_rss_mb=self.max_worker_rss_mb,
+                store_shrink_percent=self.store_shrink_percent
+        ) as pool, open(self.state_file, "a+") as state:
+            # End a line torn by an interrupted run before appending to it
+            if state.tell() > 0:
+                state.seek(state.tell() - 1)
+                if state.read(1) != "\n":
+                    state.write("\n")
+
+            def submit(row_number: int, row: Dict[str, str], attempt: int) -> None:
+                profile = (row.get('profile') or DEFAULT_PROFILE).strip()
+                if profile not in engines:
+                    self._finish_row(state, row_number, row, attempt, None,
+                                     f"unknown profile '{profile}'", 0.0)
+                    return
+                future = pool.submit(
+                    _redact_row, row['src'], row['dest'], profile, self.overwrite)
+                in_flight[future] = (row_number, row, attempt)
+
+            while True:
+                # Keep the pool fed without reading the whole manifest
+                while len(in_flight) < max_in_flight:
+                    if retry_queue:
+                        submit(*retry_queue.pop())
+                        continue
+                    if exhausted:
+                        break
+                    next_row = next(rows, None)
+                    if next_row is None:
+                        exhausted = True
+                        break
+                    row_number, row = next_row
+                    if row_number in finished:
+                        self.rows_skipped += 1
+                        continue
+                    if not row.get('src') or not row.get('dest'):
+                        self._finish_row(state, row_number, row, 1, None,
+                                         "row needs src and dest", 0.0)
+                        continue
+                    submit(row_number, row, 1)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    row_number, row, attempt = in_flight.pop(future)
+                    try:
+                        stats, seconds = future.result()
+                        error = None
+                    except Exception as e:
+                        stats, seconds, error = None, 0.0, f"{type(e).__name__}: {e}"
+
+                    if error is not None and attempt <= self.max_retries \
+                            and not isinstance(future.exception(), FileExistsError):
+                        logger.warning(
+                            f"Row {row_number} attempt {attempt} failed: {error}; retrying")
+                        self.retries += 1
+                        retry_queue.append((row_number, row, attempt + 1))
+                        continue
+
+                    self._finish_row(state, row_number, row, attempt, stats, error, seconds)
+                    if error is None:
+                        registry.record_document(stats, seconds)
+                    else:
+                        registry.record_failure(seconds)
+
+        summary = {
+            "rows_done": self.rows_done,
+            "rows_failed": self.rows_failed,
+            "rows_skipped": self.rows_skipped,
+            "retries": self.retries,
+            "seconds": time.perf_counter() - start_time
+        }
+        logger.info(
+            f"Manifest: {self.rows_done} rows done, {self.rows_failed} failed, "
+            f"{self.rows_skipped} already finished, {self.retries} retries "
+            f"in {summary['seconds']:.1f}s")
+        return summary
+
+    def _finish_row(
+        self,
+        state,
+        row_number: int,
+        row: Dict[str, str],
+        attempts: int,
+        stats: Optional[Dict[str, Any]],
+        error: Optional[str],
+        seconds: float
+    ) -> None:
+        record = {
+            "row": row_number,
+            "src": row.get('src'),
+            "dest": row.get('dest'),
+            "status": "done" if error is None else "failed",
+            "attempts": attempts,
+            "seconds": round(seconds, 3)
+        }
+        if error is None:
+            self.rows_done += 1
+            record["total_matches"] = stats.get("total_matches", 0)
+            record["pages_processed"] = stats.get("pages_processed", 0)
+        else:
+            self.rows_failed += 1
+            record["error"] = error
+            logger.error(f"Row {row_number} ('{row.get('src')}') failed: {error}")
+        self._record(state, record)
@@ -0,0 +1,321 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-page work up to very large documents
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0
+)
+
+# Number of recent observations kept per histogram for percentile estimates
+RECENT_SAMPLES = 2048
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = []
+    for key, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace(
+            "\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Write content next to path and rename it into place."""
+    target = Path(path)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, target)
+
+
+class Histogram:
+    """Cumulative bucket histogram that also keeps recent samples for percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._recent: deque = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile (0..1) from the recent samples."""
+        if not self._recent:
+            return None
+        samples = sorted(self._recent)
+        index = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[index]
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """Bucket upper bounds with cumulative counts, ending with +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            running += count
+            result.append((bound, running))
+        result.append((float("inf"), self.count))
+        return result
+
+
+class MetricsRegistry:
+    """
+    In-process registry of counters, gauges and histograms.
+
+    The registry can be rendered in the Prometheus text exposition format
+    (for the node-exporter textfile collector) or as a JSON snapshot.
+    """
+
+    def __init__(self, namespace: str = "pdf_redacter"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._values: Dict[str, Dict[LabelKey, Any]] = {}
+
+    def _series(self, name: str, metric_type: str, help_text: str) -> Dict[LabelKey, Any]:
+        if name not in self._meta:
+            self._meta[name] = (metric_type, help_text)
+            self._values[name] = {}
+        elif self._meta[name][0] != metric_type:
+            raise ValueError(
+                f"Metric '{name}' is already registered as {self._meta[name][0]}")
+        return self._values[name]
+
+    @staticmethod
+    def _label_key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, help_text: str = "", **labels) -> None:
+        """Increase a counter."""
+        with self._lock:
+            series = self._series(name, "counter", help_text)
+            key = self._label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, help_text: str = "", **labels) -> None:
+        """Set a gauge."""
+        with self._lock:
+            self._series(name, "gauge", help_text)[self._label_key(labels)] = value
+
+    def observe(self, name: str, value: float, help_text: str = "", **labels) -> None:
+        """Add an observation to a histogram."""
+        with self._lock:
+            series = self._series(name, "histogram", help_text)
+            key = self._label_key(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def get(self, name: str, **labels) -> Any:
+        """Get the current value (or Histogram) of a series, if any."""
+        with self._lock:
+            return self._values.get(name, {}).get(self._label_key(labels))
+
+    def reset(self) -> None:
+        """Drop all metrics."""
+        with self._lock:
+            self._meta.clear()
+            self._values.clear()
+
+    def record_document(self, stats: Dict[str, Any], seconds: float) -> None:
+        """
+        Record the outcome of one redacted document.
+
+        Args:
+            stats (dict): Statistics returned by PDFRedactor.redact_pdf.
+            seconds (float): Wall time spent on the document.
+        """
+        self.inc("documents_total", help_text="Documents redacted successfully.")
+        self.inc("pages_processed_total", stats.get("pages_processed", 0),
+                 help_text="Pages processed.")
+        self.inc("pages_modified_total", stats.get("pages_modified", 0),
+                 help_text="Pages with applied redactions.")
+        self.inc("pages_failed_redaction_total", stats.get("pages_failed_redaction", 0),
+                 help_text="Pages where applying redactions failed.")
+        self.inc("pages_timed_out_total", stats.get("pages_timed_out", 0),
+                 help_text="Pages that ran out of their time budget.")
+        self.inc("matches_total", stats.get("total_matches", 0),
+                 help_text="Pattern matches found.")
+        self.observe("document_seconds", seconds,
+                     help_text="Wall time per redacted document.")
+
+        if stats.get("optimization"):
+            optimization = stats["optimization"]
+            self.inc("optimization_bytes_saved_total",
+                     optimization.get("font_bytes_saved", 0) + optimization.get("prune_bytes_saved", 0),
+                     help_text="Bytes saved by font subsetting, pruning and object streams.")
+
+        if stats.get("verification"):
+            self.inc("verification_leaks_total", len(stats["verification"]["leaks"]),
+                     help_text="Pattern matches still extractable from verified outputs.")
+
+        for stage, stage_seconds in stats.get("stage_times", {}).items():
+            self.observe("stage_seconds", stage_seconds,
+                         help_text="Time per document spent in each redaction stage.",
+                         stage=stage)
+
+        # Throughput over all documents recorded so far
+        with self._lock:
+            pages = self._values["pages_processed_total"].get((), 0)
+            busy = self._values["document_seconds"][()].sum
+        self.set_gauge("pages_per_second", pages / busy if busy else 0.0,
+                       help_text="Pages processed per second of document wall time.")
+        self.set_gauge("last_document_timestamp_seconds", time.time(),
+                       help_text="Unix time of the last recorded document.")
+
+    def record_failure(self, seconds: float) -> None:
+        """Record a document whose redaction failed."""
+        self.inc("documents_failed_total", help_text="Documents whose redaction failed.")
+        self.observe("document_seconds", seconds,
+                     help_text="Wall time per redacted document.")
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._meta):
+                metric_type, help_text = self._meta[name]
+                full_name = f"{self.namespace}_{name}"
+                if help_text:
+                    lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {metric_type}")
+
+                for key, value in sorted(self._values[name].items()):
+                    if metric_type != "histogram":
+                        lines.append(
+                            f"{full_name}{_format_labels(key)} {_format_value(value)}")
+                        continue
+
+                    for bound, count in value.cumulative_counts():
+                        labels = key + (("le", _format_value(bound)),)
+                        lines.append(
+                            f"{full_name}_bucket{_format_labels(labels)} {count}")
+                    lines.append(
+                        f"{full_name}_sum{_format_labels(key)} {_format_value(value.sum)}")
+                    lines.append(
+                        f"{full_name}_count{_format_labels(key)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, Any]:
+        """Snapshot all metrics, with percentile estimates for histograms."""
+        snapshot: Dict[str, Any] = {"timestamp": time.time(), "metrics": {}}
+        with self._lock:
+            for name in sorted(self._meta):
+                metric_type = self._meta[name][0]
+                series = []
+                for key, value in sorted(self._values[name].items()):
+                    entry: Dict[str, Any] = {"labels": dict(key)}
+                    if metric_type == "histogram":
+                        entry.update({
+                            "count": value.count,
+                            "sum": value.sum,
+                            "p50": value.quantile(0.5),
+                            "p90": value.quantile(0.9),
+                            "p99": value.quantile(0.99)
+                        })
+                    else:
+                        entry["value"] = value
+                    series.append(entry)
+                snapshot["metrics"][f"{self.namespace}_{name}"] = {
+                    "type": metric_type,
+                    "series": series
+                }
+        return snapshot
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the Prometheus text format to path."""
+        _write_atomic(path, self.to_prometheus())
+
+    def write_json(self, path: str) -> None:
+        """Atomically write a JSON snapshot to path."""
+        _write_atomic(path, json.dumps(self.to_json(), indent=2))
+
+
+# Registry updated by PDFRedactor.redact_pdf and the CLI
+REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the package-wide metrics registry."""
+    return REGISTRY
+
+
+class MetricsExporter:
+    """Periodically write a registry to a Prometheus textfile and/or JSON file."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        prometheus_file: Optional[str] = None,
+        json_file: Optional[str] = None,
+        interval: float = 15.0
+    ):
+        self.registry = registry
+        self.prometheus_file = prometheus_file
+        self.json_file = json_file
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        """Write the current metrics to the configured files."""
+        try:
+            if self.prometheus_file:
+                self.registry.write_prometheus(self.prometheus_file)
+            if self.json_file:
+                self.registry.write_json(self.json_file)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics: {e}")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def start(self) -> 'MetricsExporter':
+        """Start periodic export; a final export also happens at exit."""
+        if self.interval and self.interval > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        """Stop periodic export and write the final metrics."""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+        atexit.unregister(self.stop)
@@ -0,0 +1,127 @@
+import os
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+import fitz  # PyMuPDF
+import pikepdf
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# fitz save options of an optimized output: garbage=4 also merges identical
+# objects and streams
+FITZ_SAVE_OPTIONS: Dict[str, Any] = {"garbage": 4, "deflate": True}
+
+
+def embedded_font_bytes(doc: fitz.Document) -> int:
+    """Total size of the font programs embedded in the fonts the pages use."""
+    font_xrefs = {font[0] for page in doc for font in page.get_fonts()}
+    total = 0
+    for xref in font_xrefs:
+        content = doc.extract_font(xref)[3]
+        total += len(content) if content else 0
+    return total
+
+
+def optimize_document(doc: fitz.Document) -> Dict[str, Any]:
+    """
+    Subset the embedded fonts of an open document to the glyphs still used.
+
+    This runs in memory before the final save, which then prunes what
+    redaction left behind, see prune_and_save().
+
+    Args:
+        doc (fitz.Document): The redacted document.
+
+    Returns:
+        dict: font_bytes_before, font_bytes_after, font_bytes_saved and seconds.
+    """
+    start_time = time.perf_counter()
+    font_bytes_before = embedded_font_bytes(doc)
+    font_bytes_after = font_bytes_before
+    if font_bytes_before:
+        try:
+            doc.subset_fonts()
+            font_bytes_after = embedded_font_bytes(doc)
+        except Exception as e:
+            logger.warning(f"Font subsetting failed, keeping full fonts: {e}")
+
+    result = {
+        "font_bytes_before": font_bytes_before,
+        "font_bytes_after": font_bytes_after,
+        "font_bytes_saved": font_bytes_before - font_bytes_after,
+        "seconds": time.perf_counter() - start_time
+    }
+    logger.debug(
+        f"Subset fonts: {font_bytes_before} -> {font_bytes_after} bytes "
+        f"in {result['seconds']:.2f}s")
+    return result
+
+
+def _resource_names(pdf: pikepdf.Pdf) -> Set[Tuple[Any, ...]]:
+    """The resources the pages list: indirect ones once, direct ones per page."""
+    # Pruning copies shared resource dictionaries into the pages, so the
+    # entries are keyed by the object they name rather than by dictionary
+    names: Set[Tuple[Any, ...]] = set()
+    for page_num, page in enumerate(pdf.pages):
+        resources = page.obj.get("/Resources")
+        if not isinstance(resources, pikepdf.Dictionary):
+            continue
+        for category in resources.keys():
+            entries = resources[category]
+            if not isinstance(entries, pikepdf.Dictionary):
+                continue
+            for name in entries.keys():
+                entry = entries[name]
+                names.add(entry.objgen if entry.is_indirect else (page_num, category, name))
+    return names
+
+
+def prune_and_save(
+    pdf: pikepdf.Pdf,
+    dest_file: str,
+    size_before: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Drop resources no page references any more (e.g. images whose only use
+    was redacted) from an open document and save it with compressed
+    streams and object streams.
+
+    Args:
+        pdf (pikepdf.Pdf): The document to save.
+        dest_file (str): The output PDF file path.
+        size_before (Optional[int]): Size of the file pdf was opened from, to
+            report the bytes pruning and object streams saved.
+
+    Returns:
+        dict: resources_removed, output_bytes, seconds and, with size_before,
+            prune_bytes_saved.
+    """
+    start_time = time.perf_counter()
+    names_before = _resource_names(pdf)
+    pdf.remove_unreferenced_resources()
+    resources_removed = len(names_before - _resource_names(pdf))
+    seconds = time.perf_counter() - start_time
+
+    pdf.save(dest_file, compress_streams=True,
+             object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    result = {
+        "resources_removed": resources_removed,
+        "output_bytes": os.path.getsize(dest_file),
+        "seconds": seconds
+    }
+    if size_before is not None:
+        result["prune_bytes_saved"] = size_before - result["output_bytes"]
+    return result
+
+
+def combine_results(*results: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the results of the optimization steps of one output."""
+    combined: Dict[str, Any] = {"seconds": 0.0}
+    for result in results:
+        if result:
+            combined.update({key: value for key, value in result.items() if key != "seconds"})
+            combined["seconds"] += result["seconds"]
+    return combined
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pdf_redacter._version import __version__
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Bump when the stored matcher state changes
+CACHE_FORMAT = 4
+
+
+def _state_checksum(state: Dict[str, Any]) -> str:
+    payload = json.dumps(state, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class PatternSetCache:
+    """
+    On-disk cache of built pattern sets.
+
+    Entries are keyed by a fingerprint of the normalized pattern
+    configuration, the package version and the Python version, so editing
+    patterns or upgrading either one invalidates them automatically.
+
+    Entries are plain JSON holding the pattern strings and flags, their
+    prefilter features and the evaluation plan, with a checksum; nothing
+    executable is loaded. A warm start skips pattern validation, prefilter
+    analysis and planning, but the regular expressions are still compiled,
+    so large pattern sets load faster rather than instantly.
+
+    The cache directory is created private to the current user, and a
+    directory that other users can write to is not used.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def fingerprint(
+        needles: Optional[List[str]],
+        ignore_case: bool,
+        predefined_patterns: Optional[List[PatternType]] = None
+    ) -> str:
+        """Compute the cache key of a pattern configuration."""
+        normalized = {
+            "format": CACHE_FORMAT,
+            "package_version": __version__,
+            "python": list(sys.version_info[:2]),
+            "needles": list(needles or []),
+            "ignore_case": bool(ignore_case),
+            "predefined_patterns": [
+                pattern.value if isinstance(pattern, PatternType) else str(pattern)
+                for pattern in (predefined_patterns or [])
+            ]
+        }
+        payload = json.dumps(normalized, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _is_private(self) -> bool:
+        """Whether only the current user can add or replace cache entries."""
+        if not hasattr(os, "geteuid"):
+            return True
+        st = os.stat(self.cache_dir)
+        if st.st_uid != os.geteuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            logger.warning(
+                f"Not using pattern cache '{self.cache_dir}': "
+                f"it must be owned by the current user and not writable by others")
+            return False
+        return True
+
+    def load(
+        self,
+        key: str,
+        expected_patterns: Optional[List[str]] = None,
+        ignore_case: bool = False
+    ) -> Optional[EnhancedPatternMatcher]:
+        """
+        Load a cached matcher, or None on a miss or unusable entry.
+
+        Args:
+            key (str): The fingerprint of the pattern configuration.
+            expected_patterns (Optional[List[str]]): If given, the entry is only used
+                if it holds exactly these patterns, all with the ignore_case flag.
+            ignore_case (bool): The expected case sensitivity of the patterns.
+        """
+        path = self._path(key)
+        if not path.exists():
+            logger.debug(f"Pattern cache miss: {key[:12]}")
+            return None
+        if not self._is_private():
+            return None
+
+        start_time = time.perf_counter()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get("format") != CACHE_FORMAT or entry.get("key") != key:
+                raise ValueError("entry does not belong to this key or format")
+            if entry.get("checksum") != _state_checksum(entry["state"]):
+                raise ValueError("checksum mismatch")
+            if expected_patterns is not None and entry["state"]["patterns"] != [
+                    [pattern, bool(ignore_case)] for pattern in expected_patterns]:
+                raise ValueError("entry holds different patterns")
+            matcher = EnhancedPatternMatcher.from_state(entry["state"])
+        except Exception as e:
+            logger.warning(f"Ignoring unusable pattern cache entry '{path}': {e}")
+            return None
+
+        logger.debug(
+            f"Pattern cache hit: {key[:12]}, loaded {len(matcher.patterns)} patterns "
+            f"in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        return matcher
+
+    def store(self, key: str, matcher: EnhancedPatternMatcher) -> None:
+        """Store a matcher; failures are logged and otherwise ignored."""
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        state = matcher.to_state()
+        entry = {
+            "format": CACHE_FORMAT,
+            "key": key,
+            "checksum": _state_checksum(state),
+            "state": state
+        }
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not self._is_private():
+                return
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+            logger.debug(f"Stored pattern set in cache: {key[:12]}")
+        except OSError as e:
+            logger.warning(f"Failed to write pattern cache '{path}': {e}")
+            if tmp_path.exists():
+                os.unlink(tmp_path)
+
+    def clear(self) -> int:
+        """Remove all cache entries. Returns the number removed."""
+        removed = 0
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink()
+            removed += 1
+        return removed
@@ -1,7 +1,15 @@
+import heapq
 import re  
-from typing import List, Dict, Optional, Tuple  
+import time
+from operator import itemgetter
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any, List, Dict, Optional, Tuple  
 from dataclasses import dataclass  
 from enum import Enum  
+
+from pdf_redacter.prefilter import PatternPrefilter, build_prefilter
+from pdf_redacter.pattern_planner import PatternPlan, PlanGroup, build_plan
   
 class PatternType(Enum):  
     """Predefined pattern types for common redaction scenarios."""  
@@ -18,6 +26,32 @@ class PatternTemplate:
     pattern: str  
     description: str  
   
+def coalesce_spans(
+    spans: Iterable[Tuple[int, int, int]]
+) -> Iterator[Tuple[int, int, Tuple[int, ...]]]:
+    """
+    Reduce position-ordered (start, end, pattern_id) spans to disjoint spans.
+
+    Overlapping spans are merged into one ``(start, end, pattern_ids)`` span
+    whose pattern_ids lists the id of every merged match, so per-pattern
+    counts are kept. Works as a single streaming pass.
+    """
+    current_start = current_end = None
+    pattern_ids: List[int] = []
+    for start, end, pattern_id in spans:
+        if current_end is not None and start < current_end:
+            if end > current_end:
+                current_end = end
+            pattern_ids.append(pattern_id)
+            continue
+        if current_end is not None:
+            yield (current_start, current_end, tuple(pattern_ids))
+        current_start, current_end = start, end
+        pattern_ids = [pattern_id]
+    if current_end is not None:
+        yield (current_start, current_end, tuple(pattern_ids))
+
+
 class EnhancedPatternMatcher:  
     """Enhanced pattern matching with optimization and predefined templates."""  
       
@@ -45,9 +79,21 @@ class EnhancedPatternMatcher:
         )  
     }  
       
-    def __init__(self):  
+    def __init__(self, collect_timings: bool = False):  
         self._compiled_patterns: List[Tuple[re.Pattern, str]] = []  
         self._pattern_cache: Dict[str, re.Pattern] = {}  
+        # Original pattern strings, indexed by pattern id
+        self._pattern_strings: List[str] = []
+        self._pattern_info: Optional[List[Dict[str, str]]] = None
+        # Optional per-pattern cost accounting, accumulated across calls
+        self.collect_timings = collect_timings
+        self._pattern_timings: Dict[str, Dict[str, Any]] = {}
+        # Required-feature prefilters and their check/skip counters, by pattern id
+        self._prefilters: List[Optional[PatternPrefilter]] = []
+        self._prefilter_checked = array('q')
+        self._prefilter_skipped = array('q')
+        # Evaluation plan, built on first use
+        self._plan: Optional[PatternPlan] = None
       
     def add_pattern(self, pattern: str, ignore_case: bool = False,   
                    pattern_type: PatternType = PatternType.CUSTOM) -> None:  
@@ -63,6 +109,12 @@ class EnhancedPatternMatcher:
                 raise ValueError(f"Invalid regex pattern '{pattern}': {e}")  
           
         self._compiled_patterns.append((self._pattern_cache[cache_key], pattern))  
+        self._pattern_strings.append(pattern)
+        self._prefilters.append(build_prefilter(self._pattern_cache[cache_key]))
+        self._prefilter_checked.append(0)
+        self._prefilter_skipped.append(0)
+        self._pattern_info = None
+        self._plan = None
       
     def add_predefined_pattern(self, pattern_type: PatternType,   
                              ignore_case: bool = False) -> None:  
@@ -83,47 +135,342 @@ class EnhancedPatternMatcher:
                 errors.append(f"Invalid pattern '{pattern}': {e}")  
         return errors  
       
+    @property
+    def patterns(self) -> List[str]:
+        """Original pattern strings, indexed by pattern id."""
+        return self._pattern_strings
+
+    def pattern_key(self, pattern_id: int) -> str:
+        """Identify what a pattern matches: its flags and pattern string."""
+        compiled_pattern = self._compiled_patterns[pattern_id][0]
+        return f"{compiled_pattern.flags}:{compiled_pattern.pattern}"
+
     def find_matches(self, text: str) -> List[Tuple[int, int, str, str]]:  
         """Find all matches in text. Returns (start, end, matched_text, pattern)."""  
-        matches = []  
-        for compiled_pattern, original_pattern in self._compiled_patterns:  
-            for match in compiled_pattern.finditer(text):  
-                start, end = match.span()  
-                matched_text = text[start:end]  
-                matches.append((start, end, matched_text, original_pattern))  
-          
-        # Sort matches by position to handle overlapping matches  
-        return sorted(matches, key=lambda x: x[0])  
-      
+        return list(self.iter_matches(text))
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """Lazily yield (start, end, matched_text, pattern) in position order."""
+        patterns = self._pattern_strings
+        for start, end, pattern_id in self.iter_spans(text):
+            yield (start, end, text[start:end], patterns[pattern_id])
+
+    def iter_spans(
+        self,
+        text: str,
+        pattern_ids: Optional[Iterable[int]] = None
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        Lazily yield (start, end, pattern_id) in position order.
+
+        Each pattern's ``finditer`` stream is already ordered, so the streams
+        are k-way merged instead of collecting and sorting every match.
+        Matches starting at the same position keep the pattern order.
+        With pattern_ids, only those patterns are evaluated. Literals the
+        plan combines (see plan_patterns) are scanned together when all of
+        them are evaluated.
+        """
+        streams = []
+        if pattern_ids is None:
+            pattern_ids = range(len(self._compiled_patterns))
+        pattern_ids = set(pattern_ids)
+        # Profiling charges scan time to single patterns, so it scans them one by one
+        if not self.collect_timings:
+            for group in self.plan_patterns().combined_groups:
+                if pattern_ids.issuperset(group.pattern_ids):
+                    streams.append(self._iter_group_spans(text, group))
+                    pattern_ids.difference_update(group.pattern_ids)
+        streams.extend(
+            self._iter_pattern_spans(text, pattern_id)
+            for pattern_id in self._candidate_pattern_ids(text, pattern_ids)
+        )
+        if len(streams) == 1:
+            return streams[0]
+        # Each stream has one match per start at most, so ties keep the pattern order
+        return heapq.merge(*streams, key=itemgetter(0, 2))
+
+    def iter_disjoint_spans(self, text: str) -> Iterator[Tuple[int, int, Tuple[int, ...]]]:
+        """
+        Lazily yield disjoint (start, end, pattern_ids) spans in position order.
+
+        Matches of different patterns over the same text (e.g. the SSN, phone
+        and credit card templates on one digit run) become a single span.
+        """
+        return coalesce_spans(self.iter_spans(text))
+
+    def has_matches(self, text: str) -> bool:
+        """Check whether any pattern matches, stopping at the first hit."""
+        pattern_ids = set(range(len(self._compiled_patterns)))
+        for group in self.plan_patterns().combined_groups:
+            if group.regex.search(text) is not None:
+                return True
+            pattern_ids.difference_update(group.pattern_ids)
+        return any(
+            self._compiled_patterns[pattern_id][0].search(text) is not None
+            for pattern_id in self._candidate_pattern_ids(text, pattern_ids)
+        )
+
+    def plan_patterns(self) -> PatternPlan:
+        """
+        Get the evaluation plan of the patterns, building it on first use.
+
+        Pure literals that cannot overlap each other are scanned together
+        with one prefix-factored alternation when that is estimated to be
+        cheaper; every other pattern is scanned on its own after its
+        prefilter. Either way the matches are the same.
+        """
+        if self._plan is None:
+            self._plan = build_plan(
+                [compiled_pattern for compiled_pattern, _ in self._compiled_patterns])
+        return self._plan
+
+    def explain_patterns(self) -> List[Dict[str, Any]]:
+        """
+        Describe the evaluation plan: one entry per pattern group with its
+        strategy, the kind of its patterns, the reason and the patterns.
+        """
+        return [{
+            "strategy": group.strategy,
+            "kind": group.kind,
+            "reason": group.reason,
+            "patterns": [self._pattern_strings[pattern_id] for pattern_id in group.pattern_ids]
+        } for group in self.plan_patterns().groups]
+
+    def _iter_group_spans(self, text: str, group: PlanGroup) -> Iterator[Tuple[int, int, int]]:
+        """Yield the spans of a combined group of literals from a single scan."""
+        lookup = group.lookup
+        for match in group.regex.finditer(text):
+            start, end = match.span()
+            matched = match.group()
+            pattern_id = lookup.get(matched.lower() if group.ignore_case else matched)
+            if pattern_id is None:
+                # Case folding outside ASCII, e.g. the Kelvin sign
+                pattern_id = next(
+                    member for member in group.pattern_ids
+                    if self._compiled_patterns[member][0].fullmatch(matched))
+            yield (start, end, pattern_id)
+
+    def _candidate_pattern_ids(
+        self,
+        text: str,
+        pattern_ids: Optional[Iterable[int]] = None
+    ) -> List[int]:
+        """Ids of the patterns whose prefilter does not rule out a match in text."""
+        candidates = []
+        checked = self._prefilter_checked
+        skipped = self._prefilter_skipped
+        if pattern_ids is None:
+            pattern_ids = range(len(self._prefilters))
+        for pattern_id in sorted(pattern_ids):
+            prefilter = self._prefilters[pattern_id]
+            if prefilter is not None:
+                checked[pattern_id] += 1
+                if not prefilter.may_match(text):
+                    skipped[pattern_id] += 1
+                    continue
+            candidates.append(pattern_id)
+        return candidates
+
+    def _iter_pattern_spans(self, text: str, pattern_id: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield the spans of one pattern, accounting scan time if enabled."""
+        compiled_pattern, original_pattern = self._compiled_patterns[pattern_id]
+
+        if not self.collect_timings:
+            for match in compiled_pattern.finditer(text):
+                start, end = match.span()
+                yield (start, end, pattern_id)
+            return
+
+        # Only time spent inside the regex engine is charged to the pattern
+        elapsed = 0.0
+        hits = 0
+        matches = compiled_pattern.finditer(text)
+        try:
+            while True:
+                start_time = time.perf_counter()
+                match = next(matches, None)
+                elapsed += time.perf_counter() - start_time
+                if match is None:
+                    break
+                hits += 1
+                start, end = match.span()
+                yield (start, end, pattern_id)
+        finally:
+            # Also runs when a consumer stops early
+            self._record_timing(original_pattern, elapsed, hits)
+
+    def _record_timing(self, pattern: str, elapsed: float, hits: int) -> None:
+        """Accumulate scan time and hit count for a pattern."""
+        entry = self._pattern_timings.get(pattern)
+        if entry is None:
+            entry = {"time": 0.0, "matches": 0, "scans": 0}
+            self._pattern_timings[pattern] = entry
+        entry["time"] += elapsed
+        entry["matches"] += hits
+        entry["scans"] += 1
+
+    def get_pattern_timings(self) -> List[Dict[str, Any]]:
+        """
+        Get cumulative scan cost per pattern, most expensive first.
+
+        Each entry holds the pattern, total scan time in seconds, number of
+        matches, number of texts scanned and the share of total scan time.
+        Empty unless the matcher was created with ``collect_timings=True``.
+        """
+        total_time = sum(
+            entry["time"] for entry in self._pattern_timings.values())
+        timings = []
+        for pattern, entry in self._pattern_timings.items():
+            timings.append({
+                "pattern": pattern,
+                "time": entry["time"],
+                "matches": entry["matches"],
+                "scans": entry["scans"],
+                "share": entry["time"] / total_time if total_time else 0.0
+            })
+        return sorted(timings, key=lambda x: x["time"], reverse=True)
+
+    def merge_pattern_timings(self, timings: List[Dict[str, Any]]) -> None:
+        """Add timings reported by another matcher, e.g. in a subprocess."""
+        for timing in timings:
+            entry = self._pattern_timings.setdefault(
+                timing["pattern"], {"time": 0.0, "matches": 0, "scans": 0})
+            entry["time"] += timing["time"]
+            entry["matches"] += timing["matches"]
+            entry["scans"] += timing["scans"]
+
+    def reset_pattern_timings(self) -> None:
+        """Discard accumulated per-pattern timings."""
+        self._pattern_timings.clear()
+
+    def get_prefilter_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get prefilter checks and skips per pattern that has a prefilter.
+
+        Each entry holds the pattern id, the pattern, the required features,
+        the number of texts checked and skipped, and the skip rate.
+        """
+        prefilter_stats = []
+        for pattern_id, prefilter in enumerate(self._prefilters):
+            if prefilter is None:
+                continue
+            checked = self._prefilter_checked[pattern_id]
+            skipped = self._prefilter_skipped[pattern_id]
+            prefilter_stats.append({
+                "pattern_id": pattern_id,
+                "pattern": self._pattern_strings[pattern_id],
+                "requires": prefilter.requires,
+                "checked": checked,
+                "skipped": skipped,
+                "skip_rate": skipped / checked if checked else 0.0
+            })
+        return prefilter_stats
+
+    def merge_prefilter_stats(self, prefilter_stats: List[Dict[str, Any]]) -> None:
+        """Add prefilter counters reported by a copy of this matcher."""
+        for entry in prefilter_stats:
+            self._prefilter_checked[entry["pattern_id"]] += entry["checked"]
+            self._prefilter_skipped[entry["pattern_id"]] += entry["skipped"]
+
+    def reset_prefilter_stats(self) -> None:
+        """Zero the prefilter counters."""
+        for pattern_id in range(len(self._prefilters)):
+            self._prefilter_checked[pattern_id] = 0
+            self._prefilter_skipped[pattern_id] = 0
+
     def get_pattern_info(self) -> List[Dict[str, str]]:  
         """Get information about all loaded patterns."""  
-        info = []  
-        for _, pattern in self._compiled_patterns:  
-            # Check if it's a predefined pattern  
-            template_info = None  
-            for pattern_type, template in self.PATTERN_TEMPLATES.items():  
-                if template.pattern == pattern:  
-                    template_info = template  
-                    break  
-              
-            if template_info:  
-                info.append({  
-                    "pattern": pattern,  
-                    "name": template_info.name,  
-                    "description": template_info.description,  
-                    "type": "predefined"  
-                })  
-            else:  
-                info.append({  
-                    "pattern": pattern,  
-                    "name": "Custom Pattern",  
-                    "description": "User-defined pattern",  
-                    "type": "custom"  
-                })  
-          
-        return info  
-      
+        if self._pattern_info is None:
+            templates = {
+                template.pattern: template
+                for template in self.PATTERN_TEMPLATES.values()
+            }
+            info = []
+            for pattern in self._pattern_strings:
+                # Check if it's a predefined pattern
+                template_info = templates.get(pattern)
+
+                if template_info:
+                    info.append({
+                        "pattern": pattern,
+                        "name": template_info.name,
+                        "description": template_info.description,
+                        "type": "predefined"
+                    })
+                else:
+                    info.append({
+                        "pattern": pattern,
+                        "name": "Custom Pattern",
+                        "description": "User-defined pattern",
+                        "type": "custom"
+                    })
+            self._pattern_info = info
+
+        return [dict(entry) for entry in self._pattern_info]
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Data-only description of the patterns and of what was derived from
+        them (prefilters and evaluation plan), for ``from_state``.
+        """
+        return {
+            "patterns": [
+                [pattern, bool(compiled_pattern.flags & re.IGNORECASE)]
+                for compiled_pattern, pattern in self._compiled_patterns
+            ],
+            "prefilters": [
+                None if prefilter is None else {
+                    "literals": list(prefilter.literals),
+                    "probes": list(prefilter.probe_patterns)
+                }
+                for prefilter in self._prefilters
+            ],
+            "plan": self.plan_patterns().to_dict()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'EnhancedPatternMatcher':
+        """
+        Rebuild a matcher from ``to_state()`` output.
+
+        The regular expressions are compiled again, but the patterns are not
+        re-analyzed for prefilters or planned.
+
+        Raises:
+            ValueError: If the state is inconsistent.
+        """
+        matcher = cls()
+        patterns = state["patterns"]
+        if len(state["prefilters"]) != len(patterns):
+            raise ValueError("Pattern state has a prefilter count different from its patterns")
+        plan = PatternPlan.from_dict(state["plan"])
+        planned_ids = sorted(pattern_id for group in plan.groups for pattern_id in group.pattern_ids)
+        if planned_ids != list(range(len(patterns))):
+            raise ValueError("Pattern state has a plan that does not cover every pattern once")
+
+        for (pattern, ignore_case), prefilter in zip(patterns, state["prefilters"]):
+            cache_key = f"{pattern}_{bool(ignore_case)}"
+            if cache_key not in matcher._pattern_cache:
+                matcher._pattern_cache[cache_key] = re.compile(
+                    pattern, re.IGNORECASE if ignore_case else 0)
+            compiled_pattern = matcher._pattern_cache[cache_key]
+            matcher._compiled_patterns.append((compiled_pattern, pattern))
+            matcher._pattern_strings.append(pattern)
+            matcher._prefilters.append(None if prefilter is None else PatternPrefilter(
+                prefilter["literals"], prefilter["probes"], compiled_pattern.flags))
+            matcher._prefilter_checked.append(0)
+            matcher._prefilter_skipped.append(0)
+        matcher._plan = plan
+        return matcher
+
     def clear_patterns(self) -> None:  
         """Clear all loaded patterns."""  
         self._compiled_patterns.clear()  
-        self._pattern_cache.clear()
\ No newline at end of file
+        self._pattern_cache.clear()
+        self._pattern_strings.clear()
+        self._pattern_info = None
+        self._pattern_timings.clear()
+        self._prefilters.clear()
+        self._prefilter_checked = array('q')
+        self._prefilter_skipped = array('q')
+        self._plan = None
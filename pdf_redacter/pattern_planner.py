@@ -0,0 +1,247 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Pattern kinds
+LITERAL = "literal"
+PREFIX = "prefix"
+REGEX = "regex"
+
+# Evaluation strategies
+COMBINED = "combined"
+PER_PATTERN = "per-pattern"
+
+# Fewest literals worth combining into one scan
+MIN_COMBINED_LITERALS = 2
+
+# Without a common prefix, a combined scan tries every literal starting with
+# the character at each position; it beats one scan per literal once there
+# are this many literals per distinct first character
+LITERALS_PER_FIRST_CHAR = 4
+
+# Flags under which the analysis holds
+_PLANNABLE_FLAGS = re.IGNORECASE | re.UNICODE
+
+
+def classify_pattern(compiled_pattern: re.Pattern) -> Tuple[str, str]:
+    """
+    Classify a compiled pattern as a pure literal, a regex with a literal
+    prefix, or a general regex.
+
+    Returns:
+        tuple: The kind and the literal (for literals) or prefix (for prefix patterns).
+    """
+    if not isinstance(compiled_pattern.pattern, str) \
+            or compiled_pattern.flags & ~_PLANNABLE_FLAGS:
+        return REGEX, ""
+    try:
+        parsed = list(sre_parse.parse(compiled_pattern.pattern, compiled_pattern.flags))
+    except Exception:
+        # Unknown parser internals: treat as a general regex
+        return REGEX, ""
+
+    prefix = []
+    for op, av in parsed:
+        if op is not sre_parse.LITERAL:
+            break
+        prefix.append(chr(av))
+    if parsed and len(prefix) == len(parsed):
+        return LITERAL, "".join(prefix)
+    if prefix:
+        return PREFIX, "".join(prefix)
+    return REGEX, ""
+
+
+def _overlapping(literals: Sequence[str]) -> set:
+    """
+    Indexes of literals whose matches can overlap a match of another one (or
+    of an equal one): substrings of another literal, and literals with a proper
+    suffix that starts another literal.
+    """
+    overlapping = set()
+    joined = "\0".join(literals)
+    # Prefix -> index of the literal starting with it, -1 if several do
+    prefixes: Dict[str, int] = {}
+    for index, literal in enumerate(literals):
+        for end in range(1, len(literal) + 1):
+            owner = prefixes.setdefault(literal[:end], index)
+            if owner != index:
+                prefixes[literal[:end]] = -1
+
+    for index, literal in enumerate(literals):
+        # Found more than once: contained in another literal, or a duplicate
+        if joined.count(literal) > 1:
+            overlapping.add(index)
+            continue
+        # A literal overlapping only itself is scanned the same way either way
+        for start in range(1, len(literal)):
+            owner = prefixes.get(literal[start:])
+            if owner is not None and owner != index:
+                overlapping.add(index)
+                break
+    return overlapping
+
+
+def literal_trie_regex(literals: Sequence[str]) -> str:
+    """
+    Build a regex matching any of the literals, with common prefixes factored
+    out so the regex engine tests each shared prefix once.
+
+    None of the literals may be a prefix of another.
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items())]
+        if len(branches) <= 1:
+            return "".join(branches)
+        return "(?:" + "|".join(branches) + ")"
+
+    return render(trie)
+
+
+def _worth_combining(literals: Sequence[str]) -> bool:
+    """Estimate whether one combined scan is cheaper than one scan per literal."""
+    if len(literals) < MIN_COMBINED_LITERALS:
+        return False
+    first_chars = {literal[0] for literal in literals}
+    if len(first_chars) == 1:
+        # A shared prefix: the regex engine searches for it like a single literal
+        return True
+    return len(literals) >= LITERALS_PER_FIRST_CHAR * len(first_chars)
+
+
+@dataclass
+class PlanGroup:
+    """Patterns evaluated the same way."""
+    strategy: str
+    kind: str
+    pattern_ids: List[int]
+    reason: str
+    # Combined groups: the alternation, and matched text (lowercased if
+    # case-insensitive) -> pattern id
+    regex: Optional[re.Pattern] = None
+    lookup: Dict[str, int] = field(default_factory=dict)
+    ignore_case: bool = False
+
+
+@dataclass
+class PatternPlan:
+    """
+    How the patterns of a matcher are evaluated.
+
+    Pure literals that cannot overlap each other are combined into one
+    alternation per flag set when that is estimated to be cheaper; every
+    other pattern is scanned on its own with ``finditer`` after its prefilter.
+    """
+    groups: List[PlanGroup] = field(default_factory=list)
+    kinds: List[str] = field(default_factory=list)
+
+    @property
+    def combined_groups(self) -> List[PlanGroup]:
+        return [group for group in self.groups if group.strategy == COMBINED]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Data-only representation; combined regexes are kept as their source."""
+        return {
+            "kinds": list(self.kinds),
+            "groups": [{
+                "strategy": group.strategy,
+                "kind": group.kind,
+                "pattern_ids": list(group.pattern_ids),
+                "reason": group.reason,
+                "regex": group.regex.pattern if group.regex is not None else None,
+                "lookup": dict(group.lookup),
+                "ignore_case": group.ignore_case
+            } for group in self.groups]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PatternPlan':
+        """Rebuild a plan from ``to_dict()`` output, compiling combined regexes."""
+        plan = cls(kinds=list(data["kinds"]))
+        for group in data["groups"]:
+            regex = None
+            if group["regex"] is not None:
+                regex = re.compile(group["regex"], re.IGNORECASE if group["ignore_case"] else 0)
+            plan.groups.append(PlanGroup(
+                strategy=group["strategy"],
+                kind=group["kind"],
+                pattern_ids=[int(pattern_id) for pattern_id in group["pattern_ids"]],
+                reason=group["reason"],
+                regex=regex,
+                lookup={key: int(pattern_id) for key, pattern_id in group["lookup"].items()},
+                ignore_case=bool(group["ignore_case"])
+            ))
+        return plan
+
+
+def build_plan(compiled_patterns: Sequence[re.Pattern]) -> PatternPlan:
+    """
+    Classify every pattern and choose how each is evaluated.
+
+    Args:
+        compiled_patterns (Sequence[re.Pattern]): The compiled patterns, indexed by pattern id.
+
+    Returns:
+        PatternPlan: Groups of pattern ids with their strategy.
+    """
+    plan = PatternPlan()
+    # (ignore case) -> [(pattern id, key)]
+    literal_candidates: Dict[bool, List[Tuple[int, str]]] = {}
+    separate: Dict[Tuple[str, str], List[int]] = {}
+
+    for pattern_id, compiled_pattern in enumerate(compiled_patterns):
+        kind, literal = classify_pattern(compiled_pattern)
+        plan.kinds.append(kind)
+        ignore_case = bool(compiled_pattern.flags & re.IGNORECASE)
+        if kind == LITERAL and (literal.isascii() or not ignore_case):
+            key = literal.lower() if ignore_case else literal
+            literal_candidates.setdefault(ignore_case, []).append((pattern_id, key))
+        elif kind == LITERAL:
+            separate.setdefault((LITERAL, "non-ASCII literal matched case-insensitively"),
+                                []).append(pattern_id)
+        elif kind == PREFIX:
+            separate.setdefault((PREFIX, "scanned one by one, the regex engine searches for the literal prefix"),
+                                []).append(pattern_id)
+        else:
+            separate.setdefault((REGEX, "scanned one by one after their prefilters"), []).append(pattern_id)
+
+    for ignore_case, candidates in sorted(literal_candidates.items()):
+        keys = [key for _, key in candidates]
+        overlapping = _overlapping(keys)
+        combinable = [candidate for index, candidate in enumerate(candidates)
+                      if index not in overlapping]
+        overlapping_ids = [candidates[index][0] for index in sorted(overlapping)]
+
+        if _worth_combining([key for _, key in combinable]):
+            plan.groups.append(PlanGroup(
+                strategy=COMBINED,
+                kind=LITERAL,
+                pattern_ids=[pattern_id for pattern_id, _ in combinable],
+                reason=f"{len(combinable)} non-overlapping literals in one scan",
+                regex=re.compile(literal_trie_regex([key for _, key in combinable]),
+                                 re.IGNORECASE if ignore_case else 0),
+                lookup={key: pattern_id for pattern_id, key in combinable},
+                ignore_case=ignore_case
+            ))
+        elif combinable:
+            separate.setdefault((LITERAL, "too few literals to gain from a combined scan"),
+                                []).extend(pattern_id for pattern_id, _ in combinable)
+        if overlapping_ids:
+            separate.setdefault((LITERAL, "matches can overlap another literal"),
+                                []).extend(overlapping_ids)
+
+    for (kind, reason), pattern_ids in separate.items():
+        plan.groups.append(PlanGroup(
+            strategy=PER_PATTERN, kind=kind, pattern_ids=sorted(pattern_ids), reason=reason))
+    return plan
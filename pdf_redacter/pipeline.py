@@ -0,0 +1,372 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.engine import RedactionEngine
+from pdf_redacter.metrics import get_registry
+from pdf_redacter.optimize import combine_results
+from pdf_redacter.workers import WorkerPool
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Bytes read at a time when prefetching a source file
+PREFETCH_CHUNK_SIZE = 1 << 20
+
+# Redaction engine of a redact stage worker process
+_worker_engine: Optional[RedactionEngine] = None
+
+
+def _init_worker(engine: RedactionEngine) -> None:
+    """Keep the engine built by the pipeline for every document of this worker."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _redact_document(src_file: str, temp_file: str) -> Dict[str, Any]:
+    """Redact stage task: redact a source into an uncompressed temporary file."""
+    stats = _worker_engine.redact(src_file, temp_file, overwrite=True)
+    if not stats:
+        raise RuntimeError("redaction failed")
+    if stats.get("verification", {}).get("leaks"):
+        raise RuntimeError(
+            f"verification found matches on page(s) {stats['verification']['pages_with_leaks']}")
+    return stats
+
+
+def _compress_document(
+    temp_file: str,
+    dest_file: str,
+    optimize: bool = False
+) -> Optional[Dict[str, Any]]:
+    """Compress stage task: compress a redacted file and move it into place."""
+    # Written next to the destination and renamed when complete
+    Path(dest_file).parent.mkdir(parents=True, exist_ok=True)
+    partial_file = f"{dest_file}.partial"
+    try:
+        result = PDFRedactor.compress_pdf(temp_file, partial_file, optimize=optimize)
+        os.replace(partial_file, dest_file)
+        return result
+    finally:
+        if os.path.exists(partial_file):
+            os.unlink(partial_file)
+        os.unlink(temp_file)
+
+
+def prefetch_file(path: str) -> int:
+    """
+    Read a file once so its pages are in the OS cache when it is redacted.
+
+    Returns:
+        int: The number of bytes read.
+    """
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(PREFETCH_CHUNK_SIZE), b""):
+            size += len(chunk)
+    return size
+
+
+@dataclass
+class _Document:
+    index: int
+    src_file: str
+    dest_file: str
+    temp_file: Optional[str] = None
+    stats: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    failed_stage: Optional[str] = None
+    start_time: float = 0.0
+
+
+class _Stage:
+    """
+    Worker threads taking documents from a bounded input queue, running one
+    step on each and handing them to the next stage.
+
+    Documents that failed in an earlier stage are passed on untouched. Time
+    spent in the step counts as busy; time waiting for input (starved) and
+    for room in the next queue (blocked) is recorded as well.
+    """
+
+    def __init__(self, name: str, step: Callable[[_Document], None], workers: int, queue_size: int):
+        self.name = name
+        self.step = step
+        self.workers = workers
+        self.input: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.output: Optional[queue.Queue] = None
+        self.documents = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self._lock = threading.Lock()
+        self._running = workers
+        self._threads: List[threading.Thread] = []
+
+    def start(self, downstream_workers: int) -> None:
+        self._downstream_workers = downstream_workers
+        for number in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"pipeline-{self.name}-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self) -> None:
+        busy = starved = blocked = 0.0
+        documents = failures = 0
+        while True:
+            wait_start = time.perf_counter()
+            document = self.input.get()
+            starved += time.perf_counter() - wait_start
+            if document is None:
+                break
+
+            if document.error is None:
+                step_start = time.perf_counter()
+                try:
+                    self.step(document)
+                except Exception as e:
+                    document.error = f"{type(e).__name__}: {e}"
+                    document.failed_stage = self.name
+                    failures += 1
+                busy += time.perf_counter() - step_start
+                documents += 1
+
+            put_start = time.perf_counter()
+            self.output.put(document)
+            blocked += time.perf_counter() - put_start
+
+        with self._lock:
+            self.busy_seconds += busy
+            self.starved_seconds += starved
+            self.blocked_seconds += blocked
+            self.documents += documents
+            self.failures += failures
+            self._running -= 1
+            last = self._running == 0
+        if last:
+            # Every thread of the next stage needs its own end marker
+            for _ in range(self._downstream_workers):
+                self.output.put(None)
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def get_stats(self, wall_seconds: float) -> Dict[str, Any]:
+        capacity = wall_seconds * self.workers
+        return {
+            "workers": self.workers,
+            "documents": self.documents,
+            "failures": self.failures,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "starved_seconds": round(self.starved_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity > 0 else 0.0
+        }
+
+
+class RedactionPipeline:
+    """
+    Redact a batch of documents in overlapping stages.
+
+    Redacting one document after another runs reading, fitz redaction and
+    the PikePDF recompression of each strictly in sequence. The pipeline
+    runs them as stages connected by bounded queues, each with its own
+    concurrency:
+
+    - prefetch: threads reading sources ahead of redaction;
+    - redact: redaction into uncompressed temporary files, on a WorkerPool;
+    - compress: PikePDF recompression to the destination, on a second WorkerPool.
+
+    So the recompression of one document overlaps with the redaction of
+    the next. ``run()`` reports per-stage busy time and utilization; a stage
+    near 1.0 is the bottleneck and is the one to give more workers.
+    """
+
+    def __init__(
+        self,
+        redaction_args: Dict[str, Any],
+        prefetch_workers: int = 2,
+        redact_workers: int = 1,
+        compress_workers: int = 1,
+        queue_size: Optional[int] = None,
+        overwrite: bool = False,
+        skip_redact_failed_pages: bool = False,
+        spool_dir: Optional[str] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        max_worker_rss_mb: Optional[float] = None,
+        store_shrink_percent: int = 100
+    ):
+        """
+        Args:
+            redaction_args (dict): Keyword arguments for PDFRedactor.redact_pdf.
+            prefetch_workers (int): Threads reading sources ahead of redaction.
+            redact_workers (int): Worker processes redacting documents.
+            compress_workers (int): Worker processes compressing and writing outputs.
+            queue_size (Optional[int]): Documents waiting between two stages; defaults to
+                twice the workers of the stage they wait for.
+            overwrite (bool): Whether to overwrite existing destination files.
+            skip_redact_failed_pages (bool): Whether to skip pages that fail redaction.
+            spool_dir (Optional[str]): Directory of the temporary redacted files; defaults
+                to a new temporary directory.
+            max_tasks_per_worker (Optional[int]): Replace a worker process after this many documents.
+            max_worker_rss_mb (Optional[float]): Replace a worker whose RSS exceeds this after a document.
+            store_shrink_percent (int): Share of the MuPDF store freed after every document.
+        """
+        for name, workers in (("prefetch_workers", prefetch_workers),
+                              ("redact_workers", redact_workers),
+                              ("compress_workers", compress_workers)):
+            if workers <= 0:
+                raise ValueError(f"{name} must be a positive integer")
+        if queue_size is not None and queue_size <= 0:
+            raise ValueError("queue_size must be a positive integer")
+
+        self.redaction_args = dict(redaction_args)
+        self.prefetch_workers = prefetch_workers
+        self.redact_workers = redact_workers
+        self.compress_workers = compress_workers
+        self.queue_size = queue_size
+        self.overwrite = overwrite
+        self.skip_redact_failed_pages = skip_redact_failed_pages
+        self.spool_dir = spool_dir
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self.store_shrink_percent = store_shrink_percent
+
+    def _queue_size(self, workers: int) -> int:
+        return self.queue_size if self.queue_size is not None else 2 * workers
+
+    def run(self, documents: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Redact (src_file, dest_file) pairs; documents are read lazily.
+
+        Returns:
+            dict: Documents done and failed, per-document results in input
+            order, per-stage stats and the seconds taken.
+        """
+        start_time = time.perf_counter()
+        engine = RedactionEngine(
+            skip_redact_failed_pages=self.skip_redact_failed_pages,
+            compress_output=False,
+            **self.redaction_args)
+        registry = get_registry()
+        results: List[Optional[Dict[str, Any]]] = []
+
+        with tempfile.TemporaryDirectory(dir=self.spool_dir, prefix="pdf_redacter_") as spool, \
+                WorkerPool(
+                    workers=self.redact_workers,
+                    initializer=_init_worker,
+                    initargs=(engine,),
+                    max_tasks_per_worker=self.max_tasks_per_worker,
+                    max_rss_mb=self.max_worker_rss_mb,
+                    store_shrink_percent=self.store_shrink_percent
+                ) as redact_pool, \
+                WorkerPool(workers=self.compress_workers) as compress_pool:
+
+            def prefetch(document: _Document) -> None:
+                document.start_time = time.perf_counter()
+                if not self.overwrite and os.path.exists(document.dest_file):
+                    raise FileExistsError(
+                        f"Destination file '{document.dest_file}' already exists")
+                prefetch_file(document.src_file)
+
+            def redact(document: _Document) -> None:
+                document.temp_file = os.path.join(spool, f"{document.index}.pdf")
+                document.stats = redact_pool.submit(
+                    _redact_document, document.src_file, document.temp_file).result()
+
+            def compress(document: _Document) -> None:
+                optimization = compress_pool.submit(
+                    _compress_document, document.temp_file, document.dest_file,
+                    self.redaction_args.get("optimize_output", False)).result()
+                if optimization is not None:
+                    # Subsetting ran in the redact stage, pruning here
+                    document.stats["optimization"] = combine_results(
+                        document.stats.get("optimization"), optimization)
+
+            stages = [
+                _Stage("prefetch", prefetch, self.prefetch_workers,
+                       self._queue_size(self.prefetch_workers)),
+                _Stage("redact", redact, self.redact_workers,
+                       self._queue_size(self.redact_workers)),
+                _Stage("compress", compress, self.compress_workers,
+                       self._queue_size(self.compress_workers))
+            ]
+            finished: queue.Queue = queue.Queue()
+            for stage, next_stage in zip(stages, stages[1:] + [None]):
+                stage.output = next_stage.input if next_stage is not None else finished
+                stage.start(next_stage.workers if next_stage is not None else 1)
+
+            # Feed lazily: the bounded first queue holds back the input
+            feed_errors: List[BaseException] = []
+
+            def feed() -> None:
+                try:
+                    for index, (src_file, dest_file) in enumerate(documents):
+                        results.append(None)
+                        stages[0].input.put(_Document(index, str(src_file), str(dest_file)))
+                except BaseException as e:
+                    feed_errors.append(e)
+                finally:
+                    for _ in range(stages[0].workers):
+                        stages[0].input.put(None)
+
+            feeder = threading.Thread(target=feed, name="pipeline-feed", daemon=True)
+            feeder.start()
+
+            done = failed = 0
+            while True:
+                document = finished.get()
+                if document is None:
+                    break
+                seconds = time.perf_counter() - document.start_time
+                result = {"src": document.src_file, "dest": document.dest_file}
+                if document.error is None:
+                    done += 1
+                    result["status"] = "done"
+                    result["total_matches"] = document.stats.get("total_matches", 0)
+                    result["pages_processed"] = document.stats.get("pages_processed", 0)
+                    registry.record_document(document.stats, seconds)
+                else:
+                    failed += 1
+                    result["status"] = "failed"
+                    result["stage"] = document.failed_stage
+                    result["error"] = document.error
+                    registry.record_failure(seconds)
+                    logger.error(
+                        f"'{document.src_file}' failed in the {document.failed_stage} stage: "
+                        f"{document.error}")
+                    if document.temp_file and os.path.exists(document.temp_file):
+                        os.unlink(document.temp_file)
+                result["seconds"] = round(seconds, 3)
+                results[document.index] = result
+
+            feeder.join()
+            for stage in stages:
+                stage.join()
+            if feed_errors:
+                raise feed_errors[0]
+
+        wall_seconds = time.perf_counter() - start_time
+        summary = {
+            "documents_done": done,
+            "documents_failed": failed,
+            "results": results,
+            "stages": {stage.name: stage.get_stats(wall_seconds) for stage in stages},
+            "seconds": wall_seconds
+        }
+        logger.info(
+            f"Pipeline: {done} documents done, {failed} failed in {wall_seconds:.1f}s; utilization "
+            + ", ".join(f"{name} {stats['utilization']:.0%}"
+                        for name, stats in summary["stages"].items()))
+        return summary
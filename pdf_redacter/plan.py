@@ -0,0 +1,119 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from pdf_redacter.stats import RedactionStats
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Bumped when the plan layout changes
+PLAN_VERSION = 1
+
+# Decimals kept of rect coordinates, well below a point
+RECT_PRECISION = 3
+
+# redact_pdf options that also apply to writing the output of a plan
+APPLY_OPTIONS = ("raster_fallback", "raster_dpi", "raster_workers", "optimize_output")
+
+Rect = Tuple[float, float, float, float]
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class PagePlan:
+    """The redactions of one page: merged rects and the match count per pattern id."""
+    page: int
+    rects: List[Rect] = field(default_factory=list)
+    # Pattern id -> matches on the page
+    matches: Dict[int, int] = field(default_factory=dict)
+    # Rects come from a template rather than from pattern matches
+    template: bool = False
+
+    @classmethod
+    def from_dict(cls, page_dict: Dict[str, Any]) -> 'PagePlan':
+        return cls(
+            page=int(page_dict['page']),
+            rects=[tuple(float(value) for value in rect) for rect in page_dict.get('rects', [])],
+            matches={int(pattern_id): int(count)
+                     for pattern_id, count in (page_dict.get('matches') or {}).items()},
+            template=bool(page_dict.get('template', False))
+        )
+
+
+@dataclass
+class RedactionPlan:
+    """
+    What to redact in one document, without the text that is redacted.
+
+    Made by ``PDFRedactor.plan_pdf`` (text extraction, matching and rect
+    resolution) and consumed by ``PDFRedactor.apply_plan``, which only
+    annotates and applies the rects. Plans only hold rects, pattern strings
+    and match counts, so they can be stored, reviewed and applied later or
+    elsewhere. The source file's SHA-256 ties a plan to the exact input.
+    """
+    src_file: str
+    source_sha256: str
+    page_count: int
+    patterns: List[str]
+    replacement: str
+    pages: List[PagePlan] = field(default_factory=list)
+    version: int = PLAN_VERSION
+
+    @property
+    def total_matches(self) -> int:
+        return sum(sum(page.matches.values()) for page in self.pages)
+
+    def to_stats(self) -> RedactionStats:
+        """Stats holding the planned match counts, for the apply phase to complete."""
+        stats = RedactionStats(self.patterns)
+        for page in self.pages:
+            for pattern_id, count in page.matches.items():
+                stats.total_matches += count
+                stats.pattern_matches[pattern_id] += count
+            if page.template:
+                stats.template_pages += 1
+                stats.template_rects += len(page.rects)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, plan_dict: Dict[str, Any]) -> 'RedactionPlan':
+        version = plan_dict.get('version')
+        if version != PLAN_VERSION:
+            raise ValueError(f"Unsupported redaction plan version: {version}")
+        return cls(
+            src_file=plan_dict['src_file'],
+            source_sha256=plan_dict['source_sha256'],
+            page_count=int(plan_dict['page_count']),
+            patterns=list(plan_dict['patterns']),
+            replacement=plan_dict['replacement'],
+            pages=[PagePlan.from_dict(page) for page in plan_dict.get('pages', [])]
+        )
+
+    def save(self, path: str) -> None:
+        """Write the plan as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> 'RedactionPlan':
+        """Read a plan written by save()."""
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Redaction plan not found: {path}")
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,176 @@
+import re
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Repeat operators whose body must occur at least `min` times
+_REPEATS = tuple(
+    op for op in (
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, "POSSESSIVE_REPEAT", None)
+    )
+    if op is not None
+)
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: r"\d",
+    sre_parse.CATEGORY_NOT_DIGIT: r"\D",
+    sre_parse.CATEGORY_SPACE: r"\s",
+    sre_parse.CATEGORY_NOT_SPACE: r"\S",
+    sre_parse.CATEGORY_WORD: r"\w",
+    sre_parse.CATEGORY_NOT_WORD: r"\W"
+}
+
+# Longest character-class run required by a probe
+MAX_PROBE_RUN = 16
+
+# Flags that change what a probe matches
+_PROBE_FLAGS = re.IGNORECASE | re.ASCII | re.UNICODE
+
+
+def _render_class(items) -> Optional[str]:
+    """Render the items of an IN node back to a character class, if possible."""
+    parts = []
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            parts.append("^")
+        elif op is sre_parse.LITERAL:
+            parts.append(re.escape(chr(av)))
+        elif op is sre_parse.RANGE:
+            parts.append(f"{re.escape(chr(av[0]))}-{re.escape(chr(av[1]))}")
+        elif op is sre_parse.CATEGORY and av in _CATEGORIES:
+            parts.append(_CATEGORIES[av])
+        else:
+            return None
+    return "[" + "".join(parts) + "]"
+
+
+def _required_features(items) -> Tuple[List[str], List[str]]:
+    """
+    Collect literal substrings and character-class probes that every match contains.
+
+    Only nodes that are mandatory in the sequence are analyzed; alternations,
+    optional repeats, lookarounds and groups with scoped flags add nothing,
+    which keeps the result conservative.
+    """
+    literals: List[str] = []
+    probes: List[str] = []
+    run: List[str] = []
+
+    def flush():
+        if run:
+            literals.append("".join(run))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+
+        if op is sre_parse.IN:
+            probe = _render_class(av)
+            if probe:
+                probes.append(probe)
+
+        elif op in _REPEATS:
+            min_count, _, body = av
+            if min_count < 1:
+                continue
+            body = list(body)
+            if len(body) == 1 and body[0][0] in (sre_parse.IN, sre_parse.LITERAL):
+                body_op, body_av = body[0]
+                if body_op is sre_parse.LITERAL:
+                    probe = re.escape(chr(body_av))
+                else:
+                    probe = _render_class(body_av)
+                if probe is None:
+                    continue
+                count = min(min_count, MAX_PROBE_RUN)
+                if body_op is sre_parse.LITERAL:
+                    literals.append(chr(body_av) * count)
+                else:
+                    probes.append(f"{probe}{{{count}}}" if count > 1 else probe)
+            else:
+                sub_literals, sub_probes = _required_features(body)
+                literals.extend(sub_literals)
+                probes.extend(sub_probes)
+
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, body = av
+            if add_flags or del_flags:
+                continue
+            sub_literals, sub_probes = _required_features(body)
+            literals.extend(sub_literals)
+            probes.extend(sub_probes)
+
+    flush()
+    return literals, probes
+
+
+class PatternPrefilter:
+    """
+    Cheap test for text that a pattern cannot match.
+
+    Holds the literal substrings and character-class runs that every match of
+    a pattern must contain. ``may_match`` returns False only if one of them is
+    missing from the text, in which case running the full pattern can be
+    skipped. Case-insensitive literals are checked with a regex compiled with
+    the pattern's own flags, so Unicode case folding stays exact.
+    """
+
+    __slots__ = ("literals", "probe_patterns", "probes")
+
+    def __init__(self, literals: List[str], probe_patterns: List[str], flags: int):
+        self.literals = tuple(literals)
+        self.probe_patterns = tuple(probe_patterns)
+        self.probes = tuple(
+            re.compile(probe, flags & _PROBE_FLAGS) for probe in self.probe_patterns)
+
+    @property
+    def requires(self) -> List[str]:
+        """Human readable list of the required features."""
+        return [repr(literal) for literal in self.literals] + list(self.probe_patterns)
+
+    def may_match(self, text: str) -> bool:
+        for literal in self.literals:
+            if literal not in text:
+                return False
+        for probe in self.probes:
+            if probe.search(text) is None:
+                return False
+        return True
+
+
+def build_prefilter(compiled_pattern: re.Pattern) -> Optional[PatternPrefilter]:
+    """
+    Analyze a compiled pattern for required substrings and character classes.
+
+    Returns:
+        Optional[PatternPrefilter]: The prefilter, or None if nothing is required.
+    """
+    if not isinstance(compiled_pattern.pattern, str):
+        return None
+    try:
+        parsed = sre_parse.parse(compiled_pattern.pattern, compiled_pattern.flags)
+    except Exception:
+        # Unknown parser internals: scan with the full pattern
+        return None
+
+    literals, probes = _required_features(parsed)
+    ignore_case = bool(compiled_pattern.flags & re.IGNORECASE)
+    if ignore_case:
+        # Substring tests are case sensitive; turn literals into probes
+        probes = [re.escape(literal) for literal in literals] + probes
+        literals = []
+
+    # Longest literals are the most selective, test them first
+    literals = sorted(set(literals), key=len, reverse=True)
+    probes = list(dict.fromkeys(probes))
+    if not literals and not probes:
+        return None
+    return PatternPrefilter(literals, probes, compiled_pattern.flags)
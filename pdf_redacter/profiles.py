@@ -0,0 +1,274 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+from tqdm import tqdm
+
+from pdf_redacter.config import RedactionProfile
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.geometry import DEFAULT_MERGE_GAP
+from pdf_redacter.metrics import get_registry
+from pdf_redacter.optimize import combine_results, optimize_document
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType, coalesce_spans
+from pdf_redacter.stats import RedactionStats
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+
+class MultiProfileRedactor:
+    """
+    Redact one source PDF for several profiles in a single pass.
+
+    The patterns of all profiles are compiled into one matcher. Each page's
+    text is extracted and matched once; the spans are then partitioned by
+    the profiles whose patterns produced them, and every profile redacts its
+    own copy of the document, which is saved to the profile's output file.
+    A rect search for the same text is shared between profiles.
+    """
+
+    def __init__(
+        self,
+        src_file: str,
+        overwrite: bool = False,
+        skip_redact_failed_pages: bool = False
+    ):
+        """
+        Args:
+            src_file (str): The input PDF file to process.
+            overwrite (bool): Whether to overwrite output files that already exist.
+            skip_redact_failed_pages (bool): Whether to skip any pages that fail redaction from the outputs.
+        """
+        if not src_file or not os.path.isfile(src_file):
+            logger.error(f"Source file '{src_file}' not found")
+            raise FileNotFoundError(f"Source file '{src_file}' not found")
+
+        self.src_file = src_file
+        self.overwrite = overwrite
+        self.skip_redact_failed_pages = skip_redact_failed_pages
+
+    def _validate_profiles(self, profiles: List[RedactionProfile]) -> None:
+        if not profiles:
+            raise ValueError("No redaction profiles specified")
+
+        names = [profile.name for profile in profiles]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Profile names must be unique: {names}")
+
+        outputs = [os.path.abspath(profile.output_file) for profile in profiles]
+        if len(set(outputs)) != len(outputs):
+            raise ValueError("Each profile needs its own output file")
+        if os.path.abspath(self.src_file) in outputs:
+            raise ValueError("A profile output file cannot be the source file")
+
+        if not self.overwrite:
+            for profile in profiles:
+                if os.path.exists(profile.output_file):
+                    logger.error(f"Destination file '{profile.output_file}' already exists")
+                    raise FileExistsError(
+                        f"Destination file '{profile.output_file}' already exists")
+
+    def redact_profiles(
+        self,
+        profiles: List[RedactionProfile],
+        ignore_case: bool,
+        needles: Optional[List[str]] = None,
+        predefined_patterns: Optional[List[PatternType]] = None,
+        replacement: str = "***REDACTED***",
+        validate_patterns: bool = True,
+        pattern_cache_dir: Optional[str] = None,
+        coalesce_rects: bool = True,
+        coalesce_gap: float = DEFAULT_MERGE_GAP,
+        optimize_output: bool = False
+    ) -> dict | None:
+        """
+        Redact the source for every profile and save one output per profile.
+
+        Args:
+                profiles (List[RedactionProfile]): The profiles to produce.
+                ignore_case (bool): Whether the search for patterns should be case-insensitive.
+                needles (Optional[List[str]]): Patterns redacted in every profile.
+                predefined_patterns (Optional[List[PatternType]]): Pattern templates redacted in every profile.
+                replacement (str): Replacement text for profiles that do not set their own.
+                validate_patterns (bool): Enforce pattern validation.
+                pattern_cache_dir (Optional[str]): Directory of the persistent compiled pattern-set cache.
+                coalesce_rects (bool): Merge redaction rects on the same line before annotating.
+                coalesce_gap (float): Largest gap in points bridged when merging rects.
+                optimize_output (bool): Optimize every written output, see optimize_document().
+
+        Returns:
+            dict: Per-profile stats under "profiles", keyed by profile name, plus the
+                pages_processed and stage_times of the shared extraction and matching,
+                or None if the patterns are invalid or redaction failed.
+        """
+        self._validate_profiles(profiles)
+
+        # Patterns of each profile, shared ones first
+        profile_needles = []
+        profile_templates = []
+        for profile in profiles:
+            profile_needles.append(list(needles or []) + list(profile.searches or []))
+            profile_templates.append(
+                list(predefined_patterns or [])
+                + [PatternType(name) for name in profile.predefined_patterns or []])
+            if not profile_needles[-1] and not profile_templates[-1]:
+                raise ValueError(f"Profile '{profile.name}' has no search patterns")
+
+        pattern_matcher = PDFRedactor.build_pattern_matcher(
+            list(dict.fromkeys(n for group in profile_needles for n in group)),
+            ignore_case,
+            predefined_patterns=list(dict.fromkeys(
+                t for group in profile_templates for t in group)),
+            validate_patterns=validate_patterns,
+            pattern_cache_dir=pattern_cache_dir
+        )
+        if pattern_matcher is None or not pattern_matcher.patterns:
+            logger.error("No valid Search patterns specified")
+            return None
+        pattern_matcher.reset_prefilter_stats()
+
+        # Which matcher pattern ids belong to each profile
+        memberships = []
+        for group, templates in zip(profile_needles, profile_templates):
+            wanted = set(group) | {
+                EnhancedPatternMatcher.PATTERN_TEMPLATES[t].pattern for t in templates}
+            memberships.append([pattern in wanted for pattern in pattern_matcher.patterns])
+
+        start_time = time.perf_counter()
+        shared_stats = RedactionStats(pattern_matcher.patterns)
+        docs = []
+        try:
+            open_start = time.perf_counter()
+            src_doc: fitz.Document = fitz.open(self.src_file)
+            docs.append(src_doc)
+            profile_docs = []
+            for _ in profiles:
+                profile_docs.append(fitz.open(self.src_file))
+                docs.append(profile_docs[-1])
+            shared_stats.add_stage_time("open", time.perf_counter() - open_start)
+
+            all_stats = [RedactionStats(pattern_matcher.patterns) for _ in profiles]
+            failed_pages: List[List[int]] = [[] for _ in profiles]
+
+            for page_num in tqdm(
+                    range(len(src_doc)),
+                    total=len(src_doc),
+                    desc="Redacting",
+                    unit="page"
+            ):
+                self._redact_page(
+                    page_num, src_doc, profiles, profile_docs, memberships,
+                    pattern_matcher, replacement, all_stats, failed_pages,
+                    shared_stats, coalesce_gap if coalesce_rects else None)
+
+            results: Dict[str, Dict[str, Any]] = {}
+            for profile, doc, stats, failed, membership in zip(
+                    profiles, profile_docs, all_stats, failed_pages, memberships):
+                if self.skip_redact_failed_pages:
+                    for page_index in sorted(failed, reverse=True):
+                        doc.delete_page(page_index)
+
+                subset_result = optimize_document(doc) if optimize_output else None
+
+                save_start = time.perf_counter()
+                save_result = PDFRedactor.save_compressed(
+                    doc, profile.output_file, optimize=optimize_output)
+                save_seconds = time.perf_counter() - save_start
+                if optimize_output:
+                    stats.optimization = combine_results(subset_result, save_result)
+                    stats.add_stage_time("optimize", stats.optimization["seconds"])
+                    save_seconds -= save_result["seconds"]
+                stats.add_stage_time("save", save_seconds)
+
+                result = stats.to_dict()
+                result["patterns_used"] = sum(membership)
+                result["output_file"] = profile.output_file
+                results[profile.name] = result
+                get_registry().record_document(result, time.perf_counter() - start_time)
+                logger.info(
+                    f"Profile '{profile.name}': {stats.total_matches} matches, "
+                    f"saved as '{profile.output_file}'")
+
+        except Exception as e:
+            logger.exception(f"An error occurred: {str(e)}")
+            get_registry().record_failure(time.perf_counter() - start_time)
+            return None
+
+        finally:
+            for doc in docs:
+                doc.close()
+
+        summary = {
+            "profiles": results,
+            "pages_processed": shared_stats.pages_processed,
+            "stage_times": dict(shared_stats.stage_times)
+        }
+        prefilter = pattern_matcher.get_prefilter_stats()
+        if prefilter:
+            summary["prefilter"] = prefilter
+        return summary
+
+    @staticmethod
+    def _redact_page(
+        page_num: int,
+        src_doc: fitz.Document,
+        profiles: List[RedactionProfile],
+        profile_docs: List[fitz.Document],
+        memberships: List[List[bool]],
+        pattern_matcher: EnhancedPatternMatcher,
+        replacement: str,
+        all_stats: List[RedactionStats],
+        failed_pages: List[List[int]],
+        shared_stats: RedactionStats,
+        coalesce_gap: Optional[float]
+    ) -> None:
+        """Extract and match a page once, then redact it in every profile document."""
+        src_page = src_doc[page_num]
+
+        stage_start = time.perf_counter()
+        page_text = src_page.get_text()
+        extract_end = time.perf_counter()
+        spans = list(pattern_matcher.iter_spans(page_text))
+        match_end = time.perf_counter()
+
+        shared_stats.pages_processed += 1
+        shared_stats.add_stage_time("extract", extract_end - stage_start)
+        shared_stats.add_stage_time("match", match_end - extract_end)
+
+        # Rects of each searched text; the profile documents are copies of the source
+        rect_cache: Dict[str, List[fitz.Rect]] = {}
+
+        for profile, doc, membership, stats, failed in zip(
+                profiles, profile_docs, memberships, all_stats, failed_pages):
+            apply_start = time.perf_counter()
+            page_matches = 0
+            page_rects = []
+            searched = set()
+
+            profile_spans = (span for span in spans if membership[span[2]])
+            for start_idx, end_idx, pattern_ids in coalesce_spans(profile_spans):
+                for pattern_id in pattern_ids:
+                    stats.record_match(pattern_id)
+                page_matches += len(pattern_ids)
+
+                needle = page_text[start_idx:end_idx]
+                if needle in searched:
+                    continue
+                searched.add(needle)
+                if needle not in rect_cache:
+                    rect_cache[needle] = src_page.search_for(needle)
+                page_rects.extend(rect_cache[needle])
+
+            stats.spans_searched += len(searched)
+
+            if not PDFRedactor.apply_rects(
+                    doc[page_num], page_rects, page_matches,
+                    profile.replacement if profile.replacement is not None else replacement,
+                    stats, coalesce_gap):
+                failed.append(page_num)
+
+            stats.pages_processed += 1
+            stats.add_stage_time("apply", time.perf_counter() - apply_start)
@@ -0,0 +1,150 @@
+import multiprocessing
+from typing import Dict, List, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+try:
+    import numpy as np
+except ImportError:  # optional, installed with the "fast" extra
+    np = None
+
+from pdf_redacter.workers import WorkerPool
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Resolution of pages replaced by an image when redactions cannot be applied
+DEFAULT_RASTER_DPI = 150
+
+# Pixels added around every rect, covering anti-aliased glyph edges
+RASTER_PADDING = 1
+
+
+def pixel_boxes(
+    rects: Sequence[Tuple[float, float, float, float]],
+    page: fitz.Page,
+    matrix: fitz.Matrix,
+    width: int,
+    height: int
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Convert rects in page coordinates to (x0, y0, x1, y1) pixel boxes of the
+    page rendered with matrix, padded and clipped to the image.
+    """
+    transform = page.rotation_matrix * matrix
+    boxes = []
+    for rect in rects:
+        box = (fitz.Rect(rect) * transform).normalize()
+        x0 = max(int(box.x0) - RASTER_PADDING, 0)
+        y0 = max(int(box.y0) - RASTER_PADDING, 0)
+        x1 = min(int(box.x1 + 0.999) + RASTER_PADDING, width)
+        y1 = min(int(box.y1 + 0.999) + RASTER_PADDING, height)
+        if x0 < x1 and y0 < y1:
+            boxes.append((x0, y0, x1, y1))
+    return boxes
+
+
+def fill_boxes(pix: fitz.Pixmap, boxes: Sequence[Tuple[int, int, int, int]]) -> None:
+    """
+    Black out pixel boxes of a pixmap in place.
+
+    With NumPy the samples are viewed as a (height, width, components)
+    array and every box is a single slice assignment; without it each box
+    is filled by MuPDF.
+    """
+    if np is not None:
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+        image = samples.reshape(pix.height, pix.stride)[:, :pix.width * pix.n]
+        image = image.reshape(pix.height, pix.width, pix.n)
+        for x0, y0, x1, y1 in boxes:
+            image[y0:y1, x0:x1] = 0
+    else:
+        black = (0,) * pix.n
+        for box in boxes:
+            pix.set_rect(fitz.IRect(box), black)
+
+
+def rasterize_page(
+    page_pdf: bytes,
+    rects: Sequence[Tuple[float, float, float, float]],
+    dpi: int = DEFAULT_RASTER_DPI
+) -> bytes:
+    """
+    Render a single-page PDF, black out rects and return a single-page PDF
+    of the image, with the size of the original page.
+
+    Args:
+        page_pdf (bytes): PDF holding the page as its only page.
+        rects (Sequence[tuple]): Areas to black out, in page coordinates.
+        dpi (int): Resolution of the rendered page.
+    """
+    with fitz.open("pdf", page_pdf) as doc:
+        page = doc[0]
+        matrix = fitz.Matrix(dpi / 72, dpi / 72)
+        pix = page.get_pixmap(matrix=matrix, alpha=False, annots=False)
+        fill_boxes(pix, pixel_boxes(rects, page, matrix, pix.width, pix.height))
+
+        with fitz.open() as image_doc:
+            image_page = image_doc.new_page(width=page.rect.width, height=page.rect.height)
+            image_page.insert_image(image_page.rect, pixmap=pix)
+            return image_doc.tobytes(deflate=True)
+
+
+def _rasterize_task(page_num: int, page_pdf: bytes, rects, dpi: int) -> Tuple[int, bytes]:
+    """Pool task: rasterize one page, returning it with its page number."""
+    return page_num, rasterize_page(page_pdf, rects, dpi)
+
+
+def rasterize_pages(
+    doc: fitz.Document,
+    page_rects: Dict[int, Sequence[Tuple[float, float, float, float]]],
+    dpi: int = DEFAULT_RASTER_DPI,
+    workers: int = 1
+) -> List[int]:
+    """
+    Replace pages of an open document with images of themselves with the
+    given rects blacked out, keeping the page count and order.
+
+    Used for pages where apply_redactions() failed: nothing of the page
+    survives as text or vector content, at the cost of a larger, unsearchable
+    page. Pages are extracted into single-page PDFs and rendered in worker
+    processes when workers > 1.
+
+    Args:
+        doc (fitz.Document): The document being redacted.
+        page_rects (dict): Rects to black out, by page number.
+        dpi (int): Resolution of the rendered pages.
+        workers (int): Number of processes; 1 renders in this process.
+
+    Returns:
+        List[int]: The page numbers replaced.
+    """
+    if dpi <= 0:
+        raise ValueError("dpi must be a positive integer")
+    if workers <= 0:
+        raise ValueError("workers must be a positive integer")
+
+    tasks = []
+    for page_num in sorted(page_rects):
+        with fitz.open() as single:
+            single.insert_pdf(doc, from_page=page_num, to_page=page_num)
+            tasks.append((page_num, single.tobytes(), list(page_rects[page_num]), dpi))
+
+    # Pool workers are daemonic and cannot start processes of their own
+    if workers == 1 or len(tasks) <= 1 or multiprocessing.current_process().daemon:
+        images = [_rasterize_task(*task) for task in tasks]
+    else:
+        with WorkerPool(workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(_rasterize_task, *task) for task in tasks]
+            images = [future.result() for future in futures]
+
+    for page_num, image_pdf in images:
+        with fitz.open("pdf", image_pdf) as image_doc:
+            doc.insert_pdf(image_doc, start_at=page_num)
+        doc.delete_page(page_num + 1)
+
+    if images:
+        logger.warning(f"Replaced page(s) {[page_num for page_num, _ in images]} with images")
+    return [page_num for page_num, _ in images]
@@ -0,0 +1,499 @@
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.optimize import combine_results, optimize_document
+from pdf_redacter.pattern_matcher import PatternType
+from pdf_redacter.templates import RedactionTemplate
+from pdf_redacter.workers import current_rss, peak_rss, shrink_store
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+JOB_FILE = "job.json"
+STATS_FILE = "stats.json"
+
+PENDING_DIR = "pending"
+CLAIMED_DIR = "claimed"
+DONE_DIR = "done"
+FAILED_DIR = "failed"
+PARTS_DIR = "parts"
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON to a temporary file and rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            os.unlink(tmp_path)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def aggregate_stats(stats_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the statistics of several partial redaction runs.
+
+    Counters are summed, per-pattern dictionaries are merged and pattern
+    timings are re-sorted by cost.
+    """
+    aggregated: Dict[str, Any] = {
+        "total_matches": 0,
+        "pages_processed": 0,
+        "pages_modified": 0,
+        "pages_failed_redaction": 0,
+        "patterns_used": 0,
+        "matches_by_pattern": {}
+    }
+    timings: Dict[str, Dict[str, Any]] = {}
+    prefilter: Dict[int, Dict[str, Any]] = {}
+
+    for stats in stats_list:
+        for key in ("total_matches", "pages_processed",
+                    "pages_modified", "pages_failed_redaction"):
+            aggregated[key] += stats.get(key, 0)
+
+        aggregated["patterns_used"] = max(
+            aggregated["patterns_used"], stats.get("patterns_used", 0))
+
+        for pattern, count in stats.get("matches_by_pattern", {}).items():
+            aggregated["matches_by_pattern"][pattern] = \
+                aggregated["matches_by_pattern"].get(pattern, 0) + count
+
+        for key in ("spans_searched", "annotations_requested",
+                    "annotations_applied", "pages_timed_out",
+                    "template_pages", "template_rects"):
+            if key in stats:
+                aggregated[key] = aggregated.get(key, 0) + stats[key]
+
+        # Per-stage and per-engine totals
+        for key in ("stage_times", "engine_pages"):
+            for name, value in stats.get(key, {}).items():
+                totals = aggregated.setdefault(key, {})
+                totals[name] = totals.get(name, 0) + value
+
+        for entry in stats.get("prefilter", []):
+            totals = prefilter.setdefault(
+                entry["pattern_id"], {**entry, "checked": 0, "skipped": 0})
+            totals["checked"] += entry["checked"]
+            totals["skipped"] += entry["skipped"]
+
+        for timing in stats.get("pattern_timings", []):
+            entry = timings.setdefault(
+                timing["pattern"], {"time": 0.0, "matches": 0, "scans": 0})
+            entry["time"] += timing["time"]
+            entry["matches"] += timing["matches"]
+            entry["scans"] += timing["scans"]
+
+    if prefilter:
+        aggregated["prefilter"] = [
+            {
+                **entry,
+                "skip_rate": entry["skipped"] / entry["checked"] if entry["checked"] else 0.0
+            }
+            for _, entry in sorted(prefilter.items())
+        ]
+
+    if timings:
+        total_time = sum(entry["time"] for entry in timings.values())
+        aggregated["pattern_timings"] = sorted(
+            [
+                {
+                    "pattern": pattern,
+                    **entry,
+                    "share": entry["time"] / total_time if total_time else 0.0
+                }
+                for pattern, entry in timings.items()
+            ],
+            key=lambda x: x["time"],
+            reverse=True
+        )
+
+    return aggregated
+
+
+class ShardCoordinator:
+    """
+    Split a PDF into page-range tasks on a shared queue directory.
+
+    The queue directory holds the job description and one JSON file per
+    task. Tasks move between the pending/, claimed/, done/ and failed/
+    sub-directories using atomic renames, so any filesystem shared by the
+    workers (or a plain local directory) is enough to run a job.
+    """
+
+    def __init__(self, queue_dir: str):
+        self.queue_dir = Path(queue_dir)
+
+    def create_job(
+        self,
+        src_file: str,
+        dest_file: str,
+        redaction_args: Dict[str, Any],
+        pages_per_shard: int = 50,
+        skip_redact_failed_pages: bool = False
+    ) -> int:
+        """
+        Create the job description and enqueue one task per page range.
+
+        Args:
+            src_file (str): The input PDF file to process.
+            dest_file (str): The output PDF file path used by the merge step.
+            redaction_args (dict): Keyword arguments for PDFRedactor.redact_pdf.
+            pages_per_shard (int): Number of pages per task.
+            skip_redact_failed_pages (bool): Whether to skip pages that fail redaction.
+
+        Returns:
+            int: Number of tasks created.
+        """
+        if pages_per_shard <= 0:
+            raise ValueError("pages_per_shard must be a positive integer")
+
+        if not os.path.isfile(src_file):
+            raise FileNotFoundError(f"Source file '{src_file}' not found")
+
+        if (self.queue_dir / JOB_FILE).exists():
+            raise FileExistsError(
+                f"Queue directory '{self.queue_dir}' already holds a job")
+
+        with fitz.open(src_file) as doc:
+            page_count = len(doc)
+
+        # Predefined patterns travel as their string values, a template as
+        # its dictionary
+        serializable_args = dict(redaction_args)
+        if serializable_args.get('predefined_patterns'):
+            serializable_args['predefined_patterns'] = [
+                pattern.value if isinstance(pattern, PatternType) else pattern
+                for pattern in serializable_args['predefined_patterns']
+            ]
+        if isinstance(serializable_args.get('template'), RedactionTemplate):
+            serializable_args['template'] = serializable_args['template'].to_dict()
+        try:
+            json.dumps(serializable_args)
+        except TypeError as e:
+            raise TypeError(f"Redaction arguments cannot be stored in the job: {e}") from e
+
+        for sub_dir in (PENDING_DIR, CLAIMED_DIR, DONE_DIR, FAILED_DIR, PARTS_DIR):
+            (self.queue_dir / sub_dir).mkdir(parents=True, exist_ok=True)
+
+        task_ids = []
+        try:
+            for task_index, first_page in enumerate(range(0, page_count, pages_per_shard)):
+                task_id = f"task_{task_index:06d}"
+                task_ids.append(task_id)
+                _write_json_atomic(
+                    self.queue_dir / PENDING_DIR / f"{task_id}.json",
+                    {
+                        "task_id": task_id,
+                        "first_page": first_page,
+                        "last_page": min(first_page + pages_per_shard, page_count) - 1
+                    }
+                )
+
+            # The job file is written last so workers never see a partial queue
+            _write_json_atomic(self.queue_dir / JOB_FILE, {
+                "src_file": str(Path(src_file).resolve()),
+                "dest_file": str(dest_file),
+                "page_count": page_count,
+                "pages_per_shard": pages_per_shard,
+                "skip_redact_failed_pages": skip_redact_failed_pages,
+                "redaction_args": serializable_args,
+                "tasks": task_ids
+            })
+        except BaseException:
+            # Leave no tasks behind without a job
+            for task_id in task_ids:
+                (self.queue_dir / PENDING_DIR / f"{task_id}.json").unlink(missing_ok=True)
+            raise
+
+        logger.info(
+            f"Created {len(task_ids)} task(s) for {page_count} page(s) in '{self.queue_dir}'")
+        return len(task_ids)
+
+    def requeue_stale_tasks(self, max_age: float) -> int:
+        """
+        Return tasks claimed more than max_age seconds ago to the pending queue.
+
+        This recovers tasks held by workers that died without finishing, so
+        max_age must exceed the longest a task can take.
+        """
+        requeued = 0
+        now = time.time()
+        for claimed in (self.queue_dir / CLAIMED_DIR).glob("*.json"):
+            try:
+                if now - claimed.stat().st_mtime < max_age:
+                    continue
+                task_id = claimed.name.split(".", 1)[0]
+                os.rename(claimed, self.queue_dir /
+                          PENDING_DIR / f"{task_id}.json")
+                requeued += 1
+            except FileNotFoundError:
+                # Finished or requeued by someone else meanwhile
+                continue
+
+        if requeued:
+            logger.info(f"Requeued {requeued} stale task(s)")
+        return requeued
+
+
+class ShardWorker:
+    """Claim page-range tasks from a queue directory and redact them."""
+
+    def __init__(
+        self,
+        queue_dir: str,
+        worker_id: Optional[str] = None,
+        max_rss_mb: Optional[float] = None,
+        store_shrink_percent: int = 100
+    ):
+        """
+        Args:
+            queue_dir (str): The job's queue directory.
+            worker_id (Optional[str]): Name recorded with results; host and pid by default.
+            max_rss_mb (Optional[float]): Stop claiming tasks once the RSS exceeds this,
+                so a supervisor can start a fresh worker.
+            store_shrink_percent (int): Share of the MuPDF store freed after every task.
+        """
+        self.queue_dir = Path(queue_dir)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.max_rss_mb = max_rss_mb
+        self.store_shrink_percent = store_shrink_percent
+
+        job_path = self.queue_dir / JOB_FILE
+        if not job_path.exists():
+            raise FileNotFoundError(f"No job found in '{self.queue_dir}'")
+        self.job = _read_json(job_path)
+
+    def claim_task(self) -> Optional[Path]:
+        """
+        Atomically claim the next pending task.
+
+        The claim file is named after the task, the worker and a random
+        nonce, so a task requeued while its first claim still runs gets a
+        claim of its own.
+
+        Returns:
+            Optional[Path]: Path of the claimed task file, or None if the queue is empty.
+        """
+        for pending in sorted((self.queue_dir / PENDING_DIR).glob("*.json")):
+            claimed = self.queue_dir / CLAIMED_DIR / \
+                f"{pending.stem}.{self.worker_id}.{os.urandom(4).hex()}.json"
+            try:
+                os.rename(pending, claimed)
+                # Renaming keeps the enqueue time; staleness counts from the claim
+                os.utime(claimed)
+            except FileNotFoundError:
+                # Another worker won the race for this task
+                continue
+            return claimed
+        return None
+
+    @staticmethod
+    def _release(claimed: Path) -> None:
+        """Remove a claim, which may already have been requeued as stale."""
+        try:
+            os.unlink(claimed)
+        except FileNotFoundError:
+            logger.warning(f"Claim '{claimed.name}' was requeued before the task finished")
+
+    def run(self, max_tasks: Optional[int] = None) -> int:
+        """
+        Process tasks until the pending queue is empty.
+
+        Args:
+            max_tasks (Optional[int]): Stop after this many tasks.
+
+        Returns:
+            int: Number of tasks processed by this worker.
+        """
+        processed = 0
+        while max_tasks is None or processed < max_tasks:
+            claimed = self.claim_task()
+            if claimed is None:
+                break
+            self.process_task(claimed)
+            processed += 1
+
+            shrink_store(self.store_shrink_percent)
+            rss = current_rss()
+            if self.max_rss_mb is not None and rss is not None \
+                    and rss > self.max_rss_mb * 1048576:
+                logger.info(
+                    f"Worker {self.worker_id} stops at {rss / 1048576:.0f} MB RSS")
+                break
+
+        logger.info(f"Worker {self.worker_id} processed {processed} task(s)")
+        return processed
+
+    def process_task(self, claimed: Path) -> bool:
+        """Redact the page range of a claimed task and record its result."""
+        task = _read_json(claimed)
+        task_id = task["task_id"]
+        parts_dir = self.queue_dir / PARTS_DIR
+        # Working files belong to this claim; the part is published by a rename
+        part_src = parts_dir / f"{claimed.stem}.src.pdf"
+        part_tmp = parts_dir / f"{claimed.stem}.pdf"
+        part_out = parts_dir / f"{task_id}.pdf"
+
+        try:
+            # Extract the page range into its own document
+            with fitz.open(self.job["src_file"]) as src, fitz.open() as part:
+                part.insert_pdf(
+                    src, from_page=task["first_page"], to_page=task["last_page"])
+                part.save(str(part_src))
+
+            redaction_args = dict(self.job["redaction_args"])
+            # The merged document is optimized once by the merge
+            redaction_args.pop("optimize_output", None)
+            if redaction_args.get('predefined_patterns'):
+                redaction_args['predefined_patterns'] = [
+                    PatternType(pattern)
+                    for pattern in redaction_args['predefined_patterns']
+                ]
+            if redaction_args.get('template'):
+                # Template page numbers refer to the whole document
+                redaction_args['template'] = RedactionTemplate.load(
+                    redaction_args['template']).for_pages(task["first_page"], task["last_page"])
+
+            redactor = PDFRedactor(
+                src_file=str(part_src),
+                dest_file=str(part_tmp),
+                overwrite=True,
+                skip_redact_failed_pages=self.job["skip_redact_failed_pages"]
+            )
+            stats = redactor.redact_pdf(**redaction_args)
+            if stats is None:
+                raise RuntimeError("redaction of page range failed")
+            os.replace(part_tmp, part_out)
+
+            _write_json_atomic(self.queue_dir / DONE_DIR / f"{task_id}.json", {
+                **task,
+                "worker_id": self.worker_id,
+                "output": part_out.name,
+                "stats": stats,
+                "peak_rss_mb": round((peak_rss() or 0) / 1048576, 1)
+            })
+            self._release(claimed)
+            logger.debug(
+                f"Task {task_id} (pages {task['first_page']}-{task['last_page']}) done")
+            return True
+
+        except Exception as e:
+            logger.error(f"Task {task_id} failed: {e}")
+            _write_json_atomic(self.queue_dir / FAILED_DIR / f"{task_id}.json", {
+                **task,
+                "worker_id": self.worker_id,
+                "error": str(e)
+            })
+            self._release(claimed)
+            return False
+
+        finally:
+            for path in (part_src, part_tmp):
+                if path.exists():
+                    os.unlink(path)
+
+
+class ShardMerger:
+    """Assemble the partial outputs of a completed job."""
+
+    def __init__(self, queue_dir: str):
+        self.queue_dir = Path(queue_dir)
+
+        job_path = self.queue_dir / JOB_FILE
+        if not job_path.exists():
+            raise FileNotFoundError(f"No job found in '{self.queue_dir}'")
+        self.job = _read_json(job_path)
+
+    def merge(
+        self,
+        dest_file: Optional[str] = None,
+        overwrite: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Concatenate the partial outputs in page order and aggregate stats.
+
+        The source's metadata and outline are carried over; other
+        document-level objects, such as an AcroForm, are not.
+
+        Args:
+            dest_file (Optional[str]): Output path, defaults to the job's destination.
+            overwrite (bool): Whether to overwrite the destination file if it already exists.
+
+        Returns:
+            dict: Aggregated statistics of all tasks.
+        """
+        dest_file = dest_file or self.job["dest_file"]
+        if not overwrite and os.path.exists(dest_file):
+            raise FileExistsError(
+                f"Destination file '{dest_file}' already exists")
+
+        failed = sorted(p.stem for p in (self.queue_dir / FAILED_DIR).glob("*.json"))
+        if failed:
+            raise RuntimeError(f"Job has failed task(s): {failed}")
+
+        results = []
+        for task_id in self.job["tasks"]:
+            done_path = self.queue_dir / DONE_DIR / f"{task_id}.json"
+            if not done_path.exists():
+                raise RuntimeError(f"Job is incomplete, task {task_id} is not done")
+            results.append(_read_json(done_path))
+
+        # Pages removed by the workers, numbered in the source document
+        removed_pages = [
+            result["first_page"] + page_num
+            for result in results
+            for page_num in result["stats"].get("removed_pages", [])
+        ]
+        page_map = PDFRedactor.output_page_map(self.job["page_count"], removed_pages)
+
+        optimize_output = bool(self.job["redaction_args"].get("optimize_output"))
+        optimization = None
+        with fitz.open() as merged:
+            for result in results:
+                with fitz.open(str(self.queue_dir / PARTS_DIR / result["output"])) as part:
+                    merged.insert_pdf(part)
+            # Parts are new documents: carry over what a single-process run keeps.
+            # Outline entries of removed pages lose their target, as with delete_page()
+            with fitz.open(self.job["src_file"]) as src:
+                merged.set_metadata(src.metadata)
+                toc = []
+                for level, title, page in src.get_toc():
+                    output_page = page_map.get(page - 1)
+                    toc.append([level, title, output_page + 1 if output_page is not None else -1])
+                merged.set_toc(toc)
+            subset_result = optimize_document(merged) if optimize_output else None
+            save_result = PDFRedactor.save_compressed(merged, dest_file, optimize=optimize_output)
+            if optimize_output:
+                optimization = combine_results(subset_result, save_result)
+
+        stats = aggregate_stats([result["stats"] for result in results])
+        if removed_pages:
+            stats["removed_pages"] = removed_pages
+        worker_peaks: Dict[str, float] = {}
+        for result in results:
+            if result.get("peak_rss_mb"):
+                worker_peaks[result["worker_id"]] = max(
+                    worker_peaks.get(result["worker_id"], 0.0), result["peak_rss_mb"])
+        if worker_peaks:
+            stats["worker_peak_rss_mb"] = worker_peaks
+        if optimization is not None:
+            stats["optimization"] = optimization
+        _write_json_atomic(self.queue_dir / STATS_FILE, stats)
+        return stats
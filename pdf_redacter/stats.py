@@ -0,0 +1,170 @@
+import hashlib
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+
+def match_fingerprint(text: str) -> str:
+    """Short hash identifying a matched text without keeping the text itself."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class RedactionStats:
+    """
+    Statistics of a redaction run.
+
+    Per-pattern counters are integer-indexed by pattern id instead of being
+    keyed by pattern string; ``to_dict()`` provides the dictionary layout
+    returned by ``PDFRedactor.redact_pdf``.
+    """
+
+    __slots__ = (
+        "total_matches",
+        "pages_processed",
+        "pages_modified",
+        "pages_failed_redaction",
+        "patterns",
+        "pattern_matches",
+        "pattern_timings",
+        "stage_times",
+        "engine_pages",
+        "spans_searched",
+        "annotations_requested",
+        "annotations_applied",
+        "timed_out_pages",
+        "failed_page_rects",
+        "rasterized_pages",
+        "removed_pages",
+        "form_xobjects",
+        "template_pages",
+        "template_rects",
+        "prefilter",
+        "optimization",
+        "text_index",
+        "match_fingerprints",
+        "verification"
+    )
+
+    def __init__(self, patterns: Sequence[str]):
+        self.total_matches = 0
+        self.pages_processed = 0
+        self.pages_modified = 0
+        self.pages_failed_redaction = 0
+        self.patterns = patterns
+        self.pattern_matches = array('q', bytes(8 * len(patterns)))
+        self.pattern_timings: Optional[List[Dict[str, Any]]] = None
+        self.stage_times: Dict[str, float] = {}
+        self.engine_pages: Dict[str, int] = {}
+        self.spans_searched = 0
+        self.annotations_requested = 0
+        self.annotations_applied = 0
+        self.timed_out_pages: List[int] = []
+        # Rects of pages where applying the redactions failed, for the raster fallback
+        self.failed_page_rects: Dict[int, List[Tuple[float, float, float, float]]] = {}
+        self.rasterized_pages: List[int] = []
+        # Pages removed from the output because redacting them failed
+        self.removed_pages: List[int] = []
+        # Form XObjects redacted, references to them and references reusing an earlier result
+        self.form_xobjects: Dict[str, int] = {}
+        self.template_pages = 0
+        self.template_rects = 0
+        self.prefilter: Optional[List[Dict[str, Any]]] = None
+        self.optimization: Optional[Dict[str, Any]] = None
+        self.text_index: Optional[Dict[str, int]] = None
+        # Fingerprints of matched texts by page, only collected when set to a dict
+        self.match_fingerprints: Optional[Dict[int, Set[str]]] = None
+        self.verification: Optional[Dict[str, Any]] = None
+
+    @property
+    def patterns_used(self) -> int:
+        return len(self.patterns)
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        """Accumulate wall time spent in a redaction stage."""
+        self.stage_times[stage] = self.stage_times.get(stage, 0.0) + seconds
+
+    def record_match(self, pattern_id: int) -> None:
+        """Count a single match."""
+        self.total_matches += 1
+        self.pattern_matches[pattern_id] += 1
+
+    def record_fingerprint(self, page_num: int, text: str) -> None:
+        """Remember a matched text of a page for verification, if enabled."""
+        if self.match_fingerprints is not None:
+            self.match_fingerprints.setdefault(page_num, set()).add(match_fingerprint(text))
+
+    def merge(self, other: 'RedactionStats') -> None:
+        """Add the counters of stats collected for the same patterns elsewhere."""
+        self.total_matches += other.total_matches
+        self.pages_processed += other.pages_processed
+        self.pages_modified += other.pages_modified
+        self.pages_failed_redaction += other.pages_failed_redaction
+        self.spans_searched += other.spans_searched
+        self.annotations_requested += other.annotations_requested
+        self.annotations_applied += other.annotations_applied
+        self.timed_out_pages.extend(other.timed_out_pages)
+        self.failed_page_rects.update(other.failed_page_rects)
+        self.rasterized_pages.extend(other.rasterized_pages)
+        self.removed_pages.extend(other.removed_pages)
+        self.template_pages += other.template_pages
+        self.template_rects += other.template_rects
+        for key, count in other.form_xobjects.items():
+            self.form_xobjects[key] = self.form_xobjects.get(key, 0) + count
+        for pattern_id, count in enumerate(other.pattern_matches):
+            self.pattern_matches[pattern_id] += count
+        for stage, seconds in other.stage_times.items():
+            self.add_stage_time(stage, seconds)
+        if self.match_fingerprints is not None and other.match_fingerprints:
+            for page_num, fingerprints in other.match_fingerprints.items():
+                self.match_fingerprints.setdefault(page_num, set()).update(fingerprints)
+
+    def matches_by_pattern(self) -> Dict[str, int]:
+        """Match counts keyed by pattern string, for patterns that matched."""
+        by_pattern: Dict[str, int] = {}
+        for pattern_id, count in enumerate(self.pattern_matches):
+            if count:
+                pattern = self.patterns[pattern_id]
+                by_pattern[pattern] = by_pattern.get(pattern, 0) + count
+        return by_pattern
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to the dictionary returned by redact_pdf."""
+        stats = {
+            "total_matches": self.total_matches,
+            "pages_processed": self.pages_processed,
+            "pages_modified": self.pages_modified,
+            "pages_failed_redaction": self.pages_failed_redaction,
+            "patterns_used": self.patterns_used,
+            "matches_by_pattern": self.matches_by_pattern()
+        }
+        if self.stage_times:
+            stats["stage_times"] = dict(self.stage_times)
+        if self.engine_pages:
+            stats["engine_pages"] = dict(self.engine_pages)
+        if self.spans_searched:
+            stats["spans_searched"] = self.spans_searched
+        if self.annotations_requested:
+            stats["annotations_requested"] = self.annotations_requested
+            stats["annotations_applied"] = self.annotations_applied
+        if self.timed_out_pages:
+            stats["pages_timed_out"] = len(self.timed_out_pages)
+            stats["timed_out_pages"] = sorted(self.timed_out_pages)
+        if self.rasterized_pages:
+            stats["rasterized_pages"] = sorted(self.rasterized_pages)
+        if self.removed_pages:
+            stats["removed_pages"] = sorted(self.removed_pages)
+        if self.form_xobjects:
+            stats["form_xobjects"] = dict(self.form_xobjects)
+        if self.template_pages:
+            stats["template_pages"] = self.template_pages
+            stats["template_rects"] = self.template_rects
+        if self.prefilter:
+            stats["prefilter"] = self.prefilter
+        if self.optimization is not None:
+            stats["optimization"] = self.optimization
+        if self.text_index is not None:
+            stats["text_index"] = self.text_index
+        if self.verification is not None:
+            stats["verification"] = self.verification
+        if self.pattern_timings is not None:
+            stats["pattern_timings"] = self.pattern_timings
+        return stats
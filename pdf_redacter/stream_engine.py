@@ -0,0 +1,569 @@
+import bisect
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import fitz  # PyMuPDF
+import pikepdf
+
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.stats import RedactionStats
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Standard 14 text fonts (without Symbol/ZapfDingbats) and their fitz names
+STANDARD_FONTS: Dict[str, str] = {
+    "Helvetica": "helv",
+    "Helvetica-Bold": "hebo",
+    "Helvetica-Oblique": "heit",
+    "Helvetica-BoldOblique": "hebi",
+    "Times-Roman": "tiro",
+    "Times-Bold": "tibo",
+    "Times-Italic": "tiit",
+    "Times-BoldItalic": "tibi",
+    "Courier": "cour",
+    "Courier-Bold": "cobo",
+    "Courier-Oblique": "coit",
+    "Courier-BoldOblique": "cobi",
+}
+
+TEXT_SHOWING_OPERATORS = ("Tj", "TJ", "'", '"')
+
+# Operators starting a new text line; the quote operators move to the next line first
+LINE_OPERATORS = ("BT", "Td", "TD", "Tm", "T*", "'", '"')
+
+
+class UnsupportedContent(Exception):
+    """A page uses a construct the content-stream engine does not handle."""
+
+
+def _decode_standard(data: bytes) -> str:
+    """Decode StandardEncoding for the printable ASCII range."""
+    chars = []
+    for code in data:
+        if code == 0x27:
+            chars.append("’")
+        elif code == 0x60:
+            chars.append("‘")
+        elif 0x20 <= code <= 0x7E or code in (0x09, 0x0A, 0x0D):
+            chars.append(chr(code))
+        else:
+            raise UnsupportedContent(
+                f"code {code:#x} outside the supported StandardEncoding range")
+    return "".join(chars)
+
+
+def _encode_standard(text: str) -> bytes:
+    codes = bytearray()
+    for char in text:
+        if char == "’":
+            codes.append(0x27)
+        elif char == "‘":
+            codes.append(0x60)
+        elif char not in "'`" and 0x20 <= ord(char) <= 0x7E:
+            codes.append(ord(char))
+        else:
+            raise UnsupportedContent(
+                f"'{char}' cannot be encoded in StandardEncoding")
+    return bytes(codes)
+
+
+class SimpleFont:
+    """Decoding and glyph widths of a non-embedded standard 14 font."""
+
+    CODECS = {"/WinAnsiEncoding": "cp1252", "/MacRomanEncoding": "mac_roman"}
+
+    def __init__(self, font: pikepdf.Dictionary):
+        base_font = str(font.get("/BaseFont", ""))[1:]
+        if font.get("/Subtype") != pikepdf.Name.Type1 or base_font not in STANDARD_FONTS:
+            raise UnsupportedContent(
+                f"font '{base_font}' is not a standard 14 text font")
+
+        descriptor = font.get("/FontDescriptor")
+        if descriptor is not None and any(
+                key in descriptor for key in ("/FontFile", "/FontFile2", "/FontFile3")):
+            raise UnsupportedContent(f"font '{base_font}' is embedded")
+
+        encoding = font.get("/Encoding")
+        if encoding is None or encoding == pikepdf.Name.StandardEncoding:
+            self.codec = None
+        elif isinstance(encoding, pikepdf.Name) and str(encoding) in self.CODECS:
+            self.codec = self.CODECS[str(encoding)]
+        else:
+            raise UnsupportedContent(
+                f"font '{base_font}' has an unsupported encoding")
+
+        # Explicit /Widths take precedence over the built-in metrics
+        self.first_char = int(font.get("/FirstChar", 0))
+        self.widths = [float(w) for w in font.get("/Widths", [])]
+        self.metrics = fitz.Font(STANDARD_FONTS[base_font])
+        self._width_cache: Dict[int, float] = {}
+
+    def decode(self, data: bytes) -> str:
+        if self.codec is None:
+            return _decode_standard(data)
+        try:
+            text = data.decode(self.codec)
+        except UnicodeDecodeError as e:
+            raise UnsupportedContent(f"undecodable text: {e}")
+        if len(text) != len(data):
+            raise UnsupportedContent("multi-character glyph mapping")
+        return text
+
+    def encode(self, text: str) -> bytes:
+        if self.codec is None:
+            return _encode_standard(text)
+        try:
+            return text.encode(self.codec)
+        except UnicodeEncodeError as e:
+            raise UnsupportedContent(f"replacement cannot be encoded: {e}")
+
+    def width(self, code: int) -> float:
+        """Glyph width in thousandths of text space units."""
+        width = self._width_cache.get(code)
+        if width is None:
+            index = code - self.first_char
+            if self.widths and 0 <= index < len(self.widths):
+                width = self.widths[index]
+            else:
+                width = self.metrics.text_length(
+                    self.decode(bytes([code])), fontsize=1000)
+            self._width_cache[code] = width
+        return width
+
+    def text_width(self, data: bytes) -> float:
+        return sum(self.width(code) for code in data)
+
+
+@dataclass
+class TextRun:
+    """The glyphs shown by one text-showing operator."""
+    instruction_index: int
+    font: SimpleFont
+    elements: List[Any]
+    text: str
+    # Per character: (index into elements, byte offset in that string)
+    positions: List[Tuple[int, int]] = field(default_factory=list)
+    # Matched (start, end, show replacement) character ranges
+    ranges: List[Tuple[int, int, bool]] = field(default_factory=list)
+    # Text line of the run: runs shown without repositioning share a line
+    line: int = 0
+
+
+class ContentStreamRedactor:
+    """
+    Redact text by rewriting page content streams with pikepdf.
+
+    Each text-showing operator is decoded through its font encoding and the
+    page text is matched with the configured patterns; operators shown
+    without repositioning in between form one line, so a match split over
+    several of them is found. Matched glyphs are replaced in place by the
+    replacement text, with a kerning adjustment that keeps the following
+    glyphs where they were. Unlike the fitz path no white box is drawn; only
+    the glyphs change.
+
+    Form XObjects (e.g. a letterhead reused on every page) are matched on
+    their own text and rewritten once; the result is cached by object, so
+    every further page drawing the same form only reuses it.
+
+    Only non-embedded standard 14 fonts with a standard encoding are
+    supported. Pages with other fonts, forms without their own resources,
+    non-zero character or word spacing, matches spanning several lines, and
+    matches that only appear when the lines are joined are reported as
+    unsupported and left untouched for the fitz path.
+    """
+
+    def __init__(self, pattern_matcher: EnhancedPatternMatcher, replacement: str):
+        self.pattern_matcher = pattern_matcher
+        self.replacement = replacement
+        self._fonts: Dict[Tuple[int, int], SimpleFont] = {}
+        # Texts matched in every form already handled, or why it is unsupported
+        self._forms: Dict[Tuple[int, int], Union[List[str], UnsupportedContent]] = {}
+
+    def redact_document(self, pdf: pikepdf.Pdf, stats: RedactionStats) -> List[int]:
+        """
+        Redact all supported pages of an open document in place.
+
+        Returns:
+            List[int]: Page numbers that must be redacted by the fitz path.
+        """
+        fallback_pages = []
+        for page_num, page in enumerate(pdf.pages):
+            try:
+                page_matches = self.redact_page(pdf, page, stats, page_num)
+            except UnsupportedContent as e:
+                logger.debug(f"Page {page_num}: unsupported by stream engine ({e})")
+                fallback_pages.append(page_num)
+                continue
+
+            stats.pages_processed += 1
+            if page_matches > 0:
+                stats.pages_modified += 1
+
+        stats.engine_pages["stream"] = len(pdf.pages) - len(fallback_pages)
+        stats.engine_pages["fitz"] = len(fallback_pages)
+        return fallback_pages
+
+    def redact_page(
+        self,
+        pdf: pikepdf.Pdf,
+        page: pikepdf.Page,
+        stats: RedactionStats,
+        page_num: Optional[int] = None
+    ) -> int:
+        """
+        Redact one page and the forms it draws.
+
+        The page is not modified if UnsupportedContent is raised; forms it
+        draws that were already handled keep their redactions.
+
+        Returns:
+            int: Number of matches on the page, including those in its forms.
+        """
+        instructions = list(pikepdf.parse_content_stream(page))
+        resources = page.obj.get("/Resources", pikepdf.Dictionary())
+        forms: List[pikepdf.Object] = []
+        runs = self._collect_runs(instructions, resources, forms)
+        page_text, spans = self._match_runs(runs)
+
+        form_texts: List[str] = []
+        for form in forms:
+            form_texts.extend(self._redact_form(pdf, form, stats))
+        if page_num is not None:
+            for text in form_texts:
+                stats.record_fingerprint(page_num, text)
+
+        if spans:
+            self._record_spans(page_text, spans, stats, page_num)
+            page.obj.Contents = pdf.make_stream(self._rewrite_runs(instructions, runs))
+        return len(spans) + len(form_texts)
+
+    def redact_shared_forms(self, pdf: pikepdf.Pdf, stats: RedactionStats) -> int:
+        """
+        Redact the Form XObjects drawn by more than one page, once each.
+
+        Used before the fitz path, which would otherwise redact the matches
+        of such forms again on every page. The fitz path still extracts and
+        searches every page, form text included. Unsupported forms are left
+        for the fitz path.
+
+        Returns:
+            int: Number of shared forms redacted.
+        """
+        pages_by_form: Dict[Tuple[int, int], List[int]] = {}
+        forms: Dict[Tuple[int, int], pikepdf.Object] = {}
+        for page_num, page in enumerate(pdf.pages):
+            xobjects = page.obj.get("/Resources", pikepdf.Dictionary()).get(
+                "/XObject", pikepdf.Dictionary())
+            for xobject in xobjects.values():
+                if xobject.get("/Subtype") == pikepdf.Name.Form:
+                    forms[xobject.objgen] = xobject
+                    pages_by_form.setdefault(xobject.objgen, []).append(page_num)
+
+        redacted = 0
+        for key, page_nums in pages_by_form.items():
+            if len(page_nums) < 2:
+                continue
+            try:
+                texts = self._redact_form(pdf, forms[key], stats)
+            except UnsupportedContent as e:
+                logger.debug(f"Shared form {key}: unsupported by stream engine ({e})")
+                continue
+            redacted += 1
+            for page_num in page_nums:
+                for text in texts:
+                    stats.record_fingerprint(page_num, text)
+        return redacted
+
+    def _redact_form(
+        self,
+        pdf: pikepdf.Pdf,
+        form: pikepdf.Object,
+        stats: RedactionStats
+    ) -> List[str]:
+        """
+        Redact a Form XObject and the forms it draws, or reuse the result of
+        an earlier call for the same form.
+
+        Returns:
+            List[str]: The texts matched in the form.
+        """
+        key = form.objgen
+        stats.form_xobjects["references"] = stats.form_xobjects.get("references", 0) + 1
+        cached = self._forms.get(key)
+        if isinstance(cached, UnsupportedContent):
+            raise cached
+        if cached is not None:
+            stats.form_xobjects["reused"] = stats.form_xobjects.get("reused", 0) + 1
+            return cached
+
+        try:
+            resources = form.get("/Resources")
+            if resources is None:
+                # Inherited resources differ between the pages drawing the form
+                raise UnsupportedContent("Form XObject without resources")
+            instructions = list(pikepdf.parse_content_stream(form))
+            nested: List[pikepdf.Object] = []
+            runs = self._collect_runs(instructions, resources, nested)
+            form_text, spans = self._match_runs(runs)
+
+            texts: List[str] = []
+            for nested_form in nested:
+                texts.extend(self._redact_form(pdf, nested_form, stats))
+        except UnsupportedContent as e:
+            self._forms[key] = e
+            raise
+
+        if spans:
+            self._record_spans(form_text, spans, stats, None)
+            texts.extend(form_text[start:end] for start, end, _ in spans)
+            form.write(self._rewrite_runs(instructions, runs))
+        stats.form_xobjects["redacted"] = stats.form_xobjects.get("redacted", 0) + 1
+        self._forms[key] = texts
+        return texts
+
+    def _match_runs(self, runs: List[TextRun]) -> Tuple[str, List[Tuple[int, int, int]]]:
+        """
+        Match the text of the runs, one line per text line, and assign every
+        span to the runs it covers. The replacement is shown in the first one.
+
+        Returns:
+            tuple: The text and the spans matched in it.
+        """
+        run_starts = []
+        parts = []
+        offset = 0
+        for index, run in enumerate(runs):
+            if index and run.line != runs[index - 1].line:
+                parts.append("\n")
+                offset += 1
+            run_starts.append(offset)
+            parts.append(run.text)
+            offset += len(run.text)
+        text = "".join(parts)
+        if not runs:
+            return text, []
+
+        spans = list(self.pattern_matcher.iter_spans(text))
+        for start, end, _ in spans:
+            lines = set()
+            run_index = max(bisect.bisect_right(run_starts, start) - 1, 0)
+            while run_index < len(runs) and run_starts[run_index] < end:
+                run = runs[run_index]
+                run_start = run_starts[run_index]
+                piece_start = max(start, run_start)
+                piece_end = min(end, run_start + len(run.text))
+                if piece_start < piece_end:
+                    run.ranges.append((piece_start - run_start, piece_end - run_start, not lines))
+                    lines.add(run.line)
+                run_index += 1
+            if len(lines) > 1:
+                raise UnsupportedContent("match spans several text lines")
+
+        self._check_joined_lines(runs)
+        return text, spans
+
+    def _check_joined_lines(self, runs: List[TextRun]) -> None:
+        """
+        Match the text of all runs joined without line breaks, as a line
+        positioned right after another is extracted, and reject the content
+        if that finds text the matches per line do not cover.
+        """
+        if len({run.line for run in runs}) < 2:
+            return
+        joined = "".join(run.text for run in runs)
+        covered = bytearray(len(joined))
+        offset = 0
+        for run in runs:
+            for start, end, _ in run.ranges:
+                covered[offset + start:offset + end] = b"\x01" * (end - start)
+            offset += len(run.text)
+        for start, end, _ in self.pattern_matcher.iter_spans(joined):
+            if not all(covered[start:end]):
+                raise UnsupportedContent("match only found with the text lines joined")
+
+    @staticmethod
+    def _record_spans(
+        text: str,
+        spans: List[Tuple[int, int, int]],
+        stats: RedactionStats,
+        page_num: Optional[int]
+    ) -> None:
+        for start, end, pattern_id in spans:
+            stats.record_match(pattern_id)
+            if page_num is not None:
+                stats.record_fingerprint(page_num, text[start:end])
+
+    def _rewrite_runs(self, instructions: List[Any], runs: List[TextRun]) -> bytes:
+        """Content stream with the matched glyphs of every run replaced."""
+        rewritten: Dict[int, List[pikepdf.ContentStreamInstruction]] = {}
+        for run in runs:
+            if run.ranges:
+                rewritten[run.instruction_index] = self._rewrite_run(
+                    run, instructions[run.instruction_index])
+
+        new_instructions = []
+        for index, instruction in enumerate(instructions):
+            new_instructions.extend(rewritten.get(index, [instruction]))
+        return pikepdf.unparse_content_stream(new_instructions)
+
+    def _font(self, font_obj: pikepdf.Object) -> SimpleFont:
+        key = font_obj.objgen
+        if key == (0, 0):
+            return SimpleFont(font_obj)
+        if key not in self._fonts:
+            self._fonts[key] = SimpleFont(font_obj)
+        return self._fonts[key]
+
+    def _collect_runs(
+        self,
+        instructions: List[Any],
+        resources: pikepdf.Dictionary,
+        forms: List[pikepdf.Object]
+    ) -> List[TextRun]:
+        """
+        Decode every text-showing operator, rejecting unsupported constructs.
+        The Form XObjects drawn are appended to forms.
+        """
+        fonts = resources.get("/Font", pikepdf.Dictionary())
+        xobjects = resources.get("/XObject", pikepdf.Dictionary())
+        font: Optional[SimpleFont] = None
+        font_stack: List[Optional[SimpleFont]] = []
+        line = 0
+        runs = []
+
+        for index, instruction in enumerate(instructions):
+            if isinstance(instruction, pikepdf.ContentStreamInlineImage):
+                continue
+            operator = str(instruction.operator)
+            operands = instruction.operands
+            if operator in LINE_OPERATORS:
+                line += 1
+
+            if operator == "q":
+                font_stack.append(font)
+            elif operator == "Q":
+                font = font_stack.pop() if font_stack else None
+            elif operator == "Tf":
+                font_obj = fonts.get(str(operands[0]))
+                if font_obj is None:
+                    raise UnsupportedContent(f"font {operands[0]} not in resources")
+                font = self._font(font_obj)
+            elif operator in ("Tc", "Tw"):
+                if float(operands[0]) != 0:
+                    raise UnsupportedContent(f"non-zero {operator}")
+            elif operator == "Do":
+                xobject = xobjects.get(str(operands[0]))
+                if xobject is None:
+                    raise UnsupportedContent(f"XObject {operands[0]} not in resources")
+                if xobject.get("/Subtype") == pikepdf.Name.Form:
+                    forms.append(xobject)
+                elif xobject.get("/Subtype") != pikepdf.Name.Image:
+                    raise UnsupportedContent("unknown XObject type")
+            elif operator in TEXT_SHOWING_OPERATORS:
+                if font is None:
+                    raise UnsupportedContent("text shown without a font")
+                if operator == '"' and (float(operands[0]) != 0 or float(operands[1]) != 0):
+                    raise UnsupportedContent('non-zero spacing in " operator')
+                elements = list(operands[0]) if operator == "TJ" else [operands[-1]]
+                runs.append(self._decode_run(index, font, elements, line))
+
+        return runs
+
+    @staticmethod
+    def _decode_run(index: int, font: SimpleFont, elements: List[Any], line: int) -> TextRun:
+        text_parts = []
+        positions = []
+        for element_index, element in enumerate(elements):
+            if isinstance(element, pikepdf.String):
+                data = bytes(element)
+                text_parts.append(font.decode(data))
+                positions.extend((element_index, offset)
+                                 for offset in range(len(data)))
+            elif not isinstance(element, (int, float, Decimal)):
+                raise UnsupportedContent("unexpected TJ element")
+        return TextRun(index, font, elements, "".join(text_parts), positions, line=line)
+
+    def _rewrite_run(
+        self,
+        run: TextRun,
+        instruction: pikepdf.ContentStreamInstruction
+    ) -> List[pikepdf.ContentStreamInstruction]:
+        """Build the instructions that show the run with matched glyphs replaced."""
+        font = run.font
+        replacement = font.encode(self.replacement)
+        replacement_width = font.text_width(replacement)
+
+        # Merge overlapping match ranges; the part of a match continued from
+        # an earlier run does not repeat the replacement
+        ranges: List[List[Any]] = []
+        for start, end, show in sorted(run.ranges):
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], end)
+                ranges[-1][2] = ranges[-1][2] or show
+            else:
+                ranges.append([start, end, show])
+
+        # Per character: 0 kept, 1 removed, 2 removed and followed by the replacement
+        redacted = bytearray(len(run.positions))
+        for start, end, show in ranges:
+            redacted[start:end] = (b"\x02" if show else b"\x01") * (end - start)
+
+        new_elements: List[Any] = []
+        pending = bytearray()
+
+        def flush():
+            if pending:
+                new_elements.append(pikepdf.String(bytes(pending)))
+                pending.clear()
+
+        char_index = 0
+        removed_width = 0.0
+        for element in run.elements:
+            if not isinstance(element, pikepdf.String):
+                # Kerning between two redacted glyphs is folded into the adjustment
+                inside = 0 < char_index < len(redacted) and \
+                    redacted[char_index - 1] and redacted[char_index]
+                if inside:
+                    removed_width -= float(element)
+                else:
+                    flush()
+                    new_elements.append(element)
+                continue
+
+            for code in bytes(element):
+                if not redacted[char_index]:
+                    pending.append(code)
+                else:
+                    removed_width += font.width(code)
+                    last = char_index + 1 == len(redacted) or not redacted[char_index + 1]
+                    if last:
+                        flush()
+                        shown_width = 0.0
+                        if replacement and redacted[char_index] == 2:
+                            new_elements.append(pikepdf.String(replacement))
+                            shown_width = replacement_width
+                        # Advance exactly as far as the removed glyphs did
+                        adjustment = round(shown_width - removed_width, 3)
+                        if adjustment:
+                            new_elements.append(Decimal(str(adjustment)))
+                        removed_width = 0.0
+                char_index += 1
+        flush()
+
+        show = pikepdf.ContentStreamInstruction(
+            [pikepdf.Array(new_elements)], pikepdf.Operator("TJ"))
+        operator = str(instruction.operator)
+        if operator == "'":
+            return [pikepdf.ContentStreamInstruction([], pikepdf.Operator("T*")), show]
+        if operator == '"':
+            return [
+                pikepdf.ContentStreamInstruction([0], pikepdf.Operator("Tw")),
+                pikepdf.ContentStreamInstruction([0], pikepdf.Operator("Tc")),
+                pikepdf.ContentStreamInstruction([], pikepdf.Operator("T*")),
+                show
+            ]
+        return [show]
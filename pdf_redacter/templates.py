@@ -0,0 +1,150 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import fitz  # PyMuPDF
+import yaml
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Points by which a page size may differ from a size signature and still match
+DEFAULT_SIZE_TOLERANCE = 1.0
+
+Rect = Tuple[float, float, float, float]
+
+
+def _parse_rects(rects: Any, where: str) -> List[Rect]:
+    parsed = []
+    for rect in rects or []:
+        if len(rect) != 4:
+            raise ValueError(f"Rect {rect} of {where} must be [x0, y0, x1, y1]")
+        x0, y0, x1, y1 = (float(value) for value in rect)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"Rect {rect} of {where} is empty")
+        parsed.append((x0, y0, x1, y1))
+    return parsed
+
+
+@dataclass
+class RedactionTemplate:
+    """
+    Fixed redaction rects for fixed-layout documents such as printed forms.
+
+    Rects are given in points, in the coordinates of ``Page.search_for``
+    (origin at the top left of the unrotated page). They are looked up by
+    page number first, then by page-size signature; pages matching neither
+    are not covered by the template.
+
+    Example::
+
+        pages:
+          1: [[72, 100, 300, 118]]        # first page
+        page_sizes:
+          - size: [612, 792]              # every other Letter page
+            rects: [[72, 40, 540, 60]]
+    """
+    # Zero-based page number -> rects
+    page_rects: Dict[int, List[Rect]] = field(default_factory=dict)
+    # (width, height) signature -> rects
+    size_rects: List[Tuple[Tuple[float, float], List[Rect]]] = field(default_factory=list)
+    size_tolerance: float = DEFAULT_SIZE_TOLERANCE
+
+    @classmethod
+    def from_dict(cls, template_dict: Dict[str, Any]) -> 'RedactionTemplate':
+        """
+        Create a template from a dictionary with ``pages`` (1-based page
+        number -> rects) and/or ``page_sizes`` (list of size and rects).
+        """
+        page_rects = {}
+        for page, rects in (template_dict.get('pages') or {}).items():
+            page_num = int(page)
+            if page_num < 1:
+                raise ValueError(f"Template page numbers start at 1, got {page}")
+            page_rects[page_num - 1] = _parse_rects(rects, f"page {page}")
+
+        size_rects = []
+        for entry in template_dict.get('page_sizes') or []:
+            size = entry.get('size')
+            if not size or len(size) != 2:
+                raise ValueError(f"Page size entry {entry} needs a size of [width, height]")
+            size_rects.append((
+                (float(size[0]), float(size[1])),
+                _parse_rects(entry.get('rects'), f"page size {size}")))
+
+        if not page_rects and not size_rects:
+            raise ValueError("A template needs 'pages' or 'page_sizes' with rects")
+
+        return cls(
+            page_rects=page_rects,
+            size_rects=size_rects,
+            size_tolerance=float(template_dict.get('size_tolerance', DEFAULT_SIZE_TOLERANCE))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The dictionary from_dict() creates this template from."""
+        return {
+            'pages': {
+                str(page_num + 1): [list(rect) for rect in rects]
+                for page_num, rects in sorted(self.page_rects.items())
+            },
+            'page_sizes': [
+                {'size': list(size), 'rects': [list(rect) for rect in rects]}
+                for size, rects in self.size_rects
+            ],
+            'size_tolerance': self.size_tolerance
+        }
+
+    def for_pages(self, first_page: int, last_page: int) -> 'RedactionTemplate':
+        """
+        The template of a document made of pages first_page to last_page
+        (zero-based, inclusive) of the original, with page rects renumbered.
+        """
+        return RedactionTemplate(
+            page_rects={
+                page_num - first_page: rects
+                for page_num, rects in self.page_rects.items()
+                if first_page <= page_num <= last_page
+            },
+            size_rects=list(self.size_rects),
+            size_tolerance=self.size_tolerance
+        )
+
+    @classmethod
+    def load(cls, template: Union[str, Dict[str, Any]]) -> 'RedactionTemplate':
+        """Create a template from a dictionary or a YAML/JSON file."""
+        if isinstance(template, dict):
+            return cls.from_dict(template)
+
+        path = Path(template)
+        if not path.exists():
+            raise FileNotFoundError(f"Template file not found: {template}")
+        with open(path, 'r') as f:
+            if path.suffix.lower() in ['.yml', '.yaml']:
+                template_dict = yaml.safe_load(f)
+            elif path.suffix.lower() == '.json':
+                template_dict = json.load(f)
+            else:
+                raise ValueError(f"Unsupported template format: {path.suffix}")
+        return cls.from_dict(template_dict or {})
+
+    def rects_for(self, page: fitz.Page) -> Optional[List[fitz.Rect]]:
+        """
+        The rects of a page, or None if the template does not cover it.
+
+        The page size signature is the size of the unrotated crop box.
+        """
+        rects = self.page_rects.get(page.number)
+        if rects is None:
+            width, height = page.cropbox.width, page.cropbox.height
+            for (size_width, size_height), size_rects in self.size_rects:
+                if abs(width - size_width) <= self.size_tolerance \
+                        and abs(height - size_height) <= self.size_tolerance:
+                    rects = size_rects
+                    break
+        if rects is None:
+            return None
+        return [fitz.Rect(rect) for rect in rects]
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.stats import RedactionStats
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Bumped when the stored layout, the text extraction or the content hash changes
+INDEX_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    doc_key TEXT NOT NULL,
+    page_num INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (doc_key, page_num)
+);
+CREATE TABLE IF NOT EXISTS spans (
+    content_hash TEXT NOT NULL,
+    pattern_key TEXT NOT NULL,
+    spans TEXT NOT NULL,
+    PRIMARY KEY (content_hash, pattern_key)
+);
+"""
+
+
+# Indirect references in an object's source, and the back-references to
+# parents, which would pull in the rest of the document
+_REFERENCE = re.compile(r"(\d+) \d+ R\b")
+_BACK_REFERENCE = re.compile(r"/(?:Parent|P)\s*\d+ \d+ R\b")
+
+
+def _page_resources(doc: fitz.Document, page: fitz.Page) -> str:
+    """The source of a page's resources, inherited from the page tree if needed."""
+    xref = page.xref
+    while xref:
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind != "null":
+            return value
+        kind, value = doc.xref_get_key(xref, "Parent")
+        xref = int(value.split()[0]) if kind == "xref" else 0
+    return ""
+
+
+def page_content_hash(page: fitz.Page) -> str:
+    """
+    Hash what a page's text is extracted from, without extracting it.
+
+    Covers the page dictionary (boxes, rotation), the raw, still compressed
+    content streams and everything the page resources reference: Form
+    XObjects and their own resources, fonts, font programs and ToUnicode
+    maps. Image data is left out, only the image dictionaries are hashed.
+    This is still cheap compared to get_text.
+    """
+    doc = page.parent
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{fitz.VersionBind}".encode())
+    digest.update(doc.xref_object(page.xref, compressed=True).encode())
+    for xref in page.get_contents():
+        digest.update(doc.xref_stream_raw(xref) or b"")
+
+    resources = _page_resources(doc, page)
+    digest.update(resources.encode())
+    pending = [int(ref) for ref in _REFERENCE.findall(resources)]
+    seen = set(pending)
+    while pending:
+        xref = pending.pop()
+        source = _BACK_REFERENCE.sub("", doc.xref_object(xref, compressed=True))
+        digest.update(f"{xref}:{source}".encode())
+        if doc.xref_is_stream(xref) and doc.xref_get_key(xref, "Subtype") != ("name", "/Image"):
+            digest.update(doc.xref_stream_raw(xref) or b"")
+        for ref in _REFERENCE.findall(source):
+            if int(ref) not in seen:
+                seen.add(int(ref))
+                pending.append(int(ref))
+    return digest.hexdigest()
+
+
+class TextIndex:
+    """
+    SQLite-backed index of extracted page text and per-pattern match spans.
+
+    Pages are stored per document with a content hash and their text. A page whose content hash is unchanged is not extracted again,
+    and patterns already evaluated against the same content are not run
+    again either: only new patterns are matched against the cached text.
+    Spans are keyed by content hash, which covers the resources a page
+    draws, so identical pages of different documents share them.
+    """
+
+    def __init__(self, index_file: str):
+        """
+        Args:
+            index_file (str): The SQLite database file, created if missing.
+        """
+        self.index_file = index_file
+        self._conn = sqlite3.connect(index_file)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(pages)")]
+        if "words" in columns:
+            # Indexes written with word bboxes: only the text is cached now
+            self._conn.execute("DROP TABLE pages")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self.pages_cached = 0
+        self.pages_extracted = 0
+        self.patterns_cached = 0
+        self.patterns_evaluated = 0
+
+    def __enter__(self) -> 'TextIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def document_key(src_file: str) -> str:
+        return os.path.abspath(src_file)
+
+    def page_text(self, doc_key: str, page: fitz.Page) -> Tuple[str, str]:
+        """
+        Get the text of a page, extracting and storing it only if its content changed.
+
+        Returns:
+            tuple: The page text and its content hash.
+        """
+        content_hash = page_content_hash(page)
+        row = self._conn.execute(
+            "SELECT content_hash, text FROM pages WHERE doc_key = ? AND page_num = ?",
+            (doc_key, page.number)
+        ).fetchone()
+        if row is not None and row[0] == content_hash:
+            self.pages_cached += 1
+            return row[1], content_hash
+
+        text = page.get_text()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            (doc_key, page.number, content_hash, text)
+        )
+        self.pages_extracted += 1
+        return text, content_hash
+
+    def page_spans(
+        self,
+        doc_key: str,
+        page: fitz.Page,
+        pattern_matcher: EnhancedPatternMatcher
+    ) -> Tuple[str, List[Tuple[int, int, int]]]:
+        """
+        Get the text of a page and the (start, end, pattern_id) spans of every pattern.
+
+        Spans are ordered like EnhancedPatternMatcher.iter_spans(); only
+        patterns without stored spans for the page content are evaluated.
+        """
+        text, content_hash = self.page_text(doc_key, page)
+
+        keys = [pattern_matcher.pattern_key(pattern_id)
+                for pattern_id in range(len(pattern_matcher.patterns))]
+        stored: Dict[str, List[List[int]]] = {}
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset:offset + 500]
+            rows = self._conn.execute(
+                f"SELECT pattern_key, spans FROM spans WHERE content_hash = ? "
+                f"AND pattern_key IN ({','.join('?' * len(chunk))})",
+                (content_hash, *chunk)
+            ).fetchall()
+            stored.update((key, json.loads(spans)) for key, spans in rows)
+
+        spans: List[Tuple[int, int, int]] = []
+        missing = []
+        for pattern_id, key in enumerate(keys):
+            if key in stored:
+                spans.extend((start, end, pattern_id) for start, end in stored[key])
+            else:
+                missing.append(pattern_id)
+        self.patterns_cached += len(keys) - len(missing)
+        self.patterns_evaluated += len(missing)
+
+        if missing:
+            found: Dict[int, List[List[int]]] = {pattern_id: [] for pattern_id in missing}
+            for start, end, pattern_id in pattern_matcher.iter_spans(text, missing):
+                found[pattern_id].append([start, end])
+                spans.append((start, end, pattern_id))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO spans VALUES (?, ?, ?)",
+                [(content_hash, keys[pattern_id], json.dumps(found[pattern_id]))
+                 for pattern_id in missing]
+            )
+
+        # Same order as iter_spans: by start, ties in pattern order
+        spans.sort(key=lambda span: (span[0], span[2]))
+        return text, spans
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache hits and misses of this index since it was opened."""
+        return {
+            "pages_cached": self.pages_cached,
+            "pages_extracted": self.pages_extracted,
+            "patterns_cached": self.patterns_cached,
+            "patterns_evaluated": self.patterns_evaluated
+        }
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+
+def scan_pdf(
+    src_file: str,
+    pattern_matcher: EnhancedPatternMatcher,
+    text_index: Optional[TextIndex] = None
+) -> Dict[str, Any]:
+    """
+    Count the matches of every pattern in a PDF without redacting it.
+
+    Args:
+        src_file (str): The PDF file to scan.
+        pattern_matcher (EnhancedPatternMatcher): The patterns to count.
+        text_index (Optional[TextIndex]): Index providing cached text and spans.
+
+    Returns:
+        dict: Stats in the layout of redact_pdf, plus "pages_with_matches".
+    """
+    stats = RedactionStats(pattern_matcher.patterns)
+    doc_key = TextIndex.document_key(src_file)
+    pages_with_matches = []
+
+    with fitz.open(src_file) as doc:
+        for page in doc:
+            stage_start = time.perf_counter()
+            if text_index is not None:
+                _, spans = text_index.page_spans(doc_key, page, pattern_matcher)
+            else:
+                spans = list(pattern_matcher.iter_spans(page.get_text()))
+            for _, _, pattern_id in spans:
+                stats.record_match(pattern_id)
+            if spans:
+                pages_with_matches.append(page.number)
+            stats.pages_processed += 1
+            stats.add_stage_time("match", time.perf_counter() - stage_start)
+
+    if text_index is not None:
+        text_index.commit()
+
+    result = stats.to_dict()
+    result["pages_with_matches"] = pages_with_matches
+    if text_index is not None:
+        result["text_index"] = text_index.get_stats()
+    return result
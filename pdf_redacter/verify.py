@@ -0,0 +1,172 @@
+import math
+import multiprocessing
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import fitz  # PyMuPDF
+
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.stats import match_fingerprint
+from pdf_redacter.workers import WorkerPool
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Pages verified per pool task
+VERIFY_CHUNK_PAGES = 16
+
+# Pattern matcher of a verification worker process
+_worker_matcher: Optional[EnhancedPatternMatcher] = None
+
+
+def _init_worker(pattern_matcher: EnhancedPatternMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = pattern_matcher
+
+
+def _find_leaks(
+    dest_file: str,
+    page_numbers: List[int],
+    pattern_matcher: EnhancedPatternMatcher
+) -> List[Dict[str, Any]]:
+    """Extract the given output pages and report every pattern match still found."""
+    leaks = []
+    with fitz.open(dest_file) as doc:
+        for page_num in page_numbers:
+            page_text = doc[page_num].get_text()
+            for start, end, pattern_id in pattern_matcher.iter_spans(page_text):
+                leaks.append({
+                    "page": page_num,
+                    "pattern": pattern_matcher.patterns[pattern_id],
+                    "start": start,
+                    "end": end,
+                    "fingerprint": match_fingerprint(page_text[start:end])
+                })
+    return leaks
+
+
+def _verify_chunk(dest_file: str, page_numbers: List[int]) -> List[Dict[str, Any]]:
+    """Pool task: check a chunk of pages with the worker's matcher."""
+    return _find_leaks(dest_file, page_numbers, _worker_matcher)
+
+
+def select_pages(
+    page_count: int,
+    modified_pages: Optional[Iterable[int]],
+    sample_rate: float = 0.0,
+    seed: int = 0
+) -> Dict[str, List[int]]:
+    """
+    Choose the output pages to verify.
+
+    Every modified page is checked, plus a reproducible random sample of
+    sample_rate of the others. With modified_pages None every page is checked.
+
+    Returns:
+        dict: Sorted "modified" and "sampled" page lists.
+    """
+    if modified_pages is None:
+        return {"modified": list(range(page_count)), "sampled": []}
+
+    modified = sorted(set(page for page in modified_pages if 0 <= page < page_count))
+    modified_set = set(modified)
+    others = [page for page in range(page_count) if page not in modified_set]
+    sample_size = min(len(others), math.ceil(len(others) * sample_rate))
+    sampled = sorted(random.Random(seed).sample(others, sample_size))
+    return {"modified": modified, "sampled": sampled}
+
+
+def verify_pdf(
+    dest_file: str,
+    pattern_matcher: EnhancedPatternMatcher,
+    match_fingerprints: Optional[Dict[int, Set[str]]] = None,
+    page_map: Optional[Dict[int, Optional[int]]] = None,
+    sample_rate: float = 0.0,
+    workers: int = 1
+) -> Dict[str, Any]:
+    """
+    Check that nothing matching the patterns can still be extracted from a written PDF.
+
+    Pages where redaction found matches (the pages of match_fingerprints)
+    are re-extracted and re-matched; of the other pages only a sample is.
+    Without match_fingerprints every page is checked.
+
+    Args:
+        dest_file (str): The redacted PDF.
+        pattern_matcher (EnhancedPatternMatcher): The patterns used for redaction.
+        match_fingerprints (Optional[Dict[int, Set[str]]]): Fingerprints of the texts matched
+            during redaction, by source page.
+        page_map (Optional[Dict[int, Optional[int]]]): Output page of every source page, None
+            for removed pages; source and output pages are the same if not given.
+        sample_rate (float): Share of the pages without matches to check as well, 0 to 1.
+        workers (int): Number of processes; 1 verifies in this process.
+
+    Returns:
+        dict: Pages checked, modified and sampled counts, the leaks (page, source_page,
+            pattern, offsets, fingerprint and whether the text was matched during
+            redaction), the pages with leaks and the seconds taken.
+    """
+    if not 0.0 <= sample_rate <= 1.0:
+        raise ValueError("sample_rate must be between 0 and 1")
+    if workers <= 0:
+        raise ValueError("workers must be a positive integer")
+
+    start_time = time.perf_counter()
+    if page_map is None:
+        with fitz.open(dest_file) as doc:
+            page_map = {page_num: page_num for page_num in range(len(doc))}
+    source_pages = {
+        output_page: source_page
+        for source_page, output_page in page_map.items() if output_page is not None
+    }
+
+    modified_pages = None
+    if match_fingerprints is not None:
+        modified_pages = [
+            page_map[source_page] for source_page in match_fingerprints
+            if page_map.get(source_page) is not None
+        ]
+    selection = select_pages(len(source_pages), modified_pages, sample_rate)
+    pages = sorted(selection["modified"] + selection["sampled"])
+
+    chunks = [pages[offset:offset + VERIFY_CHUNK_PAGES]
+              for offset in range(0, len(pages), VERIFY_CHUNK_PAGES)]
+    leaks: List[Dict[str, Any]] = []
+    # Pool workers are daemonic and cannot start processes of their own
+    if workers == 1 or len(chunks) <= 1 or multiprocessing.current_process().daemon:
+        for chunk in chunks:
+            leaks.extend(_find_leaks(dest_file, chunk, pattern_matcher))
+    else:
+        with WorkerPool(
+                workers=min(workers, len(chunks)),
+                initializer=_init_worker,
+                initargs=(pattern_matcher,)
+        ) as pool:
+            futures = [pool.submit(_verify_chunk, dest_file, chunk) for chunk in chunks]
+            for future in futures:
+                leaks.extend(future.result())
+
+    for leak in leaks:
+        source_page = source_pages.get(leak["page"])
+        leak["source_page"] = source_page
+        leak["matched_before"] = bool(
+            match_fingerprints
+            and leak["fingerprint"] in match_fingerprints.get(source_page, ()))
+
+    pages_with_leaks = sorted(set(leak["page"] for leak in leaks))
+    if leaks:
+        logger.error(
+            f"Verification found {len(leaks)} match(es) left in '{dest_file}' "
+            f"on page(s) {pages_with_leaks}")
+
+    return {
+        "pages_checked": len(pages),
+        "pages_modified": len(selection["modified"]),
+        "pages_sampled": len(selection["sampled"]),
+        "leaks": leaks,
+        "pages_with_leaks": pages_with_leaks,
+        "seconds": time.perf_counter() - start_time
+    }
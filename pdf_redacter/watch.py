@@ -0,0 +1,342 @@
+import os
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from pdf_redacter.engine import RedactionEngine
+from pdf_redacter.metrics import get_registry
+from pdf_redacter.workers import WorkerPool, peak_rss
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+PROCESSING_DIR = ".processing"
+PARTIAL_DIR = ".partial"
+
+# Redaction engine of a pool worker process
+_worker_engine: Optional[RedactionEngine] = None
+
+
+def _init_worker(engine: RedactionEngine) -> None:
+    """Keep the engine built by the watcher for every file of this worker."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _redact_file(src_file: str, dest_file: str) -> Tuple[Optional[Dict[str, Any]], float]:
+    """Redact one claimed file in a pool worker. Returns (stats or None, seconds)."""
+    start_time = time.perf_counter()
+    stats = _worker_engine.redact(src_file, dest_file, overwrite=True)
+    if stats:
+        peak = peak_rss()
+        if peak is not None:
+            stats["worker_peak_rss_mb"] = round(peak / 1048576, 1)
+    return stats, time.perf_counter() - start_time
+
+
+class HotFolderWatcher:
+    """
+    Redact PDFs dropped into an input directory.
+
+    The directory is polled; a file is picked up once its size and
+    modification time are unchanged between two polls, so files still being
+    copied in are left alone. Only the stat results of the previous poll are
+    kept, which needs no OS-specific notification API. Files are claimed by
+    renaming them into ``.processing/``, so several watchers can share one
+    input directory (start them with recover_claims=False, otherwise a
+    starting watcher re-queues files the others are working on). A warm
+    process pool redacts them with one RedactionEngine built up front;
+    outputs are written to ``.partial/`` and renamed
+    into the output directory when complete, inputs that fail go to the
+    failed directory. Pool workers empty MuPDF's store between files and
+    can be recycled after a number of files or above an RSS threshold.
+    """
+
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        failed_dir: str,
+        redaction_args: Dict[str, Any],
+        processed_dir: Optional[str] = None,
+        workers: int = 1,
+        poll_interval: float = 2.0,
+        stats_interval: float = 60.0,
+        skip_redact_failed_pages: bool = False,
+        recover_claims: bool = True,
+        max_tasks_per_worker: Optional[int] = None,
+        max_worker_rss_mb: Optional[float] = None,
+        store_shrink_percent: int = 100
+    ):
+        """
+        Args:
+            input_dir (str): Directory watched for new PDFs.
+            output_dir (str): Directory receiving redacted PDFs.
+            failed_dir (str): Directory receiving inputs that could not be redacted.
+            redaction_args (dict): Keyword arguments for PDFRedactor.redact_pdf.
+            processed_dir (Optional[str]): Directory receiving redacted inputs; they are deleted if None.
+            workers (int): Number of worker processes.
+            poll_interval (float): Seconds between directory scans.
+            stats_interval (float): Seconds between throughput and queue-depth log lines.
+            skip_redact_failed_pages (bool): Whether to skip pages that fail redaction.
+            recover_claims (bool): Re-queue files left in .processing/ by an interrupted run.
+            max_tasks_per_worker (Optional[int]): Replace a worker process after this many files.
+            max_worker_rss_mb (Optional[float]): Replace a worker process whose RSS exceeds this after a file.
+            store_shrink_percent (int): Share of the MuPDF store a worker frees after every file.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer")
+
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.failed_dir = Path(failed_dir)
+        self.processed_dir = Path(processed_dir) if processed_dir else None
+        self.processing_dir = self.input_dir / PROCESSING_DIR
+        self.partial_dir = self.output_dir / PARTIAL_DIR
+        self.redaction_args = dict(redaction_args)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stats_interval = stats_interval
+        self.skip_redact_failed_pages = skip_redact_failed_pages
+        self.recover_claims = recover_claims
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self.store_shrink_percent = store_shrink_percent
+
+        # (size, mtime_ns) of every candidate file seen by the last poll
+        self._stat_cache: Dict[str, Tuple[int, int]] = {}
+        self._in_flight: Dict[Future, Tuple[Path, float]] = {}
+        self._pool: Optional[WorkerPool] = None
+        self._pending = 0
+
+        self.files_done = 0
+        self.files_failed = 0
+        self.pages_done = 0
+        self._last_stats = time.monotonic()
+        # Counters at the last stats line, for per-interval throughput
+        self._last_files = 0
+        self._last_pages = 0
+
+    def _build_pool(self) -> WorkerPool:
+        engine = RedactionEngine(
+            skip_redact_failed_pages=self.skip_redact_failed_pages,
+            **self.redaction_args
+        )
+
+        return WorkerPool(
+            workers=self.workers,
+            initializer=_init_worker,
+            initargs=(engine,),
+            max_tasks_per_worker=self.max_tasks_per_worker,
+            max_rss_mb=self.max_worker_rss_mb,
+            store_shrink_percent=self.store_shrink_percent
+        )
+
+    def start(self) -> 'HotFolderWatcher':
+        """Create the directories, recover interrupted claims and start the pool."""
+        for directory in (self.input_dir, self.processing_dir, self.output_dir,
+                          self.partial_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        if self.processed_dir:
+            self.processed_dir.mkdir(parents=True, exist_ok=True)
+
+        # Files claimed by a watcher that was stopped mid-way go back to the queue
+        if self.recover_claims:
+            for claimed in self.processing_dir.glob("*.pdf"):
+                os.replace(claimed, self.input_dir / claimed.name)
+                logger.info(f"Re-queued interrupted file '{claimed.name}'")
+
+        if self._pool is None:
+            self._pool = self._build_pool()
+        self._last_stats = time.monotonic()
+        return self
+
+    def scan(self) -> int:
+        """
+        Poll the input directory and claim files that are complete.
+
+        Returns:
+            int: Number of files claimed and submitted.
+        """
+        stable = []
+        current: Dict[str, Tuple[int, int]] = {}
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".pdf") or entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if not entry.is_file():
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                current[entry.name] = signature
+                if self._stat_cache.get(entry.name) == signature:
+                    stable.append(entry.name)
+        self._stat_cache = current
+
+        # Files that stopped changing wait for a free worker
+        self._pending = len(stable)
+        claimed = 0
+        for name in sorted(stable):
+            if len(self._in_flight) >= self.workers:
+                break
+            if self._claim_and_submit(name):
+                claimed += 1
+                self._pending -= 1
+        return claimed
+
+    def _claim_and_submit(self, name: str) -> bool:
+        claimed_path = self.processing_dir / name
+        try:
+            os.rename(self.input_dir / name, claimed_path)
+        except FileNotFoundError:
+            # Claimed by another watcher, or removed
+            self._stat_cache.pop(name, None)
+            return False
+        self._stat_cache.pop(name, None)
+
+        future = self._pool.submit(
+            _redact_file,
+            str(claimed_path),
+            str(self.partial_dir / name)
+        )
+        self._in_flight[future] = (claimed_path, time.perf_counter())
+        logger.debug(f"Claimed '{name}'")
+        return True
+
+    def collect(self, timeout: Optional[float] = 0) -> int:
+        """
+        Move the results of finished files into place.
+
+        Returns:
+            int: Number of files finished.
+        """
+        if not self._in_flight:
+            return 0
+
+        done, _ = wait(
+            list(self._in_flight),
+            timeout=timeout,
+            return_when=ALL_COMPLETED if timeout is None else FIRST_COMPLETED
+        )
+        finished = 0
+        for future in done:
+            try:
+                stats, seconds = future.result()
+                error = None if stats else "redaction failed"
+                if stats and stats.get("verification", {}).get("leaks"):
+                    error = (f"verification found matches on page(s) "
+                             f"{stats['verification']['pages_with_leaks']}")
+            except Exception as e:
+                stats, seconds, error = None, 0.0, str(e)
+
+            claimed_path, submitted = self._in_flight.pop(future)
+            self._finish_file(claimed_path, stats, error,
+                              seconds or time.perf_counter() - submitted)
+            finished += 1
+        return finished
+
+    def _finish_file(
+        self,
+        claimed_path: Path,
+        stats: Optional[Dict[str, Any]],
+        error: Optional[str],
+        seconds: float
+    ) -> None:
+        name = claimed_path.name
+        partial_path = self.partial_dir / name
+        registry = get_registry()
+
+        if error is None:
+            os.replace(partial_path, self.output_dir / name)
+            if self.processed_dir:
+                os.replace(claimed_path, self.processed_dir / name)
+            else:
+                os.unlink(claimed_path)
+            self.files_done += 1
+            self.pages_done += stats.get("pages_processed", 0)
+            registry.record_document(stats, seconds)
+            logger.info(
+                f"Redacted '{name}': {stats.get('total_matches', 0)} matches "
+                f"in {seconds:.2f}s")
+        else:
+            if partial_path.exists():
+                os.unlink(partial_path)
+            os.replace(claimed_path, self.failed_dir / name)
+            self.files_failed += 1
+            registry.record_failure(seconds)
+            logger.error(f"Failed to redact '{name}': {error}")
+
+    @property
+    def queue_depth(self) -> int:
+        """Files waiting for a worker plus files being redacted."""
+        return self._pending + len(self._in_flight)
+
+    def log_stats(self) -> None:
+        """Log throughput since the previous call and the current queue depth."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_stats, 1e-9)
+        files = self.files_done + self.files_failed
+        registry = get_registry()
+        registry.set_gauge(
+            "watch_queue_depth", self.queue_depth,
+            help_text="Files waiting or being redacted in watch mode.")
+
+        memory = ""
+        if self._pool is not None:
+            pool_stats = self._pool.get_stats()
+            peak_mb = max(pool_stats["peak_rss_mb"].values(), default=0.0)
+            registry.set_gauge(
+                "worker_peak_rss_bytes", int(peak_mb * 1048576),
+                help_text="Highest RSS reached by a pool worker process.")
+            memory = (f", worker peak RSS {peak_mb:.0f} MB, "
+                      f"{pool_stats['workers_recycled']} workers recycled")
+
+        logger.info(
+            f"Watch: {self.files_done} redacted, {self.files_failed} failed, "
+            f"{(files - self._last_files) * 60 / elapsed:.1f} files/min, "
+            f"{(self.pages_done - self._last_pages) / elapsed:.1f} pages/s, "
+            f"queue depth {self.queue_depth} ({len(self._in_flight)} in progress)"
+            f"{memory}")
+        self._last_stats = now
+        self._last_files = files
+        self._last_pages = self.pages_done
+
+    def run(self, max_files: Optional[int] = None) -> None:
+        """
+        Poll and redact until interrupted.
+
+        Args:
+            max_files (Optional[int]): Stop once this many files are finished.
+        """
+        self.start()
+        logger.info(
+            f"Watching '{self.input_dir}' with {self.workers} worker(s), "
+            f"output to '{self.output_dir}'")
+        try:
+            while max_files is None or self.files_done + self.files_failed < max_files:
+                self.scan()
+                self.collect(timeout=self.poll_interval if self._in_flight else 0)
+                if not self._in_flight:
+                    time.sleep(self.poll_interval)
+
+                if time.monotonic() - self._last_stats >= self.stats_interval:
+                    self.log_stats()
+        except KeyboardInterrupt:
+            logger.info("Stopping watch mode")
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Wait for files in progress and stop the pool."""
+        if self._pool is None:
+            return
+        self.collect(timeout=None)
+        self._pool.shutdown()
+        self.log_stats()
+        self._pool = None
@@ -0,0 +1,182 @@
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.stats import RedactionStats
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# What to do with a page that ran out of time
+TIMEOUT_FALLBACKS = ("skip", "blank")
+
+# Seconds allowed for the subprocess to start and open the document
+STARTUP_TIMEOUT = 60.0
+
+Rect = Tuple[float, float, float, float]
+
+PageResult = Tuple[
+    Optional[List[Rect]], int, RedactionStats, List[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+class PageTimeout(Exception):
+    """Raised when a page is not redacted within its time budget."""
+
+
+def _page_worker(
+    conn,
+    src_file: str,
+    pattern_matcher: EnhancedPatternMatcher
+) -> None:
+    """Subprocess loop: search requested pages and send back the rects to redact."""
+    # Imported here because core imports this module
+    from pdf_redacter.core import PDFRedactor
+
+    doc = fitz.open(src_file)
+    conn.send(("ready", None))
+    try:
+        while True:
+            page_num = conn.recv()
+            if page_num is None:
+                break
+
+            try:
+                stats = RedactionStats(pattern_matcher.patterns)
+                page_rects, page_matches = PDFRedactor.find_page_rects(
+                    doc[page_num], pattern_matcher, stats)
+                rects = [tuple(rect) for rect in page_rects]
+
+                timings = pattern_matcher.get_pattern_timings()
+                pattern_matcher.reset_pattern_timings()
+                prefilter_stats = pattern_matcher.get_prefilter_stats()
+                pattern_matcher.reset_prefilter_stats()
+                conn.send(("done", (rects, page_matches, stats, timings, prefilter_stats)))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        doc.close()
+
+
+class PageWatchdog:
+    """
+    Search pages one at a time in a supervised subprocess.
+
+    The subprocess opens the document once, extracts and matches the text
+    of the pages it is sent and returns the rects to redact; the caller
+    applies them to its own document, so the page objects and everything
+    pointing at them stay as they are. If a page does not finish within its
+    time budget the subprocess is killed, and a fresh one is started for the
+    next page. A subprocess that dies on a page (e.g. a crash inside MuPDF)
+    is reported as a failed page.
+    """
+
+    def __init__(
+        self,
+        src_file: str,
+        pattern_matcher: EnhancedPatternMatcher
+    ):
+        self.src_file = src_file
+        self.pattern_matcher = pattern_matcher
+        self.restarts = 0
+        # Spawn: a forked child would share MuPDF state with the parent
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+
+    def __enter__(self) -> 'PageWatchdog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _start(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_page_worker,
+            args=(child_conn, self.src_file, self.pattern_matcher),
+            name="page-watchdog",
+            daemon=True
+        )
+        self._conn = parent_conn
+        try:
+            self._process.start()
+        except Exception:
+            self._process = None
+            self._kill()
+            raise
+        finally:
+            child_conn.close()
+
+        if not self._conn.poll(STARTUP_TIMEOUT):
+            self._kill()
+            raise RuntimeError(
+                f"Page subprocess did not open '{self.src_file}' within {STARTUP_TIMEOUT}s")
+        try:
+            self._conn.recv()
+        except EOFError:
+            self._kill()
+            raise RuntimeError(f"Page subprocess failed to open '{self.src_file}'")
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def find_page_rects(self, page_num: int, timeout: float) -> PageResult:
+        """
+        Find the rects to redact on a page in the subprocess.
+
+        Args:
+            page_num (int): The page to search.
+            timeout (float): Seconds to wait for the page.
+
+        Returns:
+            tuple: The rects (None if the subprocess died on the page), the
+                number of matches, the page stats and the pattern timings and
+                prefilter counters of the page.
+
+        Raises:
+            PageTimeout: If the page did not finish within timeout.
+        """
+        if self._process is None:
+            self._start()
+
+        self._conn.send(page_num)
+        if not self._conn.poll(timeout):
+            self._kill()
+            self.restarts += 1
+            raise PageTimeout(f"Page {page_num} did not finish within {timeout:.1f}s")
+
+        try:
+            status, payload = self._conn.recv()
+        except EOFError:
+            exitcode = self._process.exitcode
+            self._kill()
+            self.restarts += 1
+            logger.warning(
+                f"Page subprocess died on page {page_num} (exit code {exitcode})")
+            return None, 0, RedactionStats(self.pattern_matcher.patterns), [], []
+
+        if status == "error":
+            raise RuntimeError(f"Redaction of page {page_num} failed: {payload}")
+        return payload
+
+    def close(self) -> None:
+        """Stop the subprocess."""
+        if self._process is None or self._conn is None:
+            self._kill()
+            return
+        try:
+            self._conn.send(None)
+            self._process.join(5)
+        except (BrokenPipeError, OSError):
+            pass
+        self._kill()
@@ -0,0 +1,346 @@
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import logging
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for workers that died without reporting
+_MONITOR_INTERVAL = 0.5
+
+
+def shrink_store(percent: int = 100) -> None:
+    """
+    Free part of MuPDF's global resource store (fonts, images, parsed objects).
+
+    The store is shared by every document opened in the process and is only
+    trimmed when it reaches its limit, so long-running workers call this
+    between documents. 100 empties it, 0 does nothing.
+    """
+    if percent > 0:
+        fitz.TOOLS.store_shrink(min(percent, 100))
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss()
+
+
+def peak_rss() -> Optional[int]:
+    """High-water mark of the resident set size of this process in bytes, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _worker_main(
+    worker_id: int,
+    task_queue,
+    result_queue,
+    initializer: Optional[Callable],
+    initargs: Tuple,
+    max_tasks: Optional[int],
+    max_rss: Optional[int],
+    store_shrink_percent: int
+) -> None:
+    """Worker loop: run tasks until told to stop or until the worker should be recycled."""
+    if initializer is not None:
+        initializer(*initargs)
+
+    tasks = 0
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, fn, args = task
+
+        try:
+            ok, value = True, fn(*args)
+        except BaseException as e:
+            ok, value = False, e
+            try:
+                pickle.dumps(value)
+            except Exception:
+                value = RuntimeError(f"{type(e).__name__}: {e}")
+
+        shrink_store(store_shrink_percent)
+        tasks += 1
+        rss = current_rss()
+        retire = (max_tasks is not None and tasks >= max_tasks) \
+            or (max_rss is not None and rss is not None and rss > max_rss)
+        result_queue.put((worker_id, task_id, ok, value, rss, peak_rss(), retire))
+        if retire:
+            break
+
+
+class _Worker:
+    __slots__ = ("worker_id", "process", "tasks", "task_id")
+
+    def __init__(self, worker_id: int, process, tasks):
+        self.worker_id = worker_id
+        self.process = process
+        self.tasks = tasks
+        # Task currently running in the worker
+        self.task_id: Optional[int] = None
+
+
+class WorkerPool:
+    """
+    Process pool that recycles workers to bound their memory.
+
+    Works like a ProcessPoolExecutor (``submit`` returns a Future), but a
+    worker is replaced by a fresh process after ``max_tasks_per_worker``
+    tasks, or once its RSS exceeds ``max_rss_mb`` after a task. Between
+    tasks every worker shrinks MuPDF's resource store. A worker that dies
+    fails its task instead of breaking the pool. The RSS high-water mark of
+    every worker that ran is kept for reporting.
+
+    Workers are spawned, not forked: the pool starts replacement workers
+    from its collector thread, and a forked child would inherit the
+    parent's MuPDF state and locks held by other threads. Functions,
+    initializers and their arguments must therefore be picklable.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = (),
+        max_tasks_per_worker: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        store_shrink_percent: int = 100
+    ):
+        """
+        Args:
+            workers (int): Number of worker processes.
+            initializer (Optional[Callable]): Called with initargs in every new worker.
+            initargs (tuple): Arguments of initializer.
+            max_tasks_per_worker (Optional[int]): Recycle a worker after this many tasks.
+            max_rss_mb (Optional[float]): Recycle a worker whose RSS exceeds this after a task.
+            store_shrink_percent (int): Share of the MuPDF store freed after every task.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer")
+        if max_tasks_per_worker is not None and max_tasks_per_worker <= 0:
+            raise ValueError("max_tasks_per_worker must be a positive integer")
+        if max_rss_mb is not None and max_rss_mb <= 0:
+            raise ValueError("max_rss_mb must be positive")
+        if not 0 <= store_shrink_percent <= 100:
+            raise ValueError("store_shrink_percent must be between 0 and 100")
+
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_rss = int(max_rss_mb * 1024 * 1024) if max_rss_mb is not None else None
+        self.store_shrink_percent = store_shrink_percent
+
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._lock = threading.Lock()
+        self._workers: Dict[int, _Worker] = {}
+        self._futures: Dict[int, Future] = {}
+        self._backlog: Deque[Tuple[int, Callable, Tuple]] = deque()
+        self._next_worker_id = 0
+        self._next_task_id = 0
+        self._shutdown = False
+
+        self.workers_started = 0
+        self.workers_recycled = 0
+        self.workers_died = 0
+        # RSS high-water mark in bytes, by worker id
+        self.peak_rss: Dict[int, int] = {}
+
+        with self._lock:
+            for _ in range(workers):
+                self._start_worker()
+        self._collector = threading.Thread(
+            target=self._collect, name="worker-pool-collector", daemon=True)
+        self._collector.start()
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def _start_worker(self) -> None:
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        tasks = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, tasks, self._results, self.initializer, self.initargs,
+                  self.max_tasks_per_worker, self.max_rss, self.store_shrink_percent),
+            name=f"pool-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._workers[worker_id] = _Worker(worker_id, process, tasks)
+        self.workers_started += 1
+
+    def _dispatch(self) -> None:
+        """Hand queued tasks to idle workers. Called with the lock held."""
+        for worker in self._workers.values():
+            if not self._backlog:
+                return
+            if worker.task_id is None:
+                task_id, fn, args = self._backlog.popleft()
+                worker.task_id = task_id
+                worker.tasks.put((task_id, fn, args))
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        """Schedule fn(*args) in a worker. fn must be picklable (a module-level function)."""
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            task_id = self._next_task_id
+            self._next_task_id += 1
+            self._futures[task_id] = future
+            self._backlog.append((task_id, fn, args))
+            self._dispatch()
+        return future
+
+    def _collect(self) -> None:
+        """Collector thread: resolve futures, replace retired and dead workers."""
+        while True:
+            try:
+                message = self._results.get(timeout=_MONITOR_INTERVAL)
+            except queue.Empty:
+                message = None
+            except (EOFError, OSError):
+                return
+
+            with self._lock:
+                if message is not None:
+                    self._handle_result(*message)
+                else:
+                    self._reap_dead_workers()
+                if self._shutdown and not self._futures:
+                    return
+                self._dispatch()
+
+    def _handle_result(self, worker_id, task_id, ok, value, rss, peak, retire) -> None:
+        worker = self._workers.get(worker_id)
+        if peak is not None:
+            self.peak_rss[worker_id] = max(self.peak_rss.get(worker_id, 0), peak)
+
+        future = self._futures.pop(task_id, None)
+        if future is not None:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+        if worker is None:
+            return
+        worker.task_id = None
+        if retire:
+            worker.process.join()
+            del self._workers[worker_id]
+            self.workers_recycled += 1
+            logger.debug(
+                f"Recycled worker {worker_id} "
+                f"(RSS {rss / 1048576 if rss else 0:.0f} MB)")
+            if not self._shutdown or self._backlog:
+                self._start_worker()
+
+    def _drain_results(self) -> None:
+        """Handle every result already queued. Called with the lock held."""
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._handle_result(*message)
+
+    def _reap_dead_workers(self) -> None:
+        dead = [worker for worker in self._workers.values() if not worker.process.is_alive()]
+        if not dead:
+            return
+        # A worker reports before it exits, but its result may have arrived
+        # after the queue was last read: only a task still without a result
+        # after draining the queue is lost
+        self._drain_results()
+        for worker in dead:
+            worker_id = worker.worker_id
+            if self._workers.get(worker_id) is not worker:
+                # Retired and replaced while draining
+                continue
+            del self._workers[worker_id]
+            if worker.task_id is None and self._shutdown:
+                continue
+            self.workers_died += 1
+            logger.warning(
+                f"Worker {worker_id} exited with code {worker.process.exitcode}")
+            future = self._futures.pop(worker.task_id, None) \
+                if worker.task_id is not None else None
+            if future is not None:
+                future.set_exception(RuntimeError(
+                    f"Worker process died (exit code {worker.process.exitcode})"))
+            if not self._shutdown or self._backlog:
+                self._start_worker()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Workers started, recycled and died, and the peak RSS in MB per worker."""
+        with self._lock:
+            return {
+                "workers_started": self.workers_started,
+                "workers_recycled": self.workers_recycled,
+                "workers_died": self.workers_died,
+                "peak_rss_mb": {
+                    worker_id: round(peak / 1048576, 1)
+                    for worker_id, peak in sorted(self.peak_rss.items())
+                }
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks, finish running (and with wait, queued) tasks and stop the workers."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            if not wait:
+                for task_id, _, _ in self._backlog:
+                    self._futures.pop(task_id).cancel()
+                self._backlog.clear()
+
+        if wait:
+            for future in list(self._futures.values()):
+                try:
+                    future.exception()
+                except Exception:
+                    pass
+
+        with self._lock:
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.tasks.put(None)
+        for worker in workers:
+            worker.process.join(5)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        self._collector.join(_MONITOR_INTERVAL * 4)
@@ -19,6 +19,9 @@ setup(
             "pytest>=6.0",
             "pytest-cov",
             "pytest-mock"
+        ],
+        "fast": [
+            "numpy"
         ]
     },
     entry_points={
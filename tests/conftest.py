@@ -44,3 +44,20 @@ def sample_pdf(temp_dir):
     doc.close()
 
     return pdf_path
+
+
+@pytest.fixture
+def multi_page_pdf(temp_dir):
+    """Create a five page PDF with an email address on every page."""
+    pdf_path = temp_dir / "multi_page.pdf"
+    doc: fitz.Document = fitz.open()
+    for page_num in range(5):
+        page = doc.new_page()
+        page.insert_text(
+            (50, 50),
+            f"Page {page_num + 1}\nContact: user{page_num}@example.com\nConfidential"
+        )
+    doc.save(str(pdf_path))
+    doc.close()
+
+    return pdf_path
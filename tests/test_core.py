@@ -296,3 +296,115 @@ class TestPDFRedactor:
         assert "[REDACTED]" in page_text
         assert "test@example.com" not in page_text
         doc.close()
+
+    def test_redact_pdf_profile_patterns(self, sample_pdf, temp_dir):
+        """Test that pattern profiling is surfaced in the statistics."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Confidential"],
+            replacement="[REDACTED]",
+            ignore_case=False,
+            predefined_patterns=[PatternType.EMAIL],
+            profile_patterns=True
+        )
+
+        assert isinstance(result, dict)
+        timings = result["pattern_timings"]
+        assert len(timings) == 2
+        assert timings[0]["time"] >= timings[1]["time"]
+        assert sum(t["matches"] for t in timings) == result["total_matches"]
+
+    def test_redact_pdf_coalesces_rects(self, sample_pdf, temp_dir):
+        """Test that redaction rects are merged and counted in the statistics."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        # Adjacent matches of two patterns give touching rects
+        result = redactor.redact_pdf(
+            needles=["Confidential ", "information"],
+            replacement="[REDACTED]",
+            ignore_case=False
+        )
+
+        assert result["annotations_requested"] == 2
+        assert result["annotations_applied"] == 1
+
+        doc = fitz.open(str(output_path))
+        assert "Confidential information" not in doc[0].get_text()
+        doc.close()
+
+    def test_redact_pdf_without_coalescing(self, sample_pdf, temp_dir):
+        """Test that merging can be disabled."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Confidential ", "information"],
+            replacement="[REDACTED]",
+            ignore_case=False,
+            coalesce_rects=False
+        )
+
+        assert result["annotations_requested"] == 2
+        assert result["annotations_applied"] == 2
+
+    def test_redact_pdf_reports_prefilter(self, multi_page_pdf, temp_dir):
+        """Test that prefilter skips are reported in the statistics."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(multi_page_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Page 3"],
+            replacement="[REDACTED]",
+            ignore_case=False
+        )
+
+        assert result["total_matches"] == 1
+        assert result["prefilter"] == [{
+            "pattern_id": 0,
+            "pattern": "Page 3",
+            "requires": ["'Page 3'"],
+            "checked": 5,
+            "skipped": 4,
+            "skip_rate": 0.8
+        }]
+
+    def test_redact_pdf_merges_overlapping_matches(self, sample_pdf, temp_dir):
+        """Test that overlapping matches are searched once but counted per pattern."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Confidential", "Confid", "fidential"],
+            replacement="[REDACTED]",
+            ignore_case=False
+        )
+
+        assert result["total_matches"] == 3
+        assert result["matches_by_pattern"] == {
+            "Confidential": 1, "Confid": 1, "fidential": 1}
+        assert result["spans_searched"] == 1
+        assert result["annotations_requested"] == 1
+
@@ -0,0 +1,64 @@
+import pickle
+
+import fitz
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.engine import RedactionEngine
+from pdf_redacter.templates import RedactionTemplate
+
+
+class TestRedactionEngine:
+
+    def test_compiles_once_for_many_documents(self, multi_page_pdf, sample_pdf, temp_dir, mocker):
+        """Test that the patterns are built once and reused for every document."""
+        build = mocker.spy(PDFRedactor, "build_pattern_matcher")
+        engine = RedactionEngine(needles=[r"\w+@example\.com"], replacement="")
+
+        first = engine.redact(str(multi_page_pdf), str(temp_dir / "a.pdf"))
+        second = engine.redact(str(sample_pdf), str(temp_dir / "b.pdf"))
+
+        assert build.call_count == 1
+        assert first["total_matches"] == 5
+        assert second["total_matches"] == 1
+        assert engine.documents == 2
+        assert engine.pattern_info[0]["pattern"] == r"\w+@example\.com"
+        with fitz.open(str(temp_dir / "b.pdf")) as doc:
+            assert "test@example.com" not in doc[0].get_text()
+
+    def test_options_and_overwrite(self, sample_pdf, temp_dir):
+        """Test that redact_pdf options apply to every call and overwrite can be overridden."""
+        engine = RedactionEngine(needles=["test"], replacement="", optimize_output=True)
+        dest = temp_dir / "out.pdf"
+
+        assert "optimization" in engine.redact(str(sample_pdf), str(dest))
+        with pytest.raises(FileExistsError):
+            engine.redact(str(sample_pdf), str(dest))
+        assert engine.redact(str(sample_pdf), str(dest), overwrite=True) is not None
+
+    def test_invalid_configuration(self):
+        """Test that unknown options and missing or invalid patterns are rejected up front."""
+        with pytest.raises(TypeError, match="colour"):
+            RedactionEngine(needles=["x"], colour="red")
+        with pytest.raises(ValueError):
+            RedactionEngine(needles=[])
+        with pytest.raises(ValueError):
+            RedactionEngine(needles=["(unclosed"])
+
+    def test_pickle_roundtrip(self, sample_pdf, temp_dir):
+        """Test that an engine sent to a worker process still redacts."""
+        engine = pickle.loads(pickle.dumps(RedactionEngine(needles=["Confidential"])))
+
+        result = engine.redact(str(sample_pdf), str(temp_dir / "out.pdf"))
+
+        assert result["total_matches"] == 1
+
+    def test_template_without_patterns(self, sample_pdf, temp_dir):
+        """Test an engine that only redacts template rects."""
+        engine = RedactionEngine(
+            template=RedactionTemplate.from_dict({"pages": {1: [[0, 0, 300, 300]]}}))
+
+        result = engine.redact(str(sample_pdf), str(temp_dir / "out.pdf"))
+
+        assert engine.pattern_matcher is None
+        assert result["template_pages"] == 1
@@ -0,0 +1,68 @@
+import random
+
+import fitz
+import pytest
+
+from pdf_redacter import geometry
+from pdf_redacter.geometry import merge_rects
+
+
+class TestMergeRects:
+
+    def test_merges_overlapping_and_close_rects(self):
+        """Test that rects on one line within the gap become one rect."""
+        rects = [
+            fitz.Rect(50, 10, 60, 20),
+            fitz.Rect(10, 10, 30, 20),
+            fitz.Rect(25, 10, 40, 20),
+            fitz.Rect(40.5, 10, 45, 20)
+        ]
+
+        merged = merge_rects(rects, gap=1.0)
+
+        assert merged == [fitz.Rect(10, 10, 45, 20), fitz.Rect(50, 10, 60, 20)]
+
+    def test_keeps_lines_apart(self):
+        """Test that rects on different lines are never merged."""
+        rects = [
+            fitz.Rect(10, 10, 30, 20),
+            fitz.Rect(10, 22, 30, 32),
+            # Same line within the tolerance
+            fitz.Rect(30, 10.2, 40, 20.2)
+        ]
+
+        merged = merge_rects(rects, gap=0.0)
+
+        assert len(merged) == 2
+        assert merged[0].x1 == pytest.approx(40)
+        assert merged[1] == fitz.Rect(10, 22, 30, 32)
+
+    def test_duplicates_collapse(self):
+        """Test that identical rects, e.g. repeated search hits, collapse."""
+        rects = [fitz.Rect(10, 10, 30, 20)] * 5
+
+        assert merge_rects(rects) == [fitz.Rect(10, 10, 30, 20)]
+
+    def test_invalid_arguments(self):
+        """Test validation of the merge parameters."""
+        with pytest.raises(ValueError):
+            merge_rects([], gap=-1)
+        with pytest.raises(ValueError):
+            merge_rects([], line_tolerance=0)
+
+    def test_numpy_matches_python(self):
+        """Test that the vectorized path gives the same result."""
+        pytest.importorskip("numpy")
+        rng = random.Random(7)
+        rects = []
+        for _ in range(500):
+            top = rng.randint(0, 20) * 12.0
+            x0 = rng.uniform(0, 500)
+            rects.append(fitz.Rect(x0, top, x0 + rng.uniform(1, 30), top + 10))
+
+        expected = geometry._merge_rects_python(rects, 1.0, 1.0)
+        actual = geometry._merge_rects_numpy(rects, 1.0, 1.0)
+
+        assert len(actual) == len(expected)
+        for rect, other in zip(actual, expected):
+            assert tuple(rect) == pytest.approx(tuple(other), abs=1e-4)
@@ -0,0 +1,170 @@
+import json
+
+import fitz
+import pytest
+import yaml
+
+from pdf_redacter.args_processor import ArgsProcessor
+from pdf_redacter.manifest import ManifestRunner, RowBitmap, iter_manifest
+
+
+def write_pdf(path, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 50), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def read_state(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def manifest_dir(temp_dir):
+    """Create three source PDFs and a CSV manifest for them."""
+    for index in range(3):
+        write_pdf(temp_dir / f"in{index}.pdf", f"Contact user{index}@example.com")
+    lines = ["src,dest,profile"] + [
+        f"{temp_dir / f'in{index}.pdf'},{temp_dir / 'out' / f'out{index}.pdf'},"
+        for index in range(3)
+    ]
+    (temp_dir / "batch.csv").write_text("\n".join(lines) + "\n")
+    return temp_dir
+
+
+REDACTION_ARGS = {
+    "needles": [r"user\d@example\.com"],
+    "replacement": "",
+    "ignore_case": False
+}
+
+
+class TestIterManifest:
+
+    def test_csv_and_jsonl(self, temp_dir):
+        """Test that CSV and JSONL manifests yield numbered rows."""
+        (temp_dir / "m.csv").write_text("src,dest,profile\na.pdf,b.pdf,x\nc.pdf,d.pdf,\n")
+        (temp_dir / "m.jsonl").write_text(
+            '{"src": "a.pdf", "dest": "b.pdf", "profile": "x"}\n\n{"src": "c.pdf", "dest": "d.pdf"}\n')
+
+        csv_rows = list(iter_manifest(str(temp_dir / "m.csv")))
+        jsonl_rows = list(iter_manifest(str(temp_dir / "m.jsonl")))
+
+        assert [number for number, _ in csv_rows] == [0, 1]
+        assert [number for number, _ in jsonl_rows] == [0, 2]
+        assert csv_rows[0][1]["profile"] == jsonl_rows[0][1]["profile"] == "x"
+
+    def test_unsupported_format(self, temp_dir):
+        """Test that manifests other than CSV and JSONL are rejected."""
+        (temp_dir / "m.txt").write_text("a.pdf b.pdf\n")
+        with pytest.raises(ValueError):
+            list(iter_manifest(str(temp_dir / "m.txt")))
+
+
+class TestRowBitmap:
+
+    def test_membership(self):
+        """Test that added rows are found and others are not."""
+        rows = RowBitmap()
+        for row in (0, 7, 8, 1000):
+            rows.add(row)
+
+        assert all(row in rows for row in (0, 7, 8, 1000))
+        assert not any(row in rows for row in (1, 9, 999, 5000))
+
+
+class TestManifestRunner:
+
+    def test_redacts_rows_and_records_state(self, manifest_dir):
+        """Test that every row is redacted and recorded as done."""
+        result = ManifestRunner(
+            str(manifest_dir / "batch.csv"), REDACTION_ARGS, workers=2).run()
+
+        assert result["rows_done"] == 3
+        records = read_state(manifest_dir / "batch.state.jsonl")
+        assert sorted(record["row"] for record in records) == [0, 1, 2]
+        assert all(record["status"] == "done" and record["total_matches"] == 1
+                   for record in records)
+        with fitz.open(str(manifest_dir / "out" / "out1.pdf")) as doc:
+            assert "user1@example.com" not in doc[0].get_text()
+
+    def test_restart_skips_finished_rows(self, manifest_dir):
+        """Test that a second run skips the rows recorded in the state file."""
+        state_file = manifest_dir / "state.jsonl"
+        state_file.write_text(json.dumps({"row": 1, "status": "done"}) + "\n" + '{"row": 2, "sta')
+
+        result = ManifestRunner(
+            str(manifest_dir / "batch.csv"), REDACTION_ARGS, state_file=str(state_file)).run()
+
+        assert result["rows_done"] == 2
+        assert result["rows_skipped"] == 1
+        assert not (manifest_dir / "out" / "out1.pdf").exists()
+
+        again = ManifestRunner(
+            str(manifest_dir / "batch.csv"), REDACTION_ARGS, state_file=str(state_file)).run()
+        assert again["rows_done"] == 0
+        assert again["rows_skipped"] == 3
+
+    def test_failed_row_retried_and_recorded(self, manifest_dir):
+        """Test that a failing row is retried and then recorded with its error."""
+        with open(manifest_dir / "batch.csv", "a") as f:
+            f.write(f"{manifest_dir / 'missing.pdf'},{manifest_dir / 'out' / 'missing.pdf'},\n")
+
+        result = ManifestRunner(
+            str(manifest_dir / "batch.csv"), REDACTION_ARGS, max_retries=1).run()
+
+        assert result["rows_done"] == 3
+        assert result["rows_failed"] == 1
+        assert result["retries"] == 1
+        failed = [record for record in read_state(manifest_dir / "batch.state.jsonl")
+                  if record["status"] == "failed"]
+        assert failed[0]["row"] == 3
+        assert failed[0]["attempts"] == 2
+        assert "error" in failed[0]
+        assert not (manifest_dir / "out" / "missing.pdf.partial").exists()
+
+    def test_profiles(self, manifest_dir):
+        """Test that rows use the patterns of their profile and unknown profiles fail."""
+        (manifest_dir / "batch.jsonl").write_text("\n".join(json.dumps(row) for row in [
+            {"src": str(manifest_dir / "in0.pdf"), "dest": str(manifest_dir / "a.pdf"),
+             "profile": "mail"},
+            {"src": str(manifest_dir / "in1.pdf"), "dest": str(manifest_dir / "b.pdf"),
+             "profile": "other"},
+        ]) + "\n")
+
+        result = ManifestRunner(
+            str(manifest_dir / "batch.jsonl"),
+            {"needles": [], "replacement": "", "ignore_case": False},
+            profiles=[{"name": "mail", "predefined_patterns": ["email"]}]
+        ).run()
+
+        assert result["rows_done"] == 1
+        assert result["rows_failed"] == 1
+        with fitz.open(str(manifest_dir / "a.pdf")) as doc:
+            assert "user0@example.com" not in doc[0].get_text()
+
+    def test_invalid_settings(self, manifest_dir):
+        """Test that invalid runner settings are rejected."""
+        with pytest.raises(ValueError):
+            ManifestRunner(str(manifest_dir / "batch.csv"), REDACTION_ARGS, max_retries=-1)
+        with pytest.raises(ValueError):
+            ManifestRunner(str(manifest_dir / "batch.csv"), REDACTION_ARGS, profiles=[{}])
+
+    def test_options_with_config_file(self, manifest_dir):
+        """Test that manifest options given with --config-file are not replaced by its defaults."""
+        config_file = manifest_dir / "config.yml"
+        config_file.write_text(yaml.safe_dump({"searches": [r"user\d@example\.com"]}))
+        args = ArgsProcessor.generate_argument_parser().parse_args([
+            "--config-file", str(config_file),
+            "--manifest", str(manifest_dir / "batch.csv"),
+            "--manifest-state", str(manifest_dir / "state.jsonl"),
+            "--retry-failed"
+        ])
+
+        final_config = ArgsProcessor.load_configuration(args)
+
+        assert final_config["manifest"] == str(manifest_dir / "batch.csv")
+        assert final_config["manifest_state"] == str(manifest_dir / "state.jsonl")
+        assert final_config["retry_failed"] is True
@@ -0,0 +1,102 @@
+import json
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.metrics import Histogram, MetricsRegistry, MetricsExporter, get_registry
+
+
+class TestHistogram:
+
+    def test_buckets_and_quantiles(self):
+        """Test cumulative buckets and percentile estimates."""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative_counts() == [
+            (0.1, 1), (1.0, 3), (float("inf"), 4)]
+        assert histogram.sum == pytest.approx(6.05)
+        assert histogram.quantile(0.5) == 0.5
+        assert histogram.quantile(1.0) == 5.0
+        assert Histogram().quantile(0.5) is None
+
+
+class TestMetricsRegistry:
+
+    def _stats(self):
+        return {
+            "total_matches": 4,
+            "pages_processed": 10,
+            "pages_modified": 2,
+            "pages_failed_redaction": 1,
+            "stage_times": {"extract": 0.2, "apply": 0.3}
+        }
+
+    def test_record_document(self):
+        """Test that document statistics update counters and histograms."""
+        registry = MetricsRegistry()
+        registry.record_document(self._stats(), seconds=2.0)
+        registry.record_document(self._stats(), seconds=3.0)
+
+        assert registry.get("documents_total") == 2
+        assert registry.get("pages_failed_redaction_total") == 2
+        assert registry.get("pages_per_second") == pytest.approx(4.0)
+        assert registry.get("stage_seconds", stage="apply").count == 2
+
+    def test_prometheus_format(self):
+        """Test the text exposition format."""
+        registry = MetricsRegistry()
+        registry.record_document(self._stats(), seconds=2.0)
+
+        text = registry.to_prometheus()
+
+        assert "# TYPE pdf_redacter_documents_total counter" in text
+        assert "pdf_redacter_documents_total 1\n" in text
+        assert "# TYPE pdf_redacter_document_seconds histogram" in text
+        assert 'pdf_redacter_document_seconds_bucket{le="2.5"} 1' in text
+        assert 'pdf_redacter_document_seconds_bucket{le="+Inf"} 1' in text
+        assert 'pdf_redacter_stage_seconds_count{stage="extract"} 1' in text
+
+    def test_type_conflict(self):
+        """Test that a metric name cannot change its type."""
+        registry = MetricsRegistry()
+        registry.inc("things")
+
+        with pytest.raises(ValueError):
+            registry.set_gauge("things", 1)
+
+    def test_exporter_writes_at_stop(self, temp_dir):
+        """Test that the exporter writes both formats on stop."""
+        registry = MetricsRegistry()
+        registry.record_failure(seconds=0.5)
+        prom_path = temp_dir / "redacter.prom"
+        json_path = temp_dir / "metrics.json"
+
+        exporter = MetricsExporter(
+            registry, str(prom_path), str(json_path), interval=0).start()
+        exporter.stop()
+
+        assert "pdf_redacter_documents_failed_total 1" in prom_path.read_text()
+        snapshot = json.loads(json_path.read_text())
+        latency = snapshot["metrics"]["pdf_redacter_document_seconds"]["series"][0]
+        assert latency["count"] == 1
+        assert latency["p50"] == 0.5
+
+    def test_redact_pdf_updates_registry(self, sample_pdf, temp_dir):
+        """Test that redact_pdf records into the package registry."""
+        registry = get_registry()
+        before = registry.get("documents_total") or 0
+
+        result = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(temp_dir / "redacted.pdf"),
+            overwrite=True
+        ).redact_pdf(
+            needles=["Confidential"],
+            replacement="[REDACTED]",
+            ignore_case=False
+        )
+
+        assert set(result["stage_times"]) == {
+            "open", "extract", "match", "apply", "save"}
+        assert registry.get("documents_total") == before + 1
@@ -0,0 +1,120 @@
+import os
+
+import fitz
+import pikepdf
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.optimize import embedded_font_bytes, optimize_document, prune_and_save
+
+
+@pytest.fixture
+def embedded_font_pdf(temp_dir):
+    """Create a three page PDF using a fully embedded font."""
+    pdf_path = temp_dir / "embedded_font.pdf"
+    font_buffer = fitz.Font("tiro").buffer
+    doc = fitz.open()
+    for _ in range(3):
+        page = doc.new_page()
+        page.insert_font(fontname="F0", fontbuffer=font_buffer)
+        page.insert_text((50, 50), "Secret agent 007 report", fontname="F0")
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+class TestOptimizePdf:
+
+    def test_shrinks_embedded_fonts(self, embedded_font_pdf):
+        """Test that subsetting shrinks the embedded fonts of an open document."""
+        with fitz.open(str(embedded_font_pdf)) as doc:
+            result = optimize_document(doc)
+
+            assert result["font_bytes_before"] > result["font_bytes_after"]
+            assert result["font_bytes_saved"] == (
+                result["font_bytes_before"] - result["font_bytes_after"])
+            assert embedded_font_bytes(doc) == result["font_bytes_after"]
+            assert "Secret agent 007 report" in doc[2].get_text()
+
+    def test_redact_pdf_reports_optimization(self, embedded_font_pdf, temp_dir):
+        """Test that the optimization stage is reported in the statistics."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(embedded_font_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Secret"],
+            replacement="X",
+            ignore_case=False,
+            optimize_output=True
+        )
+
+        optimization = result["optimization"]
+        assert optimization["font_bytes_saved"] > 0
+        assert optimization["objects_deduplicated"] > 0
+        assert optimization["prune_bytes_saved"] > 0
+        assert optimization["output_bytes"] == os.path.getsize(output_path)
+        assert "optimize" in result["stage_times"]
+
+        doc = fitz.open(str(output_path))
+        assert all("Secret" not in page.get_text() for page in doc)
+        assert embedded_font_bytes(doc) == result["optimization"]["font_bytes_after"]
+        doc.close()
+
+    def test_output_is_saved_once(self, embedded_font_pdf, temp_dir, monkeypatch):
+        """Test that optimizing does not re-write the finished output."""
+        output_path = temp_dir / "redacted.pdf"
+        saved = []
+        compress_pdf = PDFRedactor.compress_pdf
+
+        def counting_compress_pdf(src_file, dest_file, optimize=False):
+            saved.append(dest_file)
+            return compress_pdf(src_file, dest_file, optimize=optimize)
+
+        monkeypatch.setattr(PDFRedactor, "compress_pdf", staticmethod(counting_compress_pdf))
+        result = PDFRedactor(
+            src_file=str(embedded_font_pdf), dest_file=str(output_path), overwrite=True
+        ).redact_pdf(needles=["Secret"], replacement="X", ignore_case=False, optimize_output=True)
+
+        assert result is not None
+        assert saved == [str(output_path)]
+
+    def test_prune_reports_removed_resources(self, sample_pdf, temp_dir):
+        """Test that pruning counts the resources no page uses and the bytes it saved."""
+        src_path = temp_dir / "unused_image.pdf"
+        with pikepdf.open(str(sample_pdf)) as pdf:
+            image = pikepdf.Stream(pdf, os.urandom(3000))
+            image.Type = pikepdf.Name.XObject
+            image.Subtype = pikepdf.Name.Image
+            image.Width, image.Height = 10, 100
+            image.ColorSpace = pikepdf.Name.DeviceRGB
+            image.BitsPerComponent = 8
+            resources = pdf.pages[0].Resources
+            resources.XObject = pikepdf.Dictionary(Unused=image)
+            pdf.save(str(src_path))
+
+        output_path = temp_dir / "pruned.pdf"
+        with pikepdf.open(str(src_path)) as pdf:
+            result = prune_and_save(pdf, str(output_path), size_before=os.path.getsize(src_path))
+
+        assert result["resources_removed"] == 1
+        assert result["prune_bytes_saved"] > 3000
+        assert result["output_bytes"] == os.path.getsize(output_path)
+        with pikepdf.open(str(output_path)) as pdf:
+            assert "/Unused" not in pdf.pages[0].Resources.get("/XObject", {})
+
+    def test_stream_engine_reports_pruning_only(self, sample_pdf, temp_dir):
+        """Test that the stream engine reports pruning without font figures it did not measure."""
+        output_path = temp_dir / "redacted.pdf"
+        result = PDFRedactor(
+            src_file=str(sample_pdf), dest_file=str(output_path), overwrite=True
+        ).redact_pdf(needles=["test"], replacement="", ignore_case=False,
+                     engine="stream", optimize_output=True)
+
+        optimization = result["optimization"]
+        assert "font_bytes_saved" not in optimization
+        assert optimization["resources_removed"] >= 0
+        assert optimization["output_bytes"] == os.path.getsize(output_path)
@@ -0,0 +1,113 @@
+import json
+import os
+import stat
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pattern_cache import PatternSetCache
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+
+
+class TestPatternSetCache:
+
+    def test_fingerprint_changes_with_config(self):
+        """Test that the cache key depends on the normalized configuration."""
+        base = PatternSetCache.fingerprint(["a", "b"], False, [PatternType.EMAIL])
+
+        assert base == PatternSetCache.fingerprint(["a", "b"], False, ["email"])
+        assert base != PatternSetCache.fingerprint(["a", "c"], False, [PatternType.EMAIL])
+        assert base != PatternSetCache.fingerprint(["a", "b"], True, [PatternType.EMAIL])
+        assert base != PatternSetCache.fingerprint(["a", "b"], False, None)
+
+    def test_fingerprint_includes_package_version(self, monkeypatch):
+        """Test that upgrading the package invalidates cache entries."""
+        key = PatternSetCache.fingerprint(["a"], False)
+        monkeypatch.setattr("pdf_redacter.pattern_cache.__version__", "99.0")
+
+        assert PatternSetCache.fingerprint(["a"], False) != key
+
+    def test_package_exports(self):
+        """Test that the package keeps exporting PDFRedactor next to its version."""
+        import pdf_redacter
+
+        assert pdf_redacter.PDFRedactor is PDFRedactor
+        assert pdf_redacter.__version__
+
+    def test_store_and_load(self, temp_dir):
+        """Test a round trip through the cache."""
+        cache = PatternSetCache(str(temp_dir / "cache"))
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("secret", ignore_case=True)
+
+        assert cache.load("missing") is None
+        cache.store("key", matcher)
+        loaded = cache.load("key")
+
+        assert loaded.patterns == ["secret"]
+        assert loaded.find_matches("Top SECRET") == [(4, 10, "SECRET", "secret")]
+        assert cache.clear() == 1
+
+    def test_corrupt_entry_is_ignored(self, temp_dir):
+        """Test that unreadable entries behave like a miss."""
+        cache = PatternSetCache(str(temp_dir))
+        (temp_dir / "bad.json").write_bytes(b"not json")
+
+        assert cache.load("bad") is None
+
+    def test_entry_is_checksummed_data(self, temp_dir):
+        """Test that entries are JSON data and edited entries are rejected."""
+        cache = PatternSetCache(str(temp_dir / "cache"))
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("secret", ignore_case=False)
+        cache.store("key", matcher)
+        path = temp_dir / "cache" / "key.json"
+
+        entry = json.loads(path.read_text())
+        assert entry["state"]["patterns"] == [["secret", False]]
+        assert stat.S_IMODE(os.stat(temp_dir / "cache").st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+        entry["state"]["patterns"] = [["nothing", False]]
+        path.write_text(json.dumps(entry))
+        assert cache.load("key") is None
+
+    def test_unexpected_patterns_are_ignored(self, temp_dir):
+        """Test that an entry holding other patterns than configured is not used."""
+        cache = PatternSetCache(str(temp_dir))
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("secret", ignore_case=False)
+        cache.store("key", matcher)
+
+        assert cache.load("key", ["secret"], ignore_case=False) is not None
+        assert cache.load("key", ["secret"], ignore_case=True) is None
+        assert cache.load("key", ["other"], ignore_case=False) is None
+
+    def test_shared_directory_is_not_used(self, temp_dir):
+        """Test that a cache directory writable by others is ignored."""
+        cache_dir = temp_dir / "cache"
+        cache = PatternSetCache(str(cache_dir))
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("secret", ignore_case=False)
+        cache.store("key", matcher)
+        os.chmod(cache_dir, 0o777)
+
+        assert cache.load("key") is None
+
+    def test_build_pattern_matcher_warm_start(self, temp_dir, mocker):
+        """Test that a warm start skips validation, analysis and planning."""
+        cache_dir = str(temp_dir / "cache")
+        cold = PDFRedactor.build_pattern_matcher(
+            ["confidential"], True, [PatternType.EMAIL], pattern_cache_dir=cache_dir)
+
+        validate = mocker.patch.object(EnhancedPatternMatcher, "validate_patterns")
+        add_pattern = mocker.patch.object(EnhancedPatternMatcher, "add_pattern")
+        build_plan = mocker.patch("pdf_redacter.pattern_matcher.build_plan")
+        warm = PDFRedactor.build_pattern_matcher(
+            ["confidential"], True, [PatternType.EMAIL], pattern_cache_dir=cache_dir)
+
+        validate.assert_not_called()
+        add_pattern.assert_not_called()
+        build_plan.assert_not_called()
+        assert warm.patterns == cold.patterns
+        assert warm.get_pattern_info() == cold.get_pattern_info()
+        text = "CONFIDENTIAL mail to user@example.com"
+        assert warm.find_matches(text) == cold.find_matches(text)
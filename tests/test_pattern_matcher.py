@@ -1,6 +1,6 @@
 import pytest  
 import re  
-from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType, PatternTemplate  
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType, PatternTemplate, coalesce_spans  
   
 class TestPatternType:  
     """Test the PatternType enum."""  
@@ -286,4 +286,92 @@ class TestEnhancedPatternMatcher:
         assert "Test" in matched_texts  
         assert "CASE" in matched_texts  
         assert "case" in matched_texts  
-        assert "test" not in matched_texts  # Should not match due to case sensitivity
\ No newline at end of file
+        assert "test" not in matched_texts  # Should not match due to case sensitivity
+
+    def test_pattern_timings_disabled_by_default(self):
+        """Test that no timings are collected unless requested."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("test", ignore_case=False)
+        matcher.find_matches("test test")
+
+        assert matcher.get_pattern_timings() == []
+
+    def test_pattern_timings_accumulate(self):
+        """Test per-pattern time and hit accounting across calls."""
+        matcher = EnhancedPatternMatcher(collect_timings=True)
+        matcher.add_pattern("test", ignore_case=False)
+        matcher.add_predefined_pattern(PatternType.EMAIL)
+
+        matcher.find_matches("test user@example.com")
+        matcher.find_matches("test test")
+
+        timings = matcher.get_pattern_timings()
+        assert len(timings) == 2
+        # Sorted by cost
+        assert timings[0]["time"] >= timings[1]["time"]
+        by_pattern = {t["pattern"]: t for t in timings}
+        assert by_pattern["test"]["matches"] == 3
+        assert by_pattern["test"]["scans"] == 2
+        assert sum(t["share"] for t in timings) == pytest.approx(1.0)
+
+        matcher.reset_pattern_timings()
+        assert matcher.get_pattern_timings() == []
+
+    def test_iter_spans_merged_order(self):
+        """Test that the lazy iterator merges pattern streams by position."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("testing", ignore_case=False)
+        matcher.add_pattern("test", ignore_case=False)
+        matcher.add_pattern(r"\d+", ignore_case=False)
+
+        text = "1 testing 22 test 333"
+        spans = matcher.iter_spans(text)
+
+        assert not isinstance(spans, list)
+        # Ties on the start position keep the pattern order
+        assert list(spans) == [
+            (0, 1, 2), (2, 9, 0), (2, 6, 1), (10, 12, 2), (13, 17, 1), (18, 21, 2)
+        ]
+        assert list(matcher.iter_matches(text)) == matcher.find_matches(text)
+
+    def test_iter_spans_early_exit_records_timing(self):
+        """Test that abandoning the iterator still accounts scan time."""
+        matcher = EnhancedPatternMatcher(collect_timings=True)
+        matcher.add_pattern("a", ignore_case=False)
+
+        spans = matcher.iter_spans("a a a a")
+        assert next(spans) == (0, 1, 0)
+        spans.close()
+
+        timings = matcher.get_pattern_timings()
+        assert timings[0]["matches"] == 1
+        assert timings[0]["scans"] == 1
+
+    def test_has_matches(self):
+        """Test the early-exit match check."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_predefined_pattern(PatternType.EMAIL)
+        matcher.add_pattern("secret", ignore_case=True)
+
+        assert matcher.has_matches("Top SECRET")
+        assert not matcher.has_matches("nothing to see here")
+
+    def test_iter_disjoint_spans(self):
+        """Test that overlapping matches are merged with their pattern ids."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_predefined_pattern(PatternType.SSN)
+        matcher.add_predefined_pattern(PatternType.PHONE)
+        matcher.add_pattern("ID", ignore_case=False)
+
+        text = "ID 123456789 and 12"
+        spans = list(matcher.iter_disjoint_spans(text))
+
+        assert spans == [(0, 2, (2,)), (3, 12, (0, 1))]
+
+    def test_coalesce_spans_touching(self):
+        """Test that touching spans stay separate and nested spans merge."""
+        spans = [(0, 5, 0), (5, 8, 1), (6, 7, 2), (7, 10, 0)]
+
+        assert list(coalesce_spans(spans)) == [(0, 5, (0,)), (5, 10, (1, 2, 0))]
+        assert list(coalesce_spans([])) == []
+
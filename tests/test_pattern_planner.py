@@ -0,0 +1,125 @@
+import random
+import re
+
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+from pdf_redacter.pattern_planner import (
+    COMBINED, LITERAL, PER_PATTERN, PREFIX, REGEX, build_plan, classify_pattern,
+    literal_trie_regex
+)
+
+
+def matcher_for(patterns, ignore_case=False):
+    matcher = EnhancedPatternMatcher()
+    for pattern in patterns:
+        matcher.add_pattern(pattern, ignore_case)
+    return matcher
+
+
+def per_pattern_spans(matcher, text):
+    """Spans of the matcher scanned one pattern at a time, as before planning."""
+    matcher.collect_timings = True
+    try:
+        return list(matcher.iter_spans(text))
+    finally:
+        matcher.collect_timings = False
+
+
+class TestClassification:
+
+    @pytest.mark.parametrize("pattern,expected", [
+        (r"ACME Corp", (LITERAL, "ACME Corp")),
+        (r"john\.doe", (LITERAL, "john.doe")),
+        (r"ACME-\d{6}", (PREFIX, "ACME-")),
+        (r"\d{3}-\d{4}", (REGEX, "")),
+        (r"foo|bar", (REGEX, "")),
+    ])
+    def test_classify(self, pattern, expected):
+        """Test that patterns are classified as literal, literal prefix or general regex."""
+        assert classify_pattern(re.compile(pattern)) == expected
+
+    def test_multiline_is_general(self):
+        """Test that flags outside the analysis make a pattern a general regex."""
+        assert classify_pattern(re.compile("abc", re.MULTILINE)) == (REGEX, "")
+
+    def test_trie_regex(self):
+        """Test that common prefixes are factored out of the alternation."""
+        regex = literal_trie_regex(["alpha1", "alpha2", "beta"])
+
+        assert regex == "(?:alpha(?:1|2)|beta)"
+        assert re.findall(regex, "alpha2 beta alpha3") == ["alpha2", "beta"]
+
+
+class TestPatternPlan:
+
+    def test_overlapping_literals_stay_separate(self):
+        """Test that literals whose matches can overlap are not combined."""
+        compiled = [re.compile(pattern) for pattern in
+                    ["ACME-1", "ACME-2", "ACME-22", "ACME-3", "ACME-33x", "3x"]]
+        plan = build_plan(compiled)
+
+        combined = plan.combined_groups
+        assert len(combined) == 1
+        assert combined[0].pattern_ids == [0, 2]
+        separate = {pattern_id for group in plan.groups if group.strategy == PER_PATTERN
+                    for pattern_id in group.pattern_ids}
+        assert separate == {1, 3, 4, 5}
+
+    def test_few_unrelated_literals_not_combined(self):
+        """Test that literals without a shared prefix are only combined in numbers."""
+        assert not build_plan([re.compile(p) for p in ["alpha", "beta", "gamma"]]).combined_groups
+        many = [re.compile(f"{first}{number}x") for first in "ab" for number in range(4)]
+        assert build_plan(many).combined_groups
+
+    def test_same_matches_as_per_pattern(self):
+        """Test that combined evaluation finds exactly the per-pattern matches."""
+        rng = random.Random(7)
+        literals = sorted({f"id-{rng.randint(0, 40):02d}" for _ in range(30)})
+        for ignore_case in (False, True):
+            # "d-1" overlaps the combined literals, "\d\d" is a general regex
+            matcher = matcher_for(literals + ["d-1", r"\d\d"], ignore_case)
+            assert matcher.plan_patterns().combined_groups
+            for _ in range(50):
+                text = "".join(rng.choices(["id-", "ID-", "1", "2", "0", " "], k=40))
+                assert list(matcher.iter_spans(text)) == per_pattern_spans(matcher, text)
+
+    def test_case_insensitive_lookup(self):
+        """Test that matches are attributed to the right pattern regardless of case."""
+        matcher = matcher_for(["acme-one", "acme-two"], ignore_case=True)
+
+        assert matcher.plan_patterns().combined_groups
+        assert [span[2] for span in matcher.iter_spans("ACME-TWO and Acme-One")] == [1, 0]
+        # U+212A KELVIN SIGN folds to "k" without being ASCII
+        matcher = matcher_for(["k-one", "k-two"], ignore_case=True)
+        assert list(matcher.iter_spans("K-two")) == [(0, 5, 1)]
+
+    def test_subset_and_has_matches(self):
+        """Test that evaluating a subset of the patterns and has_matches use the plan correctly."""
+        matcher = matcher_for(["alpha1", "alpha2", r"\d{4}"])
+
+        assert list(matcher.iter_spans("alpha1 alpha2 2024", pattern_ids=[1])) == [(7, 13, 1)]
+        assert matcher.has_matches("xx alpha2")
+        assert not matcher.has_matches("alpha3")
+
+    def test_explain_and_replan(self):
+        """Test that the explanation lists every pattern once and adding patterns replans."""
+        matcher = matcher_for(["alpha1", "alpha2"])
+        matcher.add_predefined_pattern(PatternType.EMAIL)
+        groups = matcher.explain_patterns()
+
+        assert sorted(p for group in groups for p in group["patterns"]) == sorted(matcher.patterns)
+        assert groups[0]["strategy"] == COMBINED
+        matcher.add_pattern("alpha3")
+        assert matcher.plan_patterns().combined_groups[0].pattern_ids == [0, 1, 3]
+
+    def test_plan_stored_in_pattern_cache(self, temp_dir):
+        """Test that a warm start loads the plan with the matcher."""
+        cache_dir = str(temp_dir / "cache")
+        PDFRedactor.build_pattern_matcher(["alpha1", "alpha2"], False, pattern_cache_dir=cache_dir)
+        matcher = PDFRedactor.build_pattern_matcher(
+            ["alpha1", "alpha2"], False, pattern_cache_dir=cache_dir)
+
+        assert matcher._plan is not None
+        assert matcher._plan.combined_groups[0].pattern_ids == [0, 1]
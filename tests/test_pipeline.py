@@ -0,0 +1,86 @@
+import shutil
+
+import fitz
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pipeline import RedactionPipeline, prefetch_file
+
+
+REDACTION_ARGS = {"needles": [r"user\d@example\.com"], "replacement": "", "ignore_case": False}
+
+
+@pytest.fixture
+def documents(multi_page_pdf, temp_dir):
+    """Four copies of the multi-page PDF with their destinations."""
+    pairs = []
+    for number in range(4):
+        src = temp_dir / f"in{number}.pdf"
+        shutil.copy(str(multi_page_pdf), str(src))
+        pairs.append((str(src), str(temp_dir / "out" / f"out{number}.pdf")))
+    return pairs
+
+
+class TestRedactionPipeline:
+
+    def test_batch_redacted_in_order(self, documents, temp_dir):
+        """Test that every document is redacted, compressed and reported in input order."""
+        result = RedactionPipeline(
+            REDACTION_ARGS, redact_workers=2, compress_workers=2, spool_dir=str(temp_dir)
+        ).run(iter(documents))
+
+        assert result["documents_done"] == 4
+        assert result["documents_failed"] == 0
+        assert [row["dest"] for row in result["results"]] == [dest for _, dest in documents]
+        assert all(row["total_matches"] == 5 for row in result["results"])
+        for _, dest in documents:
+            with fitz.open(dest) as doc:
+                assert "@example.com" not in "".join(page.get_text() for page in doc)
+        # Temporary files are removed with the spool
+        assert not list(temp_dir.glob("pdf_redacter_*"))
+
+    def test_stage_stats(self, documents):
+        """Test that every stage reports its documents and utilization."""
+        stages = RedactionPipeline(REDACTION_ARGS, queue_size=1).run(documents)["stages"]
+
+        assert list(stages) == ["prefetch", "redact", "compress"]
+        for stats in stages.values():
+            assert stats["documents"] == 4
+            assert 0.0 <= stats["utilization"] <= 1.0
+        assert stages["redact"]["busy_seconds"] > 0
+        assert stages["prefetch"]["workers"] == 2
+
+    def test_failures_reported_per_stage(self, documents, temp_dir):
+        """Test that a failing document is reported with its stage and the others still finish."""
+        documents[1] = (str(temp_dir / "missing.pdf"), str(temp_dir / "out" / "missing.pdf"))
+        (temp_dir / "out").mkdir()
+        (temp_dir / "out" / "out2.pdf").write_bytes(b"existing")
+
+        result = RedactionPipeline(REDACTION_ARGS).run(documents)
+
+        assert result["documents_done"] == 2
+        assert result["documents_failed"] == 2
+        assert result["results"][1]["stage"] == "prefetch"
+        assert "FileExistsError" in result["results"][2]["error"]
+        assert (temp_dir / "out" / "out2.pdf").read_bytes() == b"existing"
+
+    def test_output_matches_sequential_redaction(self, multi_page_pdf, temp_dir):
+        """Test that pipelined output has the same text as a direct redact_pdf call."""
+        direct = temp_dir / "direct.pdf"
+        PDFRedactor(src_file=str(multi_page_pdf), dest_file=str(direct)).redact_pdf(**REDACTION_ARGS)
+        piped = temp_dir / "piped.pdf"
+        RedactionPipeline(REDACTION_ARGS).run([(str(multi_page_pdf), str(piped))])
+
+        with fitz.open(str(direct)) as direct_doc, fitz.open(str(piped)) as piped_doc:
+            assert [page.get_text() for page in piped_doc] == [page.get_text() for page in direct_doc]
+
+    def test_invalid_configuration(self):
+        """Test that non-positive stage sizes are rejected."""
+        with pytest.raises(ValueError):
+            RedactionPipeline(REDACTION_ARGS, redact_workers=0)
+        with pytest.raises(ValueError):
+            RedactionPipeline(REDACTION_ARGS, queue_size=0)
+
+    def test_prefetch_file(self, multi_page_pdf):
+        """Test that prefetching reads the whole file."""
+        assert prefetch_file(str(multi_page_pdf)) == multi_page_pdf.stat().st_size
@@ -0,0 +1,124 @@
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+import pytest
+import yaml
+
+from pdf_redacter.args_processor import ArgsProcessor
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.engine import RedactionEngine
+from pdf_redacter.plan import RedactionPlan
+from pdf_redacter.templates import RedactionTemplate
+
+
+PATTERN = r"user\d@example\.com"
+
+
+class TestRedactionPlan:
+
+    def test_plan_holds_no_matched_text(self, multi_page_pdf, temp_dir):
+        """Test that a saved plan has rects and counts but none of the matched text."""
+        engine = RedactionEngine(needles=[PATTERN], replacement="")
+        plan_file = temp_dir / "plan.json"
+
+        plan = engine.plan(str(multi_page_pdf))
+        plan.save(str(plan_file))
+
+        content = plan_file.read_text()
+        assert "example.com\"" not in content and "user1@" not in content
+        assert plan.page_count == 5
+        assert [page.page for page in plan.pages] == [0, 1, 2, 3, 4]
+        assert all(page.matches == {0: 1} and len(page.rects) == 1 for page in plan.pages)
+        assert plan.total_matches == 5
+
+    def test_round_trip(self, multi_page_pdf, temp_dir):
+        """Test that a plan loads back unchanged."""
+        plan = RedactionEngine(needles=[PATTERN], replacement="X").plan(str(multi_page_pdf))
+        plan_file = temp_dir / "plan.json"
+        plan.save(str(plan_file))
+
+        assert RedactionPlan.load(str(plan_file)) == plan
+
+    def test_apply_matches_direct_redaction(self, multi_page_pdf, temp_dir):
+        """Test that applying a plan gives the same output and stats as redact_pdf."""
+        engine = RedactionEngine(needles=[PATTERN], replacement="")
+        direct = engine.redact(str(multi_page_pdf), str(temp_dir / "direct.pdf"))
+        applied = engine.apply(engine.plan(str(multi_page_pdf)), str(temp_dir / "applied.pdf"))
+
+        for key in ("total_matches", "pages_processed", "pages_modified", "matches_by_pattern",
+                    "annotations_applied"):
+            assert applied[key] == direct[key]
+        assert set(applied["stage_times"]) == {"open", "apply", "save"}
+        with fitz.open(str(temp_dir / "direct.pdf")) as direct_doc, \
+                fitz.open(str(temp_dir / "applied.pdf")) as applied_doc:
+            assert [page.get_text() for page in applied_doc] \
+                == [page.get_text() for page in direct_doc]
+
+    def test_apply_does_no_text_work(self, multi_page_pdf, temp_dir, mocker):
+        """Test that the apply phase neither extracts nor searches text."""
+        plan = RedactionEngine(needles=[PATTERN], replacement="").plan(str(multi_page_pdf))
+        get_text = mocker.spy(fitz.Page, "get_text")
+        search_for = mocker.spy(fitz.Page, "search_for")
+
+        result = PDFRedactor(
+            src_file=str(multi_page_pdf), dest_file=str(temp_dir / "out.pdf")).apply_plan(plan)
+
+        assert result["total_matches"] == 5
+        assert get_text.call_count == 0
+        assert search_for.call_count == 0
+
+    def test_concurrent_apply_counts_documents(self, multi_page_pdf, temp_dir):
+        """Test that applying plans from several threads counts every document."""
+        engine = RedactionEngine(needles=[PATTERN], replacement="")
+        plan = engine.plan(str(multi_page_pdf))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda run: engine.apply(plan, str(temp_dir / f"out{run}.pdf")), range(8)))
+
+        assert all(result["total_matches"] == 5 for result in results)
+        assert engine.documents == 8
+
+    def test_source_mismatch_rejected(self, multi_page_pdf, sample_pdf, temp_dir):
+        """Test that a plan is only applied to the file it was made for."""
+        plan = RedactionEngine(needles=[PATTERN], replacement="").plan(str(multi_page_pdf))
+        moved = temp_dir / "moved.pdf"
+        shutil.copy(str(multi_page_pdf), str(moved))
+
+        with pytest.raises(ValueError):
+            PDFRedactor(src_file=str(sample_pdf), dest_file=str(temp_dir / "a.pdf")).apply_plan(plan)
+        assert RedactionEngine(needles=[PATTERN]).apply(
+            plan, str(temp_dir / "b.pdf"), src_file=str(moved))["total_matches"] == 5
+
+    def test_template_and_version(self, multi_page_pdf, temp_dir):
+        """Test that template pages are planned without matches and unknown versions are rejected."""
+        template = RedactionTemplate.from_dict({"pages": {1: [[50, 40, 300, 80]]}})
+        plan = RedactionEngine(template=template, replacement="").plan(str(multi_page_pdf))
+
+        assert len(plan.pages) == 1 and plan.pages[0].template
+        assert plan.to_stats().template_pages == 1
+
+        plan_dict = plan.to_dict()
+        plan_dict["version"] = 99
+        plan_file = temp_dir / "plan.json"
+        plan_file.write_text(json.dumps(plan_dict))
+        with pytest.raises(ValueError):
+            RedactionPlan.load(str(plan_file))
+
+    def test_options_with_config_file(self, multi_page_pdf, temp_dir):
+        """Test that plan and apply options given with --config-file are not replaced by its defaults."""
+        config_file = temp_dir / "config.yml"
+        config_file.write_text(yaml.safe_dump({"searches": [PATTERN]}))
+        parser = ArgsProcessor.generate_argument_parser()
+
+        plan_config = ArgsProcessor.load_configuration(parser.parse_args([
+            "--config-file", str(config_file), "-i", str(multi_page_pdf),
+            "--plan-output", str(temp_dir / "plan.json")]))
+        apply_config = ArgsProcessor.load_configuration(parser.parse_args([
+            "--config-file", str(config_file), "-o", str(temp_dir / "out.pdf"),
+            "--apply-plan", str(temp_dir / "plan.json")]))
+
+        assert plan_config["plan_output"] == str(temp_dir / "plan.json")
+        assert apply_config["apply_plan"] == str(temp_dir / "plan.json")
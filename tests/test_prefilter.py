@@ -0,0 +1,93 @@
+import re
+
+import pytest
+
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+from pdf_redacter.prefilter import build_prefilter
+
+
+class TestBuildPrefilter:
+
+    def test_email_requires_at_sign(self):
+        """Test that the email template requires an '@'."""
+        template = EnhancedPatternMatcher.PATTERN_TEMPLATES[PatternType.EMAIL]
+        prefilter = build_prefilter(re.compile(template.pattern))
+
+        assert "@" in prefilter.literals
+        assert not prefilter.may_match("No addresses on this page.")
+        assert prefilter.may_match("Write to test@example.com")
+
+    def test_digit_runs(self):
+        """Test that mandatory repeats become character-class runs."""
+        prefilter = build_prefilter(re.compile(r"ACCT-\d{6}"))
+
+        assert prefilter.literals == ("ACCT-",)
+        assert not prefilter.may_match("ACCT- 12345")
+        assert prefilter.may_match("ACCT- 123456")
+
+    @pytest.mark.parametrize("pattern", [r"x*", r"a|b?", r"(?=abc)"])
+    def test_no_requirements(self, pattern):
+        """Test that patterns without mandatory parts get no prefilter."""
+        assert build_prefilter(re.compile(pattern)) is None
+
+    def test_ignore_case_uses_pattern_flags(self):
+        """Test Unicode case folding, e.g. the Kelvin sign matching 'k'."""
+        compiled = re.compile("kelvin", re.IGNORECASE)
+        prefilter = build_prefilter(compiled)
+
+        assert prefilter.literals == ()
+        assert prefilter.may_match("KELVIN")
+        assert compiled.search("KELVIN")
+
+    @pytest.mark.parametrize("pattern,text", [
+        (r"(ab)+c", "xxababc"),
+        (r"Stra(ß|ss)e", "Strasse"),
+        (r"(?i:secret) file", "SECRET file"),
+        (r"\b\d{3}-?\d{2}-?\d{4}\b", "SSN 123456789"),
+        (r"[^a-z]{2}@", "AB@")
+    ])
+    def test_never_rejects_a_match(self, pattern, text):
+        """Test that text the pattern matches always passes the prefilter."""
+        compiled = re.compile(pattern)
+        prefilter = build_prefilter(compiled)
+
+        assert compiled.search(text)
+        assert prefilter is None or prefilter.may_match(text)
+
+
+class TestMatcherPrefilter:
+
+    def test_skips_are_counted(self):
+        """Test that skipped scans are counted per pattern."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_predefined_pattern(PatternType.EMAIL)
+        matcher.add_pattern("x*")
+
+        for text in ["no address", "none here", "a@b.com"]:
+            matcher.find_matches(text)
+
+        prefilter_stats = matcher.get_prefilter_stats()
+        assert len(prefilter_stats) == 1
+        assert prefilter_stats[0]["checked"] == 3
+        assert prefilter_stats[0]["skipped"] == 2
+        assert prefilter_stats[0]["skip_rate"] == pytest.approx(2 / 3)
+
+        matcher.reset_prefilter_stats()
+        assert matcher.get_prefilter_stats()[0]["checked"] == 0
+
+    def test_results_unchanged(self):
+        """Test that skipping patterns does not change the matches."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_predefined_pattern(PatternType.EMAIL)
+        matcher.add_predefined_pattern(PatternType.SSN)
+        matcher.add_pattern("Confidential", ignore_case=True)
+
+        text = "CONFIDENTIAL: mail test@example.com, SSN 123-45-6789"
+        expected = sorted(
+            (match.start(), match.end())
+            for compiled, _ in matcher._compiled_patterns
+            for match in compiled.finditer(text)
+        )
+
+        assert sorted((start, end) for start, end, _, _ in matcher.find_matches(text)) == expected
+        assert not matcher.has_matches("nothing to see")
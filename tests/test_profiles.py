@@ -0,0 +1,103 @@
+import fitz
+import pytest
+
+from pdf_redacter.config import RedactionConfig, RedactionProfile
+from pdf_redacter.pattern_matcher import PatternType
+from pdf_redacter.profiles import MultiProfileRedactor
+
+
+class TestRedactionProfile:
+
+    def test_from_dict(self):
+        """Test that profiles are read from the config dictionary layout."""
+        config = RedactionConfig.from_dict({
+            "searches": [],
+            "profiles": [{"name": "internal", "output_file": "internal.pdf",
+                          "predefined_patterns": ["ssn"]}]
+        })
+
+        profile = RedactionProfile.from_dict(config.profiles[0])
+
+        assert profile.name == "internal"
+        assert profile.predefined_patterns == ["ssn"]
+        assert profile.replacement is None
+
+    def test_missing_output_file(self):
+        """Test that a profile without an output file is rejected."""
+        with pytest.raises(ValueError, match="output_file"):
+            RedactionProfile.from_dict({"name": "internal"})
+
+
+class TestMultiProfileRedactor:
+
+    def test_one_output_per_profile(self, sample_pdf, temp_dir):
+        """Test that every profile gets its own output with only its matches redacted."""
+        external = temp_dir / "external.pdf"
+        internal = temp_dir / "internal.pdf"
+        profiles = [
+            RedactionProfile(name="external", output_file=str(external),
+                             predefined_patterns=["email", "phone", "ssn", "credit_card"]),
+            RedactionProfile(name="internal", output_file=str(internal),
+                             predefined_patterns=["ssn"])
+        ]
+
+        result = MultiProfileRedactor(str(sample_pdf)).redact_profiles(
+            profiles, ignore_case=False, needles=["Confidential"])
+
+        assert result["pages_processed"] == 1
+        assert set(result["stage_times"]) == {"open", "extract", "match"}
+
+        external_stats = result["profiles"]["external"]
+        internal_stats = result["profiles"]["internal"]
+        assert external_stats["patterns_used"] == 5
+        assert internal_stats["patterns_used"] == 2
+        assert internal_stats["total_matches"] == 2
+        assert external_stats["total_matches"] > internal_stats["total_matches"]
+
+        with fitz.open(str(external)) as doc:
+            text = doc[0].get_text()
+        assert "test@example.com" not in text
+        assert "123-45-6789" not in text
+        assert "Confidential" not in text
+
+        with fitz.open(str(internal)) as doc:
+            text = doc[0].get_text()
+        assert "test@example.com" in text
+        assert "123-45-6789" not in text
+        assert "Confidential" not in text
+
+    def test_matches_same_as_single_runs(self, sample_pdf, temp_dir):
+        """Test that a profile finds the same matches as a redact_pdf run with its patterns."""
+        from pdf_redacter.core import PDFRedactor
+
+        single = PDFRedactor(str(sample_pdf), str(temp_dir / "single.pdf")).redact_pdf(
+            needles=None, replacement="", ignore_case=False,
+            predefined_patterns=[PatternType.SSN, PatternType.CREDIT_CARD])
+
+        result = MultiProfileRedactor(str(sample_pdf)).redact_profiles(
+            [RedactionProfile(name="cards", output_file=str(temp_dir / "cards.pdf"),
+                              predefined_patterns=["ssn", "credit_card"]),
+             RedactionProfile(name="mail", output_file=str(temp_dir / "mail.pdf"),
+                              predefined_patterns=["email"])],
+            ignore_case=False)
+
+        assert result["profiles"]["cards"]["matches_by_pattern"] == single["matches_by_pattern"]
+
+    def test_existing_output_rejected(self, sample_pdf, temp_dir):
+        """Test that existing outputs are not overwritten unless requested."""
+        output = temp_dir / "internal.pdf"
+        output.write_bytes(b"")
+        profiles = [RedactionProfile(name="internal", output_file=str(output),
+                                     searches=["Confidential"])]
+
+        with pytest.raises(FileExistsError):
+            MultiProfileRedactor(str(sample_pdf)).redact_profiles(profiles, ignore_case=False)
+
+    def test_duplicate_outputs_rejected(self, sample_pdf, temp_dir):
+        """Test that two profiles cannot write the same file."""
+        output = str(temp_dir / "out.pdf")
+        profiles = [RedactionProfile(name="a", output_file=output, searches=["x"]),
+                    RedactionProfile(name="b", output_file=output, searches=["y"])]
+
+        with pytest.raises(ValueError, match="own output file"):
+            MultiProfileRedactor(str(sample_pdf)).redact_profiles(profiles, ignore_case=False)
@@ -0,0 +1,97 @@
+import fitz
+import pytest
+
+from pdf_redacter import raster
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.raster import fill_boxes, pixel_boxes, rasterize_pages
+
+
+@pytest.fixture
+def failing_pages(monkeypatch):
+    """Make apply_redactions() fail on pages 1 and 3."""
+    apply_redactions = fitz.Page.apply_redactions
+
+    def failing_apply(page, *args, **kwargs):
+        if page.number in (1, 3):
+            raise RuntimeError("cannot apply")
+        return apply_redactions(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "apply_redactions", failing_apply)
+
+
+def redact(src, dest, **kwargs):
+    return PDFRedactor(src_file=str(src), dest_file=str(dest)).redact_pdf(
+        needles=[r"user\d@example\.com"], replacement="", ignore_case=False, **kwargs)
+
+
+class TestFillBoxes:
+
+    def test_numpy_and_mupdf_fill_agree(self, monkeypatch):
+        """Test that the NumPy slices black out the same pixels as MuPDF."""
+        boxes = [(2, 3, 10, 8), (15, 0, 20, 20)]
+        pixmaps = []
+        for use_numpy in (True, False):
+            if not use_numpy:
+                monkeypatch.setattr(raster, "np", None)
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 24, 20), False)
+            pix.clear_with(255)
+            fill_boxes(pix, boxes)
+            pixmaps.append(pix.samples)
+
+        assert pixmaps[0] == pixmaps[1]
+        assert pixmaps[0].count(0) == 3 * (8 * 5 + 5 * 20)
+
+    def test_pixel_boxes_rotated_page(self):
+        """Test that rects are mapped onto the rendered image of a rotated page."""
+        doc = fitz.open()
+        page = doc.new_page(width=600, height=300)
+        page.set_rotation(90)
+
+        boxes = pixel_boxes([(50, 40, 130, 50)], page, fitz.Matrix(2, 2), 600, 1200)
+
+        assert boxes == [(499, 99, 521, 261)]
+
+
+class TestRasterFallback:
+
+    def test_failed_pages_rasterized(self, multi_page_pdf, temp_dir, failing_pages):
+        """Test that failed pages are replaced by images without the matches."""
+        dest = temp_dir / "out.pdf"
+        result = redact(multi_page_pdf, dest, raster_fallback=True, raster_dpi=72)
+
+        assert result["rasterized_pages"] == [1, 3]
+        assert result["pages_failed_redaction"] == 2
+        assert "raster" in result["stage_times"]
+        with fitz.open(str(dest)) as doc:
+            assert len(doc) == 5
+            assert doc[1].get_text() == ""
+            assert len(doc[1].get_images()) == 1
+            assert "Page 3" in doc[2].get_text()
+
+    def test_parallel_same_as_serial(self, multi_page_pdf, temp_dir):
+        """Test that pages rendered in worker processes are identical."""
+        rects = {1: [(50, 40, 200, 70)], 3: [(50, 40, 200, 70)]}
+        outputs = []
+        for workers in (1, 2):
+            with fitz.open(str(multi_page_pdf)) as doc:
+                assert rasterize_pages(doc, rects, dpi=72, workers=workers) == [1, 3]
+                outputs.append([page.get_pixmap().samples for page in doc])
+
+        assert outputs[0] == outputs[1]
+
+    def test_without_fallback_pages_removed(self, multi_page_pdf, temp_dir, failing_pages):
+        """Test that failed pages are still removed when the fallback is off."""
+        dest = temp_dir / "out.pdf"
+        result = PDFRedactor(
+            src_file=str(multi_page_pdf), dest_file=str(dest), skip_redact_failed_pages=True
+        ).redact_pdf(needles=[r"user\d@example\.com"], replacement="", ignore_case=False)
+
+        assert "rasterized_pages" not in result
+        with fitz.open(str(dest)) as doc:
+            assert len(doc) == 3
+
+    def test_invalid_dpi(self, multi_page_pdf):
+        """Test that a non-positive resolution is rejected."""
+        with fitz.open(str(multi_page_pdf)) as doc:
+            with pytest.raises(ValueError):
+                rasterize_pages(doc, {0: []}, dpi=0)
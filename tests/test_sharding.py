@@ -0,0 +1,264 @@
+import json
+import os
+import pytest
+import fitz
+
+from pdf_redacter.args_processor import ArgsProcessor
+from pdf_redacter.cli import PdfRedacterCLI
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pattern_matcher import PatternType
+from pdf_redacter.sharding import (
+    ShardCoordinator, ShardWorker, ShardMerger, aggregate_stats
+)
+from pdf_redacter.templates import RedactionTemplate
+
+
+class TestSharding:
+
+    def _create_job(self, multi_page_pdf, temp_dir, pages_per_shard=2):
+        queue_dir = temp_dir / "queue"
+        task_count = ShardCoordinator(str(queue_dir)).create_job(
+            src_file=str(multi_page_pdf),
+            dest_file=str(temp_dir / "sharded.pdf"),
+            redaction_args={
+                "needles": ["Confidential"],
+                "replacement": "[REDACTED]",
+                "ignore_case": False,
+                "predefined_patterns": [PatternType.EMAIL]
+            },
+            pages_per_shard=pages_per_shard
+        )
+        return queue_dir, task_count
+
+    def test_create_job_splits_page_ranges(self, multi_page_pdf, temp_dir):
+        """Test that the coordinator enqueues one task per page range."""
+        queue_dir, task_count = self._create_job(multi_page_pdf, temp_dir)
+
+        assert task_count == 3
+        tasks = sorted((queue_dir / "pending").glob("*.json"))
+        ranges = [(json.loads(t.read_text())["first_page"],
+                   json.loads(t.read_text())["last_page"]) for t in tasks]
+        assert ranges == [(0, 1), (2, 3), (4, 4)]
+
+        job = json.loads((queue_dir / "job.json").read_text())
+        assert job["redaction_args"]["predefined_patterns"] == ["email"]
+
+    def test_claim_is_exclusive(self, multi_page_pdf, temp_dir):
+        """Test that a task can only be claimed by one worker."""
+        queue_dir, _ = self._create_job(
+            multi_page_pdf, temp_dir, pages_per_shard=5)
+
+        first = ShardWorker(str(queue_dir), worker_id="a")
+        second = ShardWorker(str(queue_dir), worker_id="b")
+
+        assert first.claim_task() is not None
+        assert second.claim_task() is None
+
+    def test_workers_and_merge(self, multi_page_pdf, temp_dir):
+        """Test end-to-end sharded redaction with two workers."""
+        queue_dir, _ = self._create_job(multi_page_pdf, temp_dir)
+
+        assert ShardWorker(str(queue_dir), worker_id="a").run(max_tasks=1) == 1
+        assert ShardWorker(str(queue_dir), worker_id="b").run() == 2
+
+        stats = ShardMerger(str(queue_dir)).merge()
+
+        assert stats["pages_processed"] == 5
+        assert stats["total_matches"] == 10
+        assert stats["patterns_used"] == 2
+
+        doc = fitz.open(str(temp_dir / "sharded.pdf"))
+        assert len(doc) == 5
+        for page_num, page in enumerate(doc):
+            page_text = page.get_text()
+            assert f"Page {page_num + 1}" in page_text
+            assert "@example.com" not in page_text
+            assert "[REDACTED]" in page_text
+        doc.close()
+
+        assert (queue_dir / "stats.json").exists()
+
+    def test_merge_keeps_metadata_and_outline(self, multi_page_pdf, temp_dir):
+        """Test that the merged output keeps the metadata and outline of an unsharded run."""
+        with fitz.open(str(multi_page_pdf)) as doc:
+            doc.set_metadata({"title": "Quarterly report", "author": "Finance"})
+            doc.set_toc([[1, "Start", 1], [2, "Details", 3], [1, "End", 5]])
+            doc.saveIncr()
+        queue_dir, _ = self._create_job(multi_page_pdf, temp_dir)
+        ShardWorker(str(queue_dir)).run()
+        ShardMerger(str(queue_dir)).merge()
+        PDFRedactor(
+            src_file=str(multi_page_pdf), dest_file=str(temp_dir / "single.pdf")
+        ).redact_pdf(needles=["Confidential"], replacement="[REDACTED]", ignore_case=False,
+                     predefined_patterns=[PatternType.EMAIL])
+
+        with fitz.open(str(temp_dir / "sharded.pdf")) as sharded, \
+                fitz.open(str(temp_dir / "single.pdf")) as single:
+            assert sharded.get_toc() == single.get_toc() == [
+                [1, "Start", 1], [2, "Details", 3], [1, "End", 5]]
+            for key in ("title", "author"):
+                assert sharded.metadata[key] == single.metadata[key]
+            assert sharded.metadata["title"] == "Quarterly report"
+
+    def test_merge_maps_outline_past_removed_pages(self, multi_page_pdf, temp_dir, monkeypatch):
+        """Test that outline entries follow pages removed by the workers."""
+        with fitz.open(str(multi_page_pdf)) as doc:
+            doc.set_toc([[1, "One", 1], [1, "Two", 2], [1, "Three", 3], [1, "Five", 5]])
+            doc.saveIncr()
+        queue_dir = temp_dir / "queue"
+        ShardCoordinator(str(queue_dir)).create_job(
+            src_file=str(multi_page_pdf),
+            dest_file=str(temp_dir / "sharded.pdf"),
+            redaction_args={"needles": ["Confidential"], "replacement": "", "ignore_case": False},
+            pages_per_shard=2,
+            skip_redact_failed_pages=True
+        )
+        apply_redactions = fitz.Page.apply_redactions
+
+        def fail_second_page(page, *args, **kwargs):
+            # The second page of every shard: source pages 2 and 4
+            if page.number == 1:
+                raise RuntimeError("cannot apply")
+            return apply_redactions(page, *args, **kwargs)
+
+        monkeypatch.setattr(fitz.Page, "apply_redactions", fail_second_page)
+        ShardWorker(str(queue_dir)).run()
+        stats = ShardMerger(str(queue_dir)).merge()
+
+        assert stats["removed_pages"] == [1, 3]
+        with fitz.open(str(temp_dir / "sharded.pdf")) as doc:
+            assert len(doc) == 3
+            assert doc.get_toc() == [[1, "One", 1], [1, "Two", -1], [1, "Three", 2], [1, "Five", 3]]
+
+    def test_template_pages_keep_document_numbers(self, multi_page_pdf, temp_dir):
+        """Test that template page rects land on the same pages when sharded."""
+        queue_dir = temp_dir / "queue"
+        ShardCoordinator(str(queue_dir)).create_job(
+            src_file=str(multi_page_pdf),
+            dest_file=str(temp_dir / "sharded.pdf"),
+            redaction_args={
+                "needles": None,
+                "replacement": "",
+                "ignore_case": False,
+                "template": RedactionTemplate.load({"pages": {4: [[40, 30, 200, 50]]}})
+            },
+            pages_per_shard=2
+        )
+        job = json.loads((queue_dir / "job.json").read_text())
+        assert job["redaction_args"]["template"]["pages"] == {"4": [[40, 30, 200, 50]]}
+
+        ShardWorker(str(queue_dir)).run()
+        stats = ShardMerger(str(queue_dir)).merge()
+
+        assert stats["template_pages"] == 1
+        with fitz.open(str(temp_dir / "sharded.pdf")) as doc:
+            texts = [page.get_text() for page in doc]
+        assert "Page 4" not in texts[3]
+        assert all(f"Page {page_num + 1}" in texts[page_num] for page_num in (0, 1, 2, 4))
+
+    def test_unserializable_args_leave_no_tasks(self, multi_page_pdf, temp_dir):
+        """Test that a job whose arguments cannot be stored is not created at all."""
+        queue_dir = temp_dir / "queue"
+        with pytest.raises(TypeError, match="cannot be stored"):
+            ShardCoordinator(str(queue_dir)).create_job(
+                src_file=str(multi_page_pdf),
+                dest_file=str(temp_dir / "sharded.pdf"),
+                redaction_args={"needles": ["Confidential"], "replacement": object()}
+            )
+
+        assert not queue_dir.exists() or not any(queue_dir.rglob("*"))
+
+    def test_overlapping_claims_use_their_own_files(self, multi_page_pdf, temp_dir, monkeypatch):
+        """Test that a requeued task run while its first claim still runs does not break it."""
+        queue_dir, _ = self._create_job(multi_page_pdf, temp_dir, pages_per_shard=5)
+        first, second = ShardWorker(str(queue_dir), "a"), ShardWorker(str(queue_dir), "b")
+        redact_pdf = PDFRedactor.redact_pdf
+        results = []
+
+        def redact_during_second_claim(redactor, *args, **kwargs):
+            monkeypatch.setattr(PDFRedactor, "redact_pdf", redact_pdf)
+            # The task is requeued and run to completion by another worker
+            # while the first claim is in progress
+            ShardCoordinator(str(queue_dir)).requeue_stale_tasks(max_age=0)
+            results.append(second.process_task(second.claim_task()))
+            return redact_pdf(redactor, *args, **kwargs)
+
+        monkeypatch.setattr(PDFRedactor, "redact_pdf", redact_during_second_claim)
+
+        assert first.process_task(first.claim_task())
+        assert results == [True]
+        assert sorted(p.name for p in (queue_dir / "parts").iterdir()) == ["task_000000.pdf"]
+        assert ShardMerger(str(queue_dir)).merge()["pages_processed"] == 5
+
+    def test_merge_incomplete_job(self, multi_page_pdf, temp_dir):
+        """Test that merging refuses to run before all tasks are done."""
+        queue_dir, _ = self._create_job(multi_page_pdf, temp_dir)
+        ShardWorker(str(queue_dir)).run(max_tasks=1)
+
+        with pytest.raises(RuntimeError, match="incomplete"):
+            ShardMerger(str(queue_dir)).merge()
+
+    def test_requeue_stale_tasks(self, multi_page_pdf, temp_dir):
+        """Test that abandoned claims return to the pending queue."""
+        queue_dir, task_count = self._create_job(multi_page_pdf, temp_dir)
+        ShardWorker(str(queue_dir)).claim_task()
+
+        assert ShardCoordinator(str(queue_dir)).requeue_stale_tasks(0) == 1
+        assert len(list((queue_dir / "pending").glob("*.json"))) == task_count
+
+    def test_requeue_role(self, multi_page_pdf, temp_dir):
+        """Test that the requeue role returns stale claims to the queue from the command line."""
+        queue_dir, task_count = self._create_job(multi_page_pdf, temp_dir)
+        ShardWorker(str(queue_dir)).claim_task()
+        parser = ArgsProcessor.generate_argument_parser()
+
+        for stale_after, pending in (("3600", task_count - 1), ("0", task_count)):
+            final_config = ArgsProcessor.load_configuration(parser.parse_args([
+                "--shard-role", "requeue", "--queue-dir", str(queue_dir),
+                "--stale-after", stale_after]))
+            PdfRedacterCLI.run_sharded(final_config)
+
+            assert len(list((queue_dir / "pending").glob("*.json"))) == pending
+
+    def test_staleness_counts_from_claim(self, multi_page_pdf, temp_dir):
+        """Test that a task enqueued long ago is not stale right after it is claimed."""
+        queue_dir, _ = self._create_job(multi_page_pdf, temp_dir)
+        for pending in (queue_dir / "pending").glob("*.json"):
+            os.utime(pending, (0, 0))
+        ShardWorker(str(queue_dir)).claim_task()
+
+        assert ShardCoordinator(str(queue_dir)).requeue_stale_tasks(3600) == 0
+
+    def test_requeued_claim_still_completes(self, multi_page_pdf, temp_dir, monkeypatch):
+        """Test that a task finishing after its claim was requeued is recorded as done."""
+        queue_dir, _ = self._create_job(multi_page_pdf, temp_dir)
+        worker = ShardWorker(str(queue_dir), worker_id="slow")
+        claimed = worker.claim_task()
+
+        redact_pdf = PDFRedactor.redact_pdf
+
+        def requeue_then_redact(self, **kwargs):
+            ShardCoordinator(str(queue_dir)).requeue_stale_tasks(0)
+            return redact_pdf(self, **kwargs)
+
+        monkeypatch.setattr(PDFRedactor, "redact_pdf", requeue_then_redact)
+
+        assert worker.process_task(claimed)
+        assert (queue_dir / "done" / "task_000000.json").exists()
+        assert not list((queue_dir / "failed").glob("*.json"))
+
+    def test_aggregate_stats(self):
+        """Test combining statistics of partial runs."""
+        stats = aggregate_stats([
+            {"total_matches": 2, "pages_processed": 1, "pages_modified": 1,
+             "pages_failed_redaction": 0, "patterns_used": 1,
+             "matches_by_pattern": {"a": 2}},
+            {"total_matches": 3, "pages_processed": 2, "pages_modified": 1,
+             "pages_failed_redaction": 1, "patterns_used": 1,
+             "matches_by_pattern": {"a": 1, "b": 2}},
+        ])
+
+        assert stats["total_matches"] == 5
+        assert stats["pages_processed"] == 3
+        assert stats["pages_failed_redaction"] == 1
+        assert stats["matches_by_pattern"] == {"a": 3, "b": 2}
@@ -0,0 +1,43 @@
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.stats import RedactionStats
+
+
+class TestRedactionStats:
+
+    def test_record_match(self):
+        """Test integer-indexed per-pattern counters."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("a", ignore_case=False)
+        matcher.add_pattern("b", ignore_case=False)
+        matcher.add_pattern("c", ignore_case=False)
+
+        stats = RedactionStats(matcher.patterns)
+        for text in ("a b a", "b"):
+            for _, _, pattern_id in matcher.iter_spans(text):
+                stats.record_match(pattern_id)
+
+        assert stats.total_matches == 4
+        assert list(stats.pattern_matches) == [2, 2, 0]
+
+    def test_to_dict_backward_compatible(self):
+        """Test the legacy dictionary view of the statistics."""
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern("a", ignore_case=False)
+        # The same pattern twice is reported under one key
+        matcher.add_pattern("a", ignore_case=True)
+        matcher.add_pattern("z", ignore_case=False)
+
+        stats = RedactionStats(matcher.patterns)
+        for _, _, pattern_id in matcher.iter_spans("a A"):
+            stats.record_match(pattern_id)
+        stats.pages_processed = 1
+        stats.pages_modified = 1
+
+        assert stats.to_dict() == {
+            "total_matches": 3,
+            "pages_processed": 1,
+            "pages_modified": 1,
+            "pages_failed_redaction": 0,
+            "patterns_used": 3,
+            "matches_by_pattern": {"a": 3}
+        }
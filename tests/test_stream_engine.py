@@ -0,0 +1,235 @@
+import fitz
+import pikepdf
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher, PatternType
+from pdf_redacter.stats import RedactionStats
+from pdf_redacter.stream_engine import ContentStreamRedactor
+
+
+def _words(pdf_path, page_num=0):
+    with fitz.open(str(pdf_path)) as doc:
+        return {w[4]: w[:4] for w in doc[page_num].get_text("words")}
+
+
+class TestContentStreamRedactor:
+
+    def test_stream_engine_redacts_in_place(self, sample_pdf, temp_dir):
+        """Test redaction of a simple page without the fitz path."""
+        output_path = temp_dir / "stream.pdf"
+        result = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        ).redact_pdf(
+            needles=["Confidential"],
+            replacement="[REDACTED]",
+            ignore_case=False,
+            predefined_patterns=[PatternType.EMAIL],
+            engine="stream"
+        )
+
+        assert result["engine_pages"] == {"stream": 1, "fitz": 0}
+        assert result["total_matches"] == 3
+        assert result["pages_modified"] == 1
+
+        with fitz.open(str(output_path)) as doc:
+            page_text = doc[0].get_text()
+        assert "test@example.com" not in page_text
+        assert "support@company.org" not in page_text
+        assert "Confidential" not in page_text
+        assert "[REDACTED]" in page_text
+
+    def test_following_glyphs_keep_position(self, temp_dir):
+        """Test that text after a replaced match does not move."""
+        src = temp_dir / "line.pdf"
+        with fitz.open() as doc:
+            doc.new_page().insert_text((50, 50), "Mail user@example.com today")
+            doc.save(str(src))
+
+        output_path = temp_dir / "line_out.pdf"
+        PDFRedactor(str(src), str(output_path), overwrite=True).redact_pdf(
+            needles=[], replacement="X", ignore_case=False,
+            predefined_patterns=[PatternType.EMAIL], engine="stream")
+
+        before = _words(src)
+        after = _words(output_path)
+        assert "user@example.com" not in after
+        assert after["today"] == pytest.approx(before["today"], abs=0.01)
+
+    def test_unsupported_font_falls_back(self, temp_dir):
+        """Test that pages with non-standard fonts go through fitz."""
+        src = temp_dir / "mixed.pdf"
+        with fitz.open() as doc:
+            doc.new_page().insert_text((50, 50), "secret on a simple page")
+            doc.new_page().insert_text(
+                (50, 50), "secret with a CJK font", fontname="china-s")
+            doc.save(str(src))
+
+        output_path = temp_dir / "mixed_out.pdf"
+        result = PDFRedactor(str(src), str(output_path), overwrite=True).redact_pdf(
+            needles=["secret"], replacement="[X]", ignore_case=False, engine="stream")
+
+        assert result["engine_pages"] == {"stream": 1, "fitz": 1}
+        assert result["pages_processed"] == 2
+        assert result["pages_modified"] == 2
+        with fitz.open(str(output_path)) as doc:
+            assert len(doc) == 2
+            for page in doc:
+                assert "secret" not in page.get_text()
+
+    def test_match_across_operators_is_unsupported(self, temp_dir):
+        """Test that a match spanning two text lines leaves the page untouched."""
+        src = temp_dir / "split.pdf"
+        with fitz.open() as doc:
+            page = doc.new_page()
+            page.insert_text((50, 50), "abc")
+            page.insert_text((50, 70), "def")
+            doc.save(str(src))
+
+        matcher = EnhancedPatternMatcher()
+        matcher.add_pattern(r"abc\sdef")
+        with pikepdf.open(str(src)) as pdf:
+            original = pikepdf.unparse_content_stream(
+                pikepdf.parse_content_stream(pdf.pages[0]))
+            stats = RedactionStats(matcher.patterns)
+            fallback = ContentStreamRedactor(matcher, "X").redact_document(pdf, stats)
+
+            assert fallback == [0]
+            assert stats.total_matches == 0
+            assert pikepdf.unparse_content_stream(
+                pikepdf.parse_content_stream(pdf.pages[0])) == original
+
+    def test_match_split_over_operators(self, temp_dir):
+        """Test that a match split over two operators on one line is redacted."""
+        src = temp_dir / "split_ssn.pdf"
+        _content_pdf(src, b"BT /F1 12 Tf 50 700 Td (SSN 123-45-) Tj (6789 end) Tj ET")
+        output_path = temp_dir / "split_ssn_out.pdf"
+
+        result = PDFRedactor(str(src), str(output_path)).redact_pdf(
+            needles=[], replacement="[X]", ignore_case=False,
+            predefined_patterns=[PatternType.SSN], engine="stream")
+
+        assert result["engine_pages"] == {"stream": 1, "fitz": 0}
+        assert result["total_matches"] == 1
+        before = _words(src)
+        after = _words(output_path)
+        with fitz.open(str(output_path)) as doc:
+            text = doc[0].get_text()
+        assert "123" not in text and "6789" not in text
+        # The replacement is shown once
+        assert text.count("[X]") == 1
+        assert after["end"] == pytest.approx(before["end"], abs=0.01)
+
+    def test_match_split_over_lines_falls_back(self, temp_dir):
+        """Test that a match only found with repositioned operators joined goes through fitz."""
+        src = temp_dir / "split_td.pdf"
+        _content_pdf(src, b"BT /F1 12 Tf 50 700 Td (SSN 123-45-) Tj 69.36 0 Td (6789 end) Tj ET")
+        output_path = temp_dir / "split_td_out.pdf"
+
+        result = PDFRedactor(str(src), str(output_path)).redact_pdf(
+            needles=[], replacement="", ignore_case=False,
+            predefined_patterns=[PatternType.SSN], engine="stream")
+
+        assert result["engine_pages"] == {"stream": 0, "fitz": 1}
+        with fitz.open(str(output_path)) as doc:
+            assert "6789" not in doc[0].get_text()
+
+    def test_unknown_engine(self, sample_pdf, temp_dir):
+        """Test that an unknown engine name is rejected."""
+        redactor = PDFRedactor(
+            str(sample_pdf), str(temp_dir / "out.pdf"), overwrite=True)
+
+        with pytest.raises(ValueError, match="Unknown redaction engine"):
+            redactor.redact_pdf(["x"], "[X]", False, engine="magic")
+
+
+def _content_pdf(path, content):
+    """Write a one-page PDF with the given content stream and Helvetica as /F1."""
+    with pikepdf.new() as pdf:
+        font = pdf.make_indirect(pikepdf.Dictionary(
+            Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1,
+            BaseFont=pikepdf.Name.Helvetica, Encoding=pikepdf.Name.WinAnsiEncoding))
+        pdf.pages.append(pikepdf.Page(pikepdf.Dictionary(
+            Type=pikepdf.Name.Page, MediaBox=[0, 0, 612, 792],
+            Contents=pdf.make_stream(content),
+            Resources=pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font)))))
+        pdf.save(str(path))
+
+
+def _letterhead_pdf(path, pages=3, embedded_form_font=False):
+    """Write a PDF whose pages all draw one Form XObject with a customer name."""
+    with pikepdf.new() as pdf:
+        font = pdf.make_indirect(pikepdf.Dictionary(
+            Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1,
+            BaseFont=pikepdf.Name.Helvetica, Encoding=pikepdf.Name.WinAnsiEncoding))
+        form_font = font
+        if embedded_form_font:
+            form_font = pdf.make_indirect(pikepdf.Dictionary(
+                Type=pikepdf.Name.Font, Subtype=pikepdf.Name.TrueType,
+                BaseFont=pikepdf.Name.Arial))
+        form = pdf.make_stream(
+            b"BT /F1 12 Tf 50 750 Td (Customer: John Smith, 1 Main St) Tj ET",
+            Type=pikepdf.Name.XObject, Subtype=pikepdf.Name.Form,
+            BBox=[0, 0, 612, 792],
+            Resources=pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=form_font)))
+        for page_num in range(pages):
+            content = pdf.make_stream(
+                f"q /Fm0 Do Q BT /F1 12 Tf 50 700 Td (Page {page_num + 1}) Tj ET".encode())
+            pdf.pages.append(pikepdf.Page(pikepdf.Dictionary(
+                Type=pikepdf.Name.Page, MediaBox=[0, 0, 612, 792], Contents=content,
+                Resources=pikepdf.Dictionary(
+                    Font=pikepdf.Dictionary(F1=font),
+                    XObject=pikepdf.Dictionary(Fm0=form)))))
+        pdf.save(str(path))
+
+
+class TestSharedForms:
+
+    def test_stream_engine_redacts_form_once(self, temp_dir):
+        """Test that a form drawn by every page is redacted once and reused."""
+        src = temp_dir / "letterhead.pdf"
+        _letterhead_pdf(src)
+        output_path = temp_dir / "out.pdf"
+
+        result = PDFRedactor(str(src), str(output_path)).redact_pdf(
+            needles=["John Smith"], replacement="[X]", ignore_case=False, engine="stream")
+
+        assert result["engine_pages"] == {"stream": 3, "fitz": 0}
+        assert result["form_xobjects"] == {"references": 3, "reused": 2, "redacted": 1}
+        assert result["total_matches"] == 1
+        assert result["pages_modified"] == 3
+        with fitz.open(str(output_path)) as doc:
+            for page in doc:
+                text = page.get_text()
+                assert "John Smith" not in text
+                assert "1 Main St" in text
+
+    def test_fitz_engine_shared_forms(self, temp_dir):
+        """Test that --shared-forms redacts shared forms before the fitz pages."""
+        src = temp_dir / "letterhead.pdf"
+        _letterhead_pdf(src)
+        output_path = temp_dir / "out.pdf"
+
+        result = PDFRedactor(str(src), str(output_path)).redact_pdf(
+            needles=["John Smith", r"Page 2"], replacement="", ignore_case=False,
+            shared_forms=True, verify=True)
+
+        assert result["form_xobjects"]["redacted"] == 1
+        assert result["matches_by_pattern"] == {"John Smith": 1, "Page 2": 1}
+        assert "forms" in result["stage_times"]
+        assert result["verification"]["leaks"] == []
+        assert result["verification"]["pages_modified"] == 3
+
+    def test_unsupported_form_falls_back(self, temp_dir):
+        """Test that pages drawing a form with an unsupported font go through fitz."""
+        src = temp_dir / "letterhead.pdf"
+        _letterhead_pdf(src, embedded_form_font=True)
+        output_path = temp_dir / "out.pdf"
+
+        result = PDFRedactor(str(src), str(output_path)).redact_pdf(
+            needles=["Page"], replacement="", ignore_case=False, engine="stream")
+
+        assert result["engine_pages"] == {"stream": 0, "fitz": 3}
+        assert "redacted" not in result["form_xobjects"]
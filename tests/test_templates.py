@@ -0,0 +1,115 @@
+import fitz
+import pytest
+import yaml
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.templates import RedactionTemplate
+
+
+@pytest.fixture
+def form_pdf(temp_dir):
+    """Create a three page form: two Letter pages and one A4 page."""
+    pdf_path = temp_dir / "form.pdf"
+    doc = fitz.open()
+    for width, height in ((612, 792), (612, 792), (595, 842)):
+        page = doc.new_page(width=width, height=height)
+        page.insert_text((72, 100), f"Name: Jane Doe on {width}x{height}")
+        page.insert_text((72, 200), "Contact: jane@example.com")
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+# Covers "Name: Jane Doe ..." on the first line of a page
+NAME_RECT = [60, 85, 400, 105]
+
+
+class TestRedactionTemplate:
+
+    def test_page_number_before_page_size(self, form_pdf):
+        """Test that rects of a page number take precedence over its size."""
+        template = RedactionTemplate.from_dict({
+            "pages": {"1": [[1, 2, 3, 4]]},
+            "page_sizes": [{"size": [612, 792], "rects": [NAME_RECT]}]
+        })
+
+        with fitz.open(str(form_pdf)) as doc:
+            assert template.rects_for(doc[0]) == [fitz.Rect(1, 2, 3, 4)]
+            assert template.rects_for(doc[1]) == [fitz.Rect(NAME_RECT)]
+            assert template.rects_for(doc[2]) is None
+
+    def test_invalid_templates(self):
+        """Test that empty templates, page 0 and empty rects are rejected."""
+        with pytest.raises(ValueError):
+            RedactionTemplate.from_dict({})
+        with pytest.raises(ValueError):
+            RedactionTemplate.from_dict({"pages": {0: [NAME_RECT]}})
+        with pytest.raises(ValueError):
+            RedactionTemplate.from_dict({"pages": {1: [[10, 10, 5, 20]]}})
+
+    def test_load_file(self, temp_dir):
+        """Test loading a template from YAML."""
+        path = temp_dir / "template.yml"
+        path.write_text(yaml.safe_dump({"pages": {2: [NAME_RECT]}}))
+
+        template = RedactionTemplate.load(str(path))
+
+        assert template.page_rects == {1: [tuple(float(v) for v in NAME_RECT)]}
+
+    def test_dict_round_trip_and_page_range(self):
+        """Test that a template survives to_dict() and page rects follow a page range."""
+        template = RedactionTemplate.from_dict({
+            "pages": {1: [NAME_RECT], 5: [NAME_RECT]},
+            "page_sizes": [{"size": [612, 792], "rects": [NAME_RECT]}]
+        })
+
+        assert RedactionTemplate.from_dict(template.to_dict()) == template
+        part = template.for_pages(4, 7)
+        assert part.page_rects == {0: template.page_rects[4]}
+        assert part.size_rects == template.size_rects
+
+
+class TestTemplateRedaction:
+
+    def test_template_only(self, form_pdf, temp_dir):
+        """Test that template rects are redacted without any patterns."""
+        dest = temp_dir / "out.pdf"
+        template = RedactionTemplate.from_dict(
+            {"page_sizes": [{"size": [612, 792], "rects": [NAME_RECT]}]})
+
+        result = PDFRedactor(str(form_pdf), str(dest)).redact_pdf(
+            needles=None, replacement="", ignore_case=False, template=template)
+
+        assert result["template_pages"] == 2
+        assert result["template_rects"] == 2
+        assert result["total_matches"] == 0
+        assert result["pages_modified"] == 2
+        assert "extract" not in result["stage_times"]
+        with fitz.open(str(dest)) as doc:
+            assert "Jane Doe" not in doc[0].get_text()
+            assert "jane@example.com" in doc[0].get_text()
+            assert "Jane Doe" in doc[2].get_text()
+
+    def test_patterns_on_uncovered_pages(self, form_pdf, temp_dir):
+        """Test that pages outside the template are searched with template_match_uncovered."""
+        dest = temp_dir / "out.pdf"
+        template = RedactionTemplate.from_dict({"pages": {1: [NAME_RECT]}})
+
+        result = PDFRedactor(str(form_pdf), str(dest)).redact_pdf(
+            needles=[r"jane@example\.com"], replacement="", ignore_case=False,
+            template=template, template_match_uncovered=True)
+
+        assert result["template_pages"] == 1
+        assert result["total_matches"] == 2
+        with fitz.open(str(dest)) as doc:
+            assert "Jane Doe" not in doc[0].get_text()
+            assert "jane@example.com" in doc[0].get_text()
+            assert "jane@example.com" not in doc[1].get_text()
+
+    def test_stream_engine_rejected(self, form_pdf, temp_dir):
+        """Test that templates are only supported with the fitz engine."""
+        template = RedactionTemplate.from_dict({"pages": {1: [NAME_RECT]}})
+        with pytest.raises(ValueError):
+            PDFRedactor(str(form_pdf), str(temp_dir / "out.pdf")).redact_pdf(
+                needles=None, replacement="", ignore_case=False,
+                template=template, engine="stream")
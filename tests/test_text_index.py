@@ -0,0 +1,148 @@
+import sqlite3
+
+import fitz
+import pikepdf
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.text_index import TextIndex, page_content_hash, scan_pdf
+
+
+def build_matcher(*patterns):
+    matcher = EnhancedPatternMatcher()
+    for pattern in patterns:
+        matcher.add_pattern(pattern)
+    return matcher
+
+
+def _form_only_pdf(path, text):
+    """Write a one page PDF whose only content draws a Form XObject showing text."""
+    with pikepdf.new() as pdf:
+        font = pdf.make_indirect(pikepdf.Dictionary(
+            Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1,
+            BaseFont=pikepdf.Name.Helvetica))
+        form = pdf.make_stream(
+            f"BT /F1 12 Tf 50 750 Td ({text}) Tj ET".encode(),
+            Type=pikepdf.Name.XObject, Subtype=pikepdf.Name.Form, BBox=[0, 0, 612, 792],
+            Resources=pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font)))
+        pdf.pages.append(pikepdf.Page(pikepdf.Dictionary(
+            Type=pikepdf.Name.Page, MediaBox=[0, 0, 612, 792],
+            Contents=pdf.make_stream(b"q /Fm0 Do Q"),
+            Resources=pikepdf.Dictionary(XObject=pikepdf.Dictionary(Fm0=form)))))
+        pdf.save(str(path))
+
+
+class TestTextIndex:
+
+    def test_unchanged_pages_not_extracted_again(self, multi_page_pdf, temp_dir):
+        """Test that a second run reads the text and spans from the index."""
+        index_file = str(temp_dir / "index.sqlite")
+        matcher = build_matcher(r"user\d@example\.com")
+
+        with TextIndex(index_file) as index:
+            first = scan_pdf(str(multi_page_pdf), matcher, index)
+        with TextIndex(index_file) as index:
+            second = scan_pdf(str(multi_page_pdf), matcher, index)
+
+        assert first["text_index"]["pages_extracted"] == 5
+        assert second["text_index"] == {
+            "pages_cached": 5,
+            "pages_extracted": 0,
+            "patterns_cached": 5,
+            "patterns_evaluated": 0
+        }
+        assert second["total_matches"] == first["total_matches"] == 5
+
+    def test_only_new_patterns_evaluated(self, multi_page_pdf, temp_dir):
+        """Test that adding a pattern only matches the new pattern against cached text."""
+        index_file = str(temp_dir / "index.sqlite")
+
+        with TextIndex(index_file) as index:
+            scan_pdf(str(multi_page_pdf), build_matcher("Confidential"), index)
+        with TextIndex(index_file) as index:
+            result = scan_pdf(
+                str(multi_page_pdf), build_matcher("Confidential", r"Page \d"), index)
+
+        assert result["text_index"]["patterns_cached"] == 5
+        assert result["text_index"]["patterns_evaluated"] == 5
+        assert result["matches_by_pattern"] == {"Confidential": 5, r"Page \d": 5}
+        assert result["pages_with_matches"] == [0, 1, 2, 3, 4]
+
+    def test_spans_match_matcher_order(self, sample_pdf, temp_dir):
+        """Test that cached spans are ordered like iter_spans."""
+        matcher = build_matcher(r"\d{3}-\d{2}-\d{4}", r"\d+", "Phone")
+
+        with TextIndex(str(temp_dir / "index.sqlite")) as index, \
+                fitz.open(str(sample_pdf)) as doc:
+            text, spans = index.page_spans("sample", doc[0], matcher)
+            _, cached_spans = index.page_spans("sample", doc[0], matcher)
+
+        assert spans == list(matcher.iter_spans(text))
+        assert cached_spans == spans
+
+    def test_changed_page_extracted_again(self, sample_pdf, temp_dir):
+        """Test that a modified page gets a new content hash."""
+        with fitz.open(str(sample_pdf)) as doc:
+            before = page_content_hash(doc[0])
+            doc[0].insert_text((50, 400), "Added later")
+            after = page_content_hash(doc[0])
+
+        assert before != after
+
+    def test_changed_form_extracted_again(self, temp_dir):
+        """Test that a page drawing a changed Form XObject is not served from the index."""
+        src = temp_dir / "form.pdf"
+        index_file = str(temp_dir / "index.sqlite")
+        matcher = build_matcher("ALICE", "BOB")
+
+        _form_only_pdf(src, "Customer ALICE")
+        with TextIndex(index_file) as index:
+            first = scan_pdf(str(src), matcher, index)
+        _form_only_pdf(src, "Customer BOB")
+        with TextIndex(index_file) as index:
+            second = scan_pdf(str(src), matcher, index)
+
+        assert first["matches_by_pattern"] == {"ALICE": 1}
+        assert second["text_index"]["pages_extracted"] == 1
+        assert second["matches_by_pattern"] == {"BOB": 1}
+
+    def test_index_with_word_bboxes_upgraded(self, sample_pdf, temp_dir):
+        """Test that an index written with the former word bbox column is still usable."""
+        index_file = str(temp_dir / "index.sqlite")
+        with sqlite3.connect(index_file) as conn:
+            conn.execute(
+                "CREATE TABLE pages (doc_key TEXT NOT NULL, page_num INTEGER NOT NULL, "
+                "content_hash TEXT NOT NULL, text TEXT NOT NULL, words TEXT NOT NULL, "
+                "PRIMARY KEY (doc_key, page_num))")
+        conn.close()
+
+        with TextIndex(index_file) as index, fitz.open(str(sample_pdf)) as doc:
+            text, _ = index.page_text("sample", doc[0])
+            cached, _ = index.page_text("sample", doc[0])
+
+        assert "Confidential" in text
+        assert cached == text
+        assert index.get_stats()["pages_cached"] == 1
+
+    def test_redact_pdf_with_text_index(self, sample_pdf, temp_dir):
+        """Test that redaction with a warm index gives the same result."""
+        index_file = str(temp_dir / "index.sqlite")
+        results = []
+        for run in range(2):
+            redactor = PDFRedactor(
+                src_file=str(sample_pdf), dest_file=str(temp_dir / f"out{run}.pdf"))
+            results.append(redactor.redact_pdf(
+                needles=["Confidential", r"\d{3}-\d{2}-\d{4}"],
+                replacement="",
+                ignore_case=False,
+                text_index=index_file
+            ))
+
+        assert results[0]["text_index"]["pages_extracted"] == 1
+        assert results[1]["text_index"]["pages_cached"] == 1
+        assert results[1]["matches_by_pattern"] == results[0]["matches_by_pattern"]
+
+        with fitz.open(str(temp_dir / "out1.pdf")) as doc:
+            text = doc[0].get_text()
+        assert "Confidential" not in text
+        assert "123-45-6789" not in text
@@ -0,0 +1,123 @@
+import fitz
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.pattern_matcher import EnhancedPatternMatcher
+from pdf_redacter.stats import match_fingerprint
+from pdf_redacter.verify import select_pages, verify_pdf
+
+
+def build_matcher(*patterns):
+    matcher = EnhancedPatternMatcher()
+    for pattern in patterns:
+        matcher.add_pattern(pattern)
+    return matcher
+
+
+@pytest.fixture
+def long_pdf(temp_dir):
+    """Create a forty page PDF with a secret on every third page."""
+    pdf_path = temp_dir / "long.pdf"
+    doc = fitz.open()
+    for page_num in range(40):
+        page = doc.new_page()
+        text = f"Page {page_num + 1}"
+        if page_num % 3 == 0:
+            text += f"\nSecret code {page_num:04d}"
+        page.insert_text((50, 50), text)
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+class TestSelectPages:
+
+    def test_modified_and_sample(self):
+        """Test that modified pages are always selected and a share of the others sampled."""
+        selection = select_pages(10, [2, 5], sample_rate=0.5)
+
+        assert selection["modified"] == [2, 5]
+        assert len(selection["sampled"]) == 4
+        assert not set(selection["sampled"]) & {2, 5}
+        assert select_pages(10, [2, 5], sample_rate=0.5) == selection
+
+    def test_all_pages_without_fingerprints(self):
+        """Test that every page is checked if it is unknown which pages had matches."""
+        assert select_pages(3, None) == {"modified": [0, 1, 2], "sampled": []}
+
+
+class TestVerifyPdf:
+
+    def test_reports_leaks_per_page(self, long_pdf):
+        """Test that matches left in a file are reported with their page."""
+        result = verify_pdf(str(long_pdf), build_matcher(r"Secret code \d+"))
+
+        assert result["pages_checked"] == 40
+        assert result["pages_with_leaks"] == list(range(0, 40, 3))
+        assert len(result["leaks"]) == 14
+        assert result["leaks"][0]["pattern"] == r"Secret code \d+"
+        assert result["leaks"][0]["source_page"] == 0
+
+    def test_parallel_same_as_serial(self, long_pdf):
+        """Test that verifying with a process pool finds the same leaks."""
+        matcher = build_matcher(r"Secret code \d+", r"Page \d+")
+
+        serial = verify_pdf(str(long_pdf), matcher)
+        parallel = verify_pdf(str(long_pdf), matcher, workers=2)
+
+        assert parallel["leaks"] == serial["leaks"]
+
+    def test_only_fingerprinted_pages_checked(self, long_pdf):
+        """Test that pages without matches during redaction are skipped unless sampled."""
+        fingerprints = {3: {match_fingerprint("Secret code 0003")}}
+
+        result = verify_pdf(
+            str(long_pdf), build_matcher(r"Secret code \d+"), match_fingerprints=fingerprints)
+
+        assert result["pages_checked"] == 1
+        assert result["pages_with_leaks"] == [3]
+        assert result["leaks"][0]["matched_before"] is True
+
+    def test_page_map(self, long_pdf):
+        """Test that leaks report the source page when pages were removed."""
+        page_map = PDFRedactor.output_page_map(41, [1])
+
+        result = verify_pdf(
+            str(long_pdf), build_matcher(r"Secret code 0003"),
+            match_fingerprints={4: set()}, page_map=page_map)
+
+        assert result["pages_with_leaks"] == [3]
+        assert result["leaks"][0]["source_page"] == 4
+
+
+class TestRedactAndVerify:
+
+    def test_clean_output(self, multi_page_pdf, temp_dir):
+        """Test that a redacted output verifies without leaks."""
+        redactor = PDFRedactor(
+            src_file=str(multi_page_pdf), dest_file=str(temp_dir / "out.pdf"))
+        result = redactor.redact_pdf(
+            needles=[r"user\d@example\.com"],
+            replacement="",
+            ignore_case=False,
+            verify=True,
+            verify_sample_rate=1.0
+        )
+
+        verification = result["verification"]
+        assert verification["leaks"] == []
+        assert verification["pages_modified"] == 5
+        assert "verify" in result["stage_times"]
+
+    def test_output_page_map(self):
+        """Test the mapping of source pages to output pages."""
+        assert PDFRedactor.output_page_map(5, [1, 3]) == {
+            0: 0, 1: None, 2: 1, 3: None, 4: 2}
+
+    def test_invalid_sample_rate(self, sample_pdf, temp_dir):
+        """Test that a sample rate outside 0-1 is rejected."""
+        redactor = PDFRedactor(src_file=str(sample_pdf), dest_file=str(temp_dir / "out.pdf"))
+        with pytest.raises(ValueError):
+            redactor.redact_pdf(
+                needles=["x"], replacement="", ignore_case=False,
+                verify=True, verify_sample_rate=2.0)
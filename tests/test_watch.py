@@ -0,0 +1,106 @@
+import shutil
+
+import fitz
+import pytest
+
+from pdf_redacter.watch import HotFolderWatcher, PROCESSING_DIR
+
+
+@pytest.fixture
+def watch_dirs(temp_dir):
+    """Input, output and failed directories for a watcher."""
+    dirs = {name: temp_dir / name for name in ("in", "out", "failed")}
+    return dirs
+
+
+def make_watcher(watch_dirs, **kwargs):
+    return HotFolderWatcher(
+        input_dir=str(watch_dirs["in"]),
+        output_dir=str(watch_dirs["out"]),
+        failed_dir=str(watch_dirs["failed"]),
+        redaction_args={
+            "needles": ["Confidential"],
+            "replacement": "[REDACTED]",
+            "ignore_case": False
+        },
+        poll_interval=0.05,
+        **kwargs
+    )
+
+
+class TestHotFolderWatcher:
+
+    def test_redacts_dropped_files(self, watch_dirs, sample_pdf, multi_page_pdf):
+        """Test that dropped PDFs are redacted into the output directory."""
+        watch_dirs["in"].mkdir()
+        shutil.copy(sample_pdf, watch_dirs["in"] / "a.pdf")
+        shutil.copy(multi_page_pdf, watch_dirs["in"] / "b.pdf")
+
+        watcher = make_watcher(watch_dirs, workers=2)
+        watcher.run(max_files=2)
+
+        assert watcher.files_done == 2
+        assert watcher.pages_done == 6
+        assert sorted(p.name for p in watch_dirs["out"].glob("*.pdf")) == ["a.pdf", "b.pdf"]
+        # Redacted inputs are removed from the watched directory
+        assert not list(watch_dirs["in"].glob("*.pdf"))
+        assert not list((watch_dirs["in"] / PROCESSING_DIR).iterdir())
+
+        doc = fitz.open(str(watch_dirs["out"] / "b.pdf"))
+        assert all("Confidential" not in page.get_text() for page in doc)
+        doc.close()
+
+    def test_unstable_files_wait(self, watch_dirs, sample_pdf):
+        """Test that a file is only claimed once it stopped changing."""
+        watcher = make_watcher(watch_dirs).start()
+        try:
+            target = watch_dirs["in"] / "growing.pdf"
+            target.write_bytes(b"%PDF-1.7\n")
+            assert watcher.scan() == 0
+
+            # Still being written: size changes between polls
+            target.write_bytes(sample_pdf.read_bytes())
+            assert watcher.scan() == 0
+
+            assert watcher.scan() == 1
+            assert watcher.collect(timeout=None) == 1
+        finally:
+            watcher.close()
+
+        assert (watch_dirs["out"] / "growing.pdf").exists()
+
+    def test_failed_files(self, watch_dirs):
+        """Test that unreadable inputs are moved to the failed directory."""
+        watch_dirs["in"].mkdir()
+        (watch_dirs["in"] / "broken.pdf").write_bytes(b"not a pdf")
+
+        watcher = make_watcher(watch_dirs)
+        watcher.run(max_files=1)
+
+        assert watcher.files_failed == 1
+        assert (watch_dirs["failed"] / "broken.pdf").exists()
+        assert not list(watch_dirs["out"].glob("*.pdf"))
+
+    def test_recovers_interrupted_claims(self, watch_dirs, sample_pdf):
+        """Test that files left in .processing/ are re-queued on start."""
+        processing = watch_dirs["in"] / PROCESSING_DIR
+        processing.mkdir(parents=True)
+        shutil.copy(sample_pdf, processing / "left.pdf")
+
+        watcher = make_watcher(watch_dirs)
+        watcher.run(max_files=1)
+
+        assert watcher.files_done == 1
+        assert (watch_dirs["out"] / "left.pdf").exists()
+
+    def test_invalid_patterns(self, watch_dirs):
+        """Test that an invalid pattern set is rejected before watching."""
+        watcher = HotFolderWatcher(
+            input_dir=str(watch_dirs["in"]),
+            output_dir=str(watch_dirs["out"]),
+            failed_dir=str(watch_dirs["failed"]),
+            redaction_args={"needles": ["[unclosed"], "replacement": "", "ignore_case": False}
+        )
+
+        with pytest.raises(ValueError):
+            watcher.start()
@@ -0,0 +1,212 @@
+import time
+
+import fitz
+import pytest
+
+from pdf_redacter.core import PDFRedactor
+from pdf_redacter.watchdog import PageWatchdog
+
+# Catastrophic backtracking on a run of "a"s stands in for a hanging page;
+# the page also contains a "c" so the prefilter does not skip the pattern
+HANGING_PATTERN = r"(a+)+c"
+
+
+@pytest.fixture
+def hanging_pdf(temp_dir):
+    """Create a three page PDF whose middle page makes HANGING_PATTERN hang."""
+    pdf_path = temp_dir / "hanging.pdf"
+    doc = fitz.open()
+    for text in ["Secret one", "a" * 40 + "b c", "Secret three"]:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+class TestPageWatchdog:
+
+    def test_supervised_matches_in_process(self, multi_page_pdf, temp_dir):
+        """Test that subprocess redaction gives the same result as in-process."""
+        results = []
+        for page_timeout in (None, 30.0):
+            output_path = temp_dir / f"redacted_{page_timeout}.pdf"
+            redactor = PDFRedactor(
+                src_file=str(multi_page_pdf),
+                dest_file=str(output_path),
+                overwrite=True
+            )
+            results.append(redactor.redact_pdf(
+                needles=[r"user\d@example\.com"],
+                replacement="[REDACTED]",
+                ignore_case=False,
+                page_timeout=page_timeout
+            ))
+
+            doc = fitz.open(str(output_path))
+            assert len(doc) == 5
+            assert all("@example.com" not in page.get_text() for page in doc)
+            doc.close()
+
+        in_process, supervised = results
+        assert supervised["total_matches"] == in_process["total_matches"] == 5
+        assert supervised["pages_modified"] == in_process["pages_modified"]
+        assert "pages_timed_out" not in supervised
+
+    def test_supervised_keeps_links_and_outline(self, temp_dir):
+        """Test that supervised redaction keeps links and outline entries pointing at pages."""
+        src = temp_dir / "linked.pdf"
+        with fitz.open() as doc:
+            for number in range(3):
+                doc.new_page().insert_text((72, 72), f"Secret {number}")
+            doc[0].insert_link({
+                "kind": fitz.LINK_GOTO, "from": fitz.Rect(72, 100, 200, 120),
+                "page": 2, "to": fitz.Point(0, 0)})
+            doc.set_toc([[1, "First", 1], [1, "Last", 3]])
+            doc.save(str(src))
+        output_path = temp_dir / "redacted.pdf"
+
+        result = PDFRedactor(src_file=str(src), dest_file=str(output_path)).redact_pdf(
+            needles=["Secret"], replacement="", ignore_case=False, page_timeout=30.0)
+
+        assert result["pages_modified"] == 3
+        with fitz.open(str(output_path)) as doc:
+            assert all("Secret" not in page.get_text() for page in doc)
+            assert [link["page"] for link in doc[0].get_links()] == [2]
+            assert doc.get_toc() == [[1, "First", 1], [1, "Last", 3]]
+
+    def test_timed_out_page_skipped(self, hanging_pdf, temp_dir):
+        """Test that a hanging page is killed and removed as a failed page."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(hanging_pdf),
+            dest_file=str(output_path),
+            overwrite=True,
+            skip_redact_failed_pages=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Secret", HANGING_PATTERN],
+            replacement="X",
+            ignore_case=False,
+            page_timeout=3.0
+        )
+
+        assert result["pages_timed_out"] == 1
+        assert result["timed_out_pages"] == [1]
+        assert result["pages_failed_redaction"] == 1
+        assert result["total_matches"] == 2
+
+        doc = fitz.open(str(output_path))
+        assert len(doc) == 2
+        assert all("Secret" not in page.get_text() for page in doc)
+        doc.close()
+
+    def test_timed_out_page_blanked(self, hanging_pdf, temp_dir):
+        """Test the blank page fallback."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(hanging_pdf),
+            dest_file=str(output_path),
+            overwrite=True,
+            skip_redact_failed_pages=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Secret", HANGING_PATTERN],
+            replacement="X",
+            ignore_case=False,
+            page_timeout=3.0,
+            timeout_fallback="blank"
+        )
+
+        assert result["pages_timed_out"] == 1
+        assert result["pages_failed_redaction"] == 0
+
+        doc = fitz.open(str(output_path))
+        assert len(doc) == 3
+        assert doc[1].get_text() == ""
+        assert "Secret" not in doc[2].get_text()
+        doc.close()
+
+    def test_document_deadline(self, multi_page_pdf, temp_dir):
+        """Test that pages left when the deadline passes are timed out."""
+        output_path = temp_dir / "redacted.pdf"
+        redactor = PDFRedactor(
+            src_file=str(multi_page_pdf),
+            dest_file=str(output_path),
+            overwrite=True
+        )
+
+        result = redactor.redact_pdf(
+            needles=["Confidential"],
+            replacement="[REDACTED]",
+            ignore_case=False,
+            document_deadline=0.0,
+            timeout_fallback="blank"
+        )
+
+        assert result["pages_timed_out"] == 5
+        assert result["total_matches"] == 0
+
+    def test_page_searched_past_deadline_not_applied(self, multi_page_pdf, temp_dir, monkeypatch):
+        """Test that rects arriving after the deadline are not applied in this process."""
+        clock = {"offset": 0.0}
+        perf_counter = time.perf_counter
+        monkeypatch.setattr(time, "perf_counter", lambda: perf_counter() + clock["offset"])
+        find_page_rects = PageWatchdog.find_page_rects
+
+        def slow_find_page_rects(watchdog, page_num, timeout):
+            result = find_page_rects(watchdog, page_num, timeout)
+            if page_num == 1:
+                clock["offset"] = 1000.0
+            return result
+
+        monkeypatch.setattr(PageWatchdog, "find_page_rects", slow_find_page_rects)
+        output_path = temp_dir / "redacted.pdf"
+        result = PDFRedactor(
+            src_file=str(multi_page_pdf), dest_file=str(output_path), overwrite=True
+        ).redact_pdf(
+            needles=["Confidential"], replacement="", ignore_case=False, document_deadline=600.0)
+
+        assert result["timed_out_pages"] == [1, 2, 3, 4]
+        assert result["total_matches"] == 1
+        with fitz.open(str(output_path)) as doc:
+            assert "Confidential" not in doc[0].get_text()
+            assert "Confidential" in doc[1].get_text()
+
+    def test_slow_apply_logged(self, sample_pdf, temp_dir, monkeypatch, caplog):
+        """Test that an apply outlasting the page timeout is reported, not interrupted."""
+        clock = {"offset": 0.0}
+        perf_counter = time.perf_counter
+        monkeypatch.setattr(time, "perf_counter", lambda: perf_counter() + clock["offset"])
+        apply_rects = PDFRedactor.apply_rects
+
+        def slow_apply_rects(*args, **kwargs):
+            clock["offset"] += 60.0
+            return apply_rects(*args, **kwargs)
+
+        monkeypatch.setattr(PDFRedactor, "apply_rects", staticmethod(slow_apply_rects))
+        result = PDFRedactor(
+            src_file=str(sample_pdf), dest_file=str(temp_dir / "redacted.pdf"), overwrite=True
+        ).redact_pdf(needles=["Confidential"], replacement="", ignore_case=False, page_timeout=30.0)
+
+        assert not result.get("timed_out_pages")
+        assert result["total_matches"] == 1
+        assert "past the page timeout" in caplog.text
+
+    def test_invalid_fallback(self, sample_pdf, temp_dir):
+        """Test that an unknown fallback is rejected."""
+        redactor = PDFRedactor(
+            src_file=str(sample_pdf),
+            dest_file=str(temp_dir / "redacted.pdf"),
+            overwrite=True
+        )
+
+        with pytest.raises(ValueError):
+            redactor.redact_pdf(
+                needles=["Confidential"],
+                replacement="[REDACTED]",
+                ignore_case=False,
+                timeout_fallback="keep"
+            )
@@ -0,0 +1,129 @@
+import os
+import queue
+import time
+
+import pytest
+
+from pdf_redacter.workers import WorkerPool, current_rss, peak_rss, shrink_store
+
+
+def get_pid(_):
+    return os.getpid()
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def crash():
+    os._exit(3)
+
+
+# Changed by the test process only; a spawned worker sees the import-time value
+MARKER = "imported"
+
+
+def get_marker():
+    return MARKER
+
+
+def delay_results(pool):
+    """Make the pool's result queue report no result until a worker has exited once."""
+    results = pool._results
+    get = results.get
+    delayed = []
+
+    def late_get(block=True, timeout=None):
+        if not delayed:
+            delayed.append(True)
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline and all(
+                    worker.process.is_alive() for worker in list(pool._workers.values())):
+                time.sleep(0.01)
+            raise queue.Empty
+        return get(block, timeout)
+
+    results.get = late_get
+
+
+class TestMemoryHelpers:
+
+    def test_rss(self):
+        """Test that RSS and its high-water mark are reported."""
+        assert current_rss() > 0
+        assert peak_rss() >= current_rss() * 0.5
+
+    def test_shrink_store(self):
+        """Test that shrinking the MuPDF store accepts the full range."""
+        shrink_store(0)
+        shrink_store(50)
+        shrink_store(100)
+
+
+class TestWorkerPool:
+
+    def test_results(self):
+        """Test that submitted tasks return their results."""
+        with WorkerPool(workers=2) as pool:
+            futures = [pool.submit(pow, 2, exponent) for exponent in range(6)]
+            assert [future.result(timeout=30) for future in futures] == [1, 2, 4, 8, 16, 32]
+
+    def test_recycle_after_max_tasks(self):
+        """Test that a worker is replaced after max_tasks_per_worker tasks."""
+        with WorkerPool(workers=1, max_tasks_per_worker=2) as pool:
+            pids = [pool.submit(get_pid, task).result(timeout=30) for task in range(5)]
+            stats = pool.get_stats()
+
+        assert len(set(pids)) == 3
+        assert pids[0] == pids[1] and pids[2] == pids[3]
+        assert stats["workers_recycled"] == 2
+        assert stats["workers_started"] == 3
+
+    def test_recycle_above_rss(self):
+        """Test that a worker above the RSS threshold is replaced after its task."""
+        with WorkerPool(workers=1, max_rss_mb=1) as pool:
+            pids = [pool.submit(get_pid, task).result(timeout=30) for task in range(3)]
+            stats = pool.get_stats()
+
+        assert len(set(pids)) == 3
+        assert stats["workers_recycled"] == 3
+        assert len(stats["peak_rss_mb"]) == 3
+        assert all(peak > 0 for peak in stats["peak_rss_mb"].values())
+
+    def test_exception_propagates(self):
+        """Test that a failing task raises in the caller and the worker keeps running."""
+        with WorkerPool(workers=1) as pool:
+            with pytest.raises(ValueError, match="bad input"):
+                pool.submit(fail, "bad input").result(timeout=30)
+            assert pool.submit(pow, 3, 2).result(timeout=30) == 9
+            assert pool.get_stats()["workers_started"] == 1
+
+    def test_dead_worker_replaced(self):
+        """Test that a crashing worker fails its task but not the pool."""
+        with WorkerPool(workers=1) as pool:
+            with pytest.raises(RuntimeError, match="died"):
+                pool.submit(crash).result(timeout=30)
+            assert pool.submit(pow, 2, 10).result(timeout=30) == 1024
+            assert pool.get_stats()["workers_died"] == 1
+
+    def test_result_of_exited_worker_not_lost(self):
+        """Test that a result read only after its worker exited still resolves the task."""
+        with WorkerPool(workers=1, max_tasks_per_worker=1) as pool:
+            delay_results(pool)
+            # Let the collector's pending read of the real queue time out
+            time.sleep(1)
+            assert pool.submit(pow, 2, 5).result(timeout=30) == 32
+            assert pool.get_stats()["workers_died"] == 0
+
+    def test_workers_are_spawned(self, monkeypatch):
+        """Test that workers do not inherit the state of the parent process."""
+        monkeypatch.setitem(globals(), "MARKER", "changed")
+        with WorkerPool(workers=1) as pool:
+            assert pool.submit(get_marker).result(timeout=30) == "imported"
+
+    def test_invalid_settings(self):
+        """Test that invalid limits are rejected."""
+        with pytest.raises(ValueError):
+            WorkerPool(workers=1, max_tasks_per_worker=0)
+        with pytest.raises(ValueError):
+            WorkerPool(workers=1, store_shrink_percent=101)